@@ -0,0 +1,17 @@
+"""
+Benchmark suite of FloPy. The benchmarks time and measure the memory of
+model loads and writes, binary output queries, ZoneBudget, MfList arrays,
+exports and MODFLOW 6 simulation loads and writes on synthetic models and
+output files of configurable size. Everything is generated locally, the
+suite runs offline.
+
+Run the suite and compare two runs with run_benchmarks.py:
+
+    python run_benchmarks.py --size small --output base.json
+    python run_benchmarks.py --size small --output new.json
+    python run_benchmarks.py --compare base.json new.json
+
+"""
+from .benchmarks import SIZES, benchmark, get_benchmark_names, \
+    make_inputs, run_benchmark, run_benchmarks, write_results, \
+    read_results, compare_results, print_comparison
@@ -0,0 +1,536 @@
+"""
+benchmarks module.  Contains the benchmarks of the suite, run_benchmarks(),
+which generates the synthetic inputs and runs the benchmarks, and
+compare_results(), which compares the results of two runs (for example of
+two commits).
+
+"""
+from __future__ import print_function
+import os
+import sys
+import time
+import json
+import shutil
+import platform
+import tempfile
+import subprocess
+import numpy as np
+import flopy
+
+from . import synthetic
+
+try:
+    import tracemalloc
+except ImportError:
+    # Python 2
+    tracemalloc = None
+
+if sys.version_info >= (3, 3):
+    _clock = time.perf_counter
+else:
+    _clock = time.time
+
+# version of the format of the results
+RESULTS_VERSION = 1
+
+# model and output sizes of the suite
+SIZES = {
+    'tiny': {'nlay': 2, 'nrow': 10, 'ncol': 10, 'nper': 3, 'nwel': 10,
+             'nghb': 10, 'nlist': 20, 'nparticles': 10, 'npoints': 10,
+             'nzones': 3},
+    'small': {'nlay': 3, 'nrow': 100, 'ncol': 100, 'nper': 12, 'nwel': 1000,
+              'nghb': 1000, 'nlist': 1000, 'nparticles': 1000,
+              'npoints': 50, 'nzones': 5},
+    'medium': {'nlay': 5, 'nrow': 250, 'ncol': 250, 'nper': 50,
+               'nwel': 5000, 'nghb': 5000, 'nlist': 5000,
+               'nparticles': 5000, 'npoints': 100, 'nzones': 10},
+    'large': {'nlay': 10, 'nrow': 500, 'ncol': 500, 'nper': 120,
+              'nwel': 20000, 'nghb': 20000, 'nlist': 20000,
+              'nparticles': 20000, 'npoints': 200, 'nzones': 20}}
+
+# the benchmarks, [(name, function)]
+_benchmarks = []
+
+
+def benchmark(name):
+    """
+    Decorator that adds a function to the benchmarks of the suite.
+
+    The function is called with the inputs (see make_inputs()) and returns
+    the function that is timed, the setup of a benchmark is not timed.
+
+    """
+
+    def decorator(func):
+        _benchmarks.append((name, func))
+        return func
+
+    return decorator
+
+
+def get_benchmark_names():
+    """
+    Get the names of the benchmarks of the suite.
+
+    """
+    return [name for name, func in _benchmarks]
+
+
+def make_inputs(workspace, size='small', seed=0, **kwargs):
+    """
+    Generate the synthetic models and output files of the benchmarks.
+
+    Parameters
+    ----------
+    workspace : str
+        Directory of the files.
+    size : str
+        Key of SIZES. (default is 'small')
+    seed : int
+        Seed of the random values. (default is 0)
+    kwargs : dict
+        Parameters that replace those of the size (nlay, nrow, ncol, nper,
+        nwel, nghb, nlist, nparticles, npoints and nzones).
+
+    Returns
+    -------
+    inputs : dict
+        Parameters and paths of the inputs.
+
+    """
+    params = dict(SIZES[size])
+    for key, value in kwargs.items():
+        if key not in params:
+            raise ValueError('unknown benchmark parameter {}'.format(key))
+        params[key] = value
+    nlay, nrow, ncol = params['nlay'], params['nrow'], params['ncol']
+    nper = params['nper']
+    rng = np.random.RandomState(seed)
+    inputs = {'workspace': workspace, 'size': size, 'params': params,
+              'seed': seed}
+
+    model_ws = os.path.join(workspace, 'mf')
+    synthetic.make_structured_model(model_ws, nlay, nrow, ncol, nper,
+                                    params['nwel'], params['nghb'],
+                                    seed=seed)
+    inputs['model_ws'] = model_ws
+    inputs['namefile'] = 'synthetic.nam'
+
+    sim_ws = os.path.join(workspace, 'mf6')
+    synthetic.make_unstructured_simulation(sim_ws, nlay, nrow, ncol, nper,
+                                           params['nwel'], params['nghb'],
+                                           seed=seed)
+    inputs['sim_ws'] = sim_ws
+
+    output_ws = os.path.join(workspace, 'output')
+    if not os.path.isdir(output_ws):
+        os.makedirs(output_ws)
+    inputs['hds'] = os.path.join(output_ws, 'synthetic.hds')
+    synthetic.write_head_file(inputs['hds'], nlay, nrow, ncol, nper,
+                              seed=seed)
+    inputs['ucn'] = os.path.join(output_ws, 'MT3D001.UCN')
+    synthetic.write_ucn_file(inputs['ucn'], nlay, nrow, ncol, nper,
+                             seed=seed)
+    inputs['cbc'] = os.path.join(output_ws, 'synthetic.cbc')
+    synthetic.write_budget_file(inputs['cbc'], nlay, nrow, ncol, nper,
+                                nlist=params['nlist'], seed=seed)
+    inputs['pathline'] = os.path.join(output_ws, 'synthetic.mppth')
+    synthetic.write_pathline_file(inputs['pathline'], params['nparticles'],
+                                  params['npoints'], nlay, nrow, ncol,
+                                  seed=seed)
+    inputs['zones'] = rng.randint(1, params['nzones'] + 1,
+                                  (nlay, nrow, ncol))
+    # cells of the time series
+    k, i, j = synthetic._random_cells(rng, 10, nlay, nrow, ncol)
+    inputs['cells'] = list(zip(k.tolist(), i.tolist(), j.tolist()))
+    return inputs
+
+
+def _load_model(inputs):
+    return flopy.modflow.Modflow.load(inputs['namefile'],
+                                      model_ws=inputs['model_ws'],
+                                      check=False)
+
+
+def _new_workspace(inputs, name):
+    path = os.path.join(inputs['workspace'], 'run', name)
+    if os.path.isdir(path):
+        shutil.rmtree(path)
+    os.makedirs(path)
+    return path
+
+
+@benchmark('Modflow.load')
+def bench_modflow_load(inputs):
+    return lambda: _load_model(inputs)
+
+
+@benchmark('Modflow.write_input')
+def bench_modflow_write_input(inputs):
+    ml = _load_model(inputs)
+    ml.change_model_ws(_new_workspace(inputs, 'write_input'))
+    return ml.write_input
+
+
+@benchmark('MfList.to_array')
+def bench_mflist_to_array(inputs):
+    ml = _load_model(inputs)
+    spd = ml.wel.stress_period_data
+    nper = inputs['params']['nper']
+
+    def run():
+        for kper in range(nper):
+            spd.to_array(kper)
+
+    return run
+
+
+@benchmark('HeadFile')
+def bench_headfile(inputs):
+    return lambda: flopy.utils.HeadFile(inputs['hds']).close()
+
+
+@benchmark('HeadFile.get_data')
+def bench_headfile_get_data(inputs):
+    hds = flopy.utils.HeadFile(inputs['hds'])
+    kstpkper = hds.get_kstpkper()
+
+    def run():
+        for kk in kstpkper:
+            hds.get_data(kstpkper=kk)
+
+    return run
+
+
+@benchmark('HeadFile.get_ts')
+def bench_headfile_get_ts(inputs):
+    hds = flopy.utils.HeadFile(inputs['hds'])
+    return lambda: hds.get_ts(inputs['cells'])
+
+
+@benchmark('UcnFile.get_alldata')
+def bench_ucnfile_get_alldata(inputs):
+    ucn = flopy.utils.UcnFile(inputs['ucn'])
+    return ucn.get_alldata
+
+
+@benchmark('CellBudgetFile')
+def bench_cellbudgetfile(inputs):
+    return lambda: flopy.utils.CellBudgetFile(inputs['cbc']).close()
+
+
+@benchmark('CellBudgetFile.get_data')
+def bench_cellbudgetfile_get_data(inputs):
+    cbc = flopy.utils.CellBudgetFile(inputs['cbc'])
+
+    def run():
+        cbc.get_data(text='FLOW RIGHT FACE')
+        cbc.get_data(text='WELLS', full3D=True)
+
+    return run
+
+
+@benchmark('CellBudgetFile.get_ts')
+def bench_cellbudgetfile_get_ts(inputs):
+    cbc = flopy.utils.CellBudgetFile(inputs['cbc'])
+    return lambda: cbc.get_ts(inputs['cells'], text='FLOW RIGHT FACE')
+
+
+@benchmark('ZoneBudget')
+def bench_zonebudget(inputs):
+    return lambda: flopy.utils.ZoneBudget(inputs['cbc'], inputs['zones'])
+
+
+@benchmark('PathlineFile')
+def bench_pathlinefile(inputs):
+    return lambda: flopy.utils.PathlineFile(inputs['pathline']).get_alldata()
+
+
+@benchmark('export.shapefile')
+def bench_export_shapefile(inputs):
+    import shapefile
+    ml = _load_model(inputs)
+    fname = os.path.join(_new_workspace(inputs, 'shapefile'), 'model.shp')
+    return lambda: ml.export(fname)
+
+
+@benchmark('export.netcdf')
+def bench_export_netcdf(inputs):
+    import netCDF4
+    ml = _load_model(inputs)
+    fname = os.path.join(_new_workspace(inputs, 'netcdf'), 'model.nc')
+    return lambda: ml.export(fname)
+
+
+@benchmark('export.vtk')
+def bench_export_vtk(inputs):
+    from flopy.export.vtk import Vtk
+    ml = _load_model(inputs)
+    fname = os.path.join(_new_workspace(inputs, 'vtk'), 'model.vtu')
+    hk = ml.lpf.hk.array
+
+    def run():
+        vtk = Vtk(fname, ml, verbose=False)
+        vtk.add_array('hk', hk)
+        vtk.write()
+
+    return run
+
+
+@benchmark('MFSimulation.load')
+def bench_mfsimulation_load(inputs):
+    return lambda: flopy.mf6.MFSimulation.load(sim_ws=inputs['sim_ws'],
+                                               verbosity_level=0)
+
+
+@benchmark('MFSimulation.write_simulation')
+def bench_mfsimulation_write_simulation(inputs):
+    sim = flopy.mf6.MFSimulation.load(sim_ws=inputs['sim_ws'],
+                                      verbosity_level=0)
+    sim.set_sim_path(_new_workspace(inputs, 'write_simulation'))
+    return sim.write_simulation
+
+
+class _NullWriter(object):
+    # stdout of the benchmarks, the messages of flopy are not printed
+    def write(self, s):
+        pass
+
+    def flush(self):
+        pass
+
+
+def _peak_memory(func):
+    # peak memory allocated by a call, None if it can not be traced
+    if tracemalloc is None or tracemalloc.is_tracing():
+        return None
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def run_benchmark(func, inputs, repeat=3, memory=True):
+    """
+    Run a benchmark of the suite.
+
+    Returns
+    -------
+    result : dict
+        status ('ok', 'skipped' if an optional dependency is missing, or
+        'error'), times (seconds of each run), min, median and mean (of the
+        times), peak_bytes (peak memory allocated by a run, None if memory
+        is not traced) and error (message, None if status is 'ok').
+
+    """
+    result = {'status': 'ok', 'times': [], 'min': None, 'median': None,
+              'mean': None, 'peak_bytes': None, 'error': None}
+    stdout = sys.stdout
+    sys.stdout = _NullWriter()
+    try:
+        run = func(inputs)
+        for i in range(repeat):
+            t = _clock()
+            run()
+            result['times'].append(_clock() - t)
+        if memory:
+            result['peak_bytes'] = _peak_memory(run)
+    except ImportError as e:
+        result['status'] = 'skipped'
+        result['error'] = str(e)
+    except Exception as e:
+        result['status'] = 'error'
+        result['error'] = '{}: {!s}'.format(type(e).__name__, e)
+    finally:
+        sys.stdout = stdout
+    if result['times']:
+        times = np.array(result['times'])
+        result['min'] = float(times.min())
+        result['median'] = float(np.median(times))
+        result['mean'] = float(times.mean())
+    return result
+
+
+def _get_git_commit():
+    path = os.path.dirname(os.path.abspath(flopy.__file__))
+    try:
+        out = subprocess.check_output(['git', 'rev-parse', 'HEAD'], cwd=path,
+                                      stderr=subprocess.STDOUT)
+        return out.decode().strip()
+    except Exception:
+        return flopy.__git_commit__
+
+
+def run_benchmarks(size='small', workspace=None, repeat=3, select=None,
+                   memory=True, seed=0, verbose=True, **kwargs):
+    """
+    Generate the synthetic inputs and run the benchmarks of the suite.
+
+    Parameters
+    ----------
+    size : str
+        Size of the synthetic models and outputs, a key of SIZES.
+        (default is 'small')
+    workspace : str
+        Directory of the synthetic inputs, it is kept. (default is None, a
+        temporary directory that is removed)
+    repeat : int
+        Number of timed runs of each benchmark. (default is 3)
+    select : list of str
+        Only run the benchmarks whose names contain one of these strings.
+        (default is None, all benchmarks)
+    memory : bool
+        Measure the peak memory allocated by a run of each benchmark (with
+        tracemalloc, in an extra run that is not timed). (default is True)
+    seed : int
+        Seed of the random values of the inputs. (default is 0)
+    verbose : bool
+        Print the result of each benchmark. (default is True)
+    kwargs : dict
+        Parameters that replace those of the size, see make_inputs().
+
+    Returns
+    -------
+    results : dict
+        The parameters of the run and the environment (flopy version, git
+        commit, Python and numpy versions, platform), and the result of each
+        benchmark by name (see run_benchmark()). The results can be saved
+        with write_results().
+
+    """
+    names = get_benchmark_names()
+    if select is not None:
+        names = [name for name in names if any(s in name for s in select)]
+    remove = workspace is None
+    if remove:
+        workspace = tempfile.mkdtemp(prefix='flopy_benchmark_')
+    elif not os.path.isdir(workspace):
+        os.makedirs(workspace)
+    results = {'version': RESULTS_VERSION,
+               'flopy': flopy.__version__,
+               'git_commit': _get_git_commit(),
+               'python': platform.python_version(),
+               'numpy': np.__version__,
+               'platform': platform.platform(),
+               'date': time.strftime('%Y-%m-%dT%H:%M:%S'),
+               'size': size,
+               'repeat': repeat,
+               'seed': seed,
+               'benchmarks': {}}
+    try:
+        t = _clock()
+        stdout = sys.stdout
+        sys.stdout = _NullWriter()
+        try:
+            inputs = make_inputs(workspace, size, seed=seed, **kwargs)
+        finally:
+            sys.stdout = stdout
+        results['params'] = inputs['params']
+        results['setup_time'] = _clock() - t
+        if verbose:
+            print('synthetic inputs generated in {:.2f} s'
+                  .format(results['setup_time']))
+        for name, func in _benchmarks:
+            if name not in names:
+                continue
+            result = run_benchmark(func, inputs, repeat=repeat,
+                                   memory=memory)
+            results['benchmarks'][name] = result
+            if verbose:
+                print(_format_result(name, result))
+    finally:
+        if remove:
+            shutil.rmtree(workspace, ignore_errors=True)
+    return results
+
+
+def _format_result(name, result):
+    if result['status'] != 'ok':
+        return '{:32s} {}: {}'.format(name, result['status'],
+                                      result['error'])
+    s = '{:32s} {:10.4f} s'.format(name, result['min'])
+    if result['peak_bytes'] is not None:
+        s += ' {:10.1f} MB'.format(result['peak_bytes'] / 2. ** 20)
+    return s
+
+
+def write_results(results, fname):
+    """
+    Write the results of run_benchmarks() to a JSON file.
+
+    """
+    with open(fname, 'w') as f:
+        json.dump(results, f, indent=1, sort_keys=True)
+
+
+def read_results(fname):
+    """
+    Read the results of run_benchmarks() from a JSON file.
+
+    """
+    with open(fname, 'r') as f:
+        return json.load(f)
+
+
+def compare_results(base, new, threshold=0.1):
+    """
+    Compare the results of two runs of run_benchmarks().
+
+    Parameters
+    ----------
+    base, new : dict or str
+        Results, or paths of JSON files of results.
+    threshold : float
+        Relative increase of the minimum time or of the peak memory of a
+        benchmark that is a regression. (default is 0.1, 10 percent)
+
+    Returns
+    -------
+    comparison : list of dict
+        For each benchmark in both results: name, base and new (minimum
+        times), time_ratio (new / base), base_peak_bytes, new_peak_bytes,
+        memory_ratio (None if memory was not traced) and regression (True if
+        a ratio is larger than 1 + threshold).
+
+    """
+    if not isinstance(base, dict):
+        base = read_results(base)
+    if not isinstance(new, dict):
+        new = read_results(new)
+    if base.get('params') != new.get('params'):
+        raise ValueError('the results are for different benchmark sizes')
+    comparison = []
+    for name in sorted(base['benchmarks']):
+        b = base['benchmarks'][name]
+        n = new['benchmarks'].get(name)
+        if n is None or b['status'] != 'ok' or n['status'] != 'ok':
+            continue
+        row = {'name': name, 'base': b['min'], 'new': n['min'],
+               'time_ratio': n['min'] / b['min'] if b['min'] else None,
+               'base_peak_bytes': b['peak_bytes'],
+               'new_peak_bytes': n['peak_bytes'], 'memory_ratio': None}
+        if b['peak_bytes'] and n['peak_bytes'] is not None:
+            row['memory_ratio'] = float(n['peak_bytes']) / b['peak_bytes']
+        row['regression'] = any(ratio is not None and ratio > 1. + threshold
+                                for ratio in (row['time_ratio'],
+                                              row['memory_ratio']))
+        comparison.append(row)
+    return comparison
+
+
+def print_comparison(comparison):
+    """
+    Print the result of compare_results().
+
+    """
+    print('{:32s} {:>10s} {:>10s} {:>7s} {:>7s}'.format('benchmark', 'base',
+                                                      'new', 'time', 'memory'))
+    for row in comparison:
+        ratios = ['{:7.2f}'.format(ratio) if ratio is not None else
+                  '{:>7s}'.format('-')
+                  for ratio in (row['time_ratio'], row['memory_ratio'])]
+        print('{:32s} {:10.4f} {:10.4f} {} {}{}'.format(
+            row['name'], row['base'], row['new'], ratios[0], ratios[1],
+            '  REGRESSION' if row['regression'] else ''))
@@ -0,0 +1,326 @@
+"""
+synthetic module.  Generates synthetic models and model output files of
+configurable size for the benchmarks: a structured MODFLOW-2005 model, an
+unstructured (DISV) MODFLOW 6 simulation, and head, concentration, cell
+budget and MODPATH 6 pathline files.
+
+"""
+from __future__ import print_function
+import os
+import numpy as np
+import flopy
+from flopy.utils.binaryfile import BinaryHeader
+
+
+def _random_cells(rng, n, nlay, nrow, ncol):
+    # n random cells (k, i, j), without repetitions if the grid is big
+    # enough
+    ncells = nlay * nrow * ncol
+    nodes = rng.choice(ncells, n, replace=n > ncells)
+    return np.unravel_index(nodes, (nlay, nrow, ncol))
+
+
+def make_structured_model(model_ws, nlay=3, nrow=100, ncol=100, nper=10,
+                          nwel=1000, nghb=1000, modelname='synthetic',
+                          external_path=None, seed=0):
+    """
+    Create and write a synthetic structured MODFLOW-2005 model with DIS,
+    BAS6, LPF, RCH, WEL, GHB, OC and PCG packages.
+
+    Parameters
+    ----------
+    model_ws : str
+        Model workspace, it is created if it does not exist.
+    nlay, nrow, ncol : int
+        Grid dimensions.
+    nper : int
+        Number of stress periods, the first one is steady state.
+    nwel, nghb : int
+        Number of WEL and GHB records in each stress period.
+    modelname : str
+        Name of the model. (default is 'synthetic')
+    external_path : str
+        Write the arrays to external files in this directory of model_ws.
+        (default is None, the arrays are written to the package files)
+    seed : int
+        Seed of the random values. (default is 0)
+
+    Returns
+    -------
+    ml : flopy.modflow.Modflow
+
+    """
+    rng = np.random.RandomState(seed)
+    if not os.path.isdir(model_ws):
+        os.makedirs(model_ws)
+    ml = flopy.modflow.Modflow(modelname, model_ws=model_ws,
+                               external_path=external_path)
+    botm = 100. - 10. * np.arange(1, nlay + 1)
+    botm = botm[:, None, None] + rng.uniform(-1., 1., (nlay, nrow, ncol))
+    steady = [True] + [False] * (nper - 1)
+    flopy.modflow.ModflowDis(ml, nlay=nlay, nrow=nrow, ncol=ncol, nper=nper,
+                             delr=100., delc=100., top=100., botm=botm,
+                             perlen=1., nstp=1, steady=steady)
+    flopy.modflow.ModflowBas(ml, ibound=1, strt=100.)
+    hk = np.exp(rng.normal(0., 1., (nlay, nrow, ncol)))
+    flopy.modflow.ModflowLpf(ml, laytyp=0, hk=hk, vka=hk / 10., ss=1e-5,
+                             sy=0.1, ipakcb=53)
+    rech = {kper: rng.uniform(0., 1e-3, (nrow, ncol)).astype(np.float32)
+            for kper in range(nper)}
+    flopy.modflow.ModflowRch(ml, rech=rech, ipakcb=53)
+    wel_data = {}
+    ghb_data = {}
+    for kper in range(nper):
+        wel = flopy.modflow.ModflowWel.get_empty(nwel)
+        wel['k'], wel['i'], wel['j'] = _random_cells(rng, nwel, nlay, nrow,
+                                                     ncol)
+        wel['flux'] = rng.uniform(-100., 0., nwel)
+        wel_data[kper] = wel
+        ghb = flopy.modflow.ModflowGhb.get_empty(nghb)
+        ghb['k'], ghb['i'], ghb['j'] = _random_cells(rng, nghb, nlay, nrow,
+                                                     ncol)
+        ghb['bhead'] = rng.uniform(90., 100., nghb)
+        ghb['cond'] = rng.uniform(1., 100., nghb)
+        ghb_data[kper] = ghb
+    flopy.modflow.ModflowWel(ml, stress_period_data=wel_data, ipakcb=53)
+    flopy.modflow.ModflowGhb(ml, stress_period_data=ghb_data, ipakcb=53)
+    flopy.modflow.ModflowOc(ml, stress_period_data={
+        (kper, 0): ['save head', 'save budget'] for kper in range(nper)})
+    flopy.modflow.ModflowPcg(ml)
+    ml.write_input()
+    return ml
+
+
+def make_quad_vertices(nrow, ncol, delr=100., delc=100.):
+    """
+    Get the vertices and cell2d records of a MODFLOW 6 DISV grid of
+    nrow * ncol quadrilateral cells.
+
+    Returns
+    -------
+    vertices : list of [iv, x, y]
+    cell2d : list of [icpl, xc, yc, 4, iv1, iv2, iv3, iv4]
+
+    """
+    ncolv = ncol + 1
+    vertices = [[i * ncolv + j, j * delr, (nrow - i) * delc]
+                for i in range(nrow + 1) for j in range(ncolv)]
+    cell2d = []
+    for i in range(nrow):
+        for j in range(ncol):
+            iv = i * ncolv + j
+            # clockwise
+            cell2d.append([i * ncol + j, (j + 0.5) * delr,
+                           (nrow - i - 0.5) * delc, 4, iv, iv + 1,
+                           iv + 1 + ncolv, iv + ncolv])
+    return vertices, cell2d
+
+
+def make_unstructured_simulation(sim_ws, nlay=3, nrow=100, ncol=100, nper=10,
+                                 nwel=1000, nghb=1000, modelname='synthetic',
+                                 seed=0):
+    """
+    Create and write a synthetic MODFLOW 6 simulation with a DISV
+    (unstructured) grid of quadrilateral cells, and NPF, IC, STO, WEL, GHB,
+    OC and IMS packages.
+
+    Parameters
+    ----------
+    sim_ws : str
+        Simulation workspace, it is created if it does not exist.
+    nlay : int
+        Number of layers.
+    nrow, ncol : int
+        The grid has nrow * ncol cells in a layer.
+    nper : int
+        Number of stress periods, the first one is steady state.
+    nwel, nghb : int
+        Number of WEL and GHB records in each stress period.
+    modelname : str
+        Name of the model. (default is 'synthetic')
+    seed : int
+        Seed of the random values. (default is 0)
+
+    Returns
+    -------
+    sim : flopy.mf6.MFSimulation
+
+    """
+    rng = np.random.RandomState(seed)
+    if not os.path.isdir(sim_ws):
+        os.makedirs(sim_ws)
+    ncpl = nrow * ncol
+    sim = flopy.mf6.MFSimulation(sim_name=modelname, sim_ws=sim_ws,
+                                 verbosity_level=0)
+    flopy.mf6.ModflowTdis(sim, nper=nper,
+                          perioddata=[(1., 1, 1.)] * nper)
+    flopy.mf6.ModflowIms(sim)
+    gwf = flopy.mf6.ModflowGwf(sim, modelname=modelname)
+    vertices, cell2d = make_quad_vertices(nrow, ncol)
+    botm = 100. - 10. * np.arange(1, nlay + 1)
+    botm = botm[:, None] + rng.uniform(-1., 1., (nlay, ncpl))
+    flopy.mf6.ModflowGwfdisv(gwf, nlay=nlay, ncpl=ncpl,
+                             nvert=len(vertices), top=100., botm=botm,
+                             vertices=vertices, cell2d=cell2d)
+    flopy.mf6.ModflowGwfnpf(gwf, k=np.exp(rng.normal(0., 1.,
+                                                     (nlay, ncpl))))
+    flopy.mf6.ModflowGwfic(gwf, strt=100.)
+    flopy.mf6.ModflowGwfsto(gwf, ss=1e-5, sy=0.1, steady_state={0: True},
+                            transient={1: True})
+    wel_data = {}
+    ghb_data = {}
+    for kper in range(nper):
+        k, i, j = _random_cells(rng, nwel, nlay, nrow, ncol)
+        wel_data[kper] = [((kk, ii * ncol + jj), q) for kk, ii, jj, q in
+                          zip(k, i, j, rng.uniform(-100., 0., nwel))]
+        k, i, j = _random_cells(rng, nghb, nlay, nrow, ncol)
+        ghb_data[kper] = [((kk, ii * ncol + jj), h, c) for kk, ii, jj, h, c in
+                          zip(k, i, j, rng.uniform(90., 100., nghb),
+                              rng.uniform(1., 100., nghb))]
+    flopy.mf6.ModflowGwfwel(gwf, maxbound=nwel, stress_period_data=wel_data)
+    flopy.mf6.ModflowGwfghb(gwf, maxbound=nghb, stress_period_data=ghb_data)
+    flopy.mf6.ModflowGwfoc(gwf, budget_filerecord=modelname + '.cbc',
+                           head_filerecord=modelname + '.hds',
+                           saverecord=[('HEAD', 'ALL'), ('BUDGET', 'ALL')])
+    sim.write_simulation()
+    return sim
+
+
+def write_head_file(fname, nlay, nrow, ncol, nper, nstp=1, text='HEAD',
+                    seed=0):
+    """
+    Write a synthetic single precision binary head file with a record for
+    each layer of each time step.
+
+    Returns
+    -------
+    heads : numpy.ndarray
+        The heads, shape (nper * nstp, nlay, nrow, ncol).
+
+    """
+    return _write_layer_file(fname, 'head', nlay, nrow, ncol, nper, nstp,
+                             text, seed)
+
+
+def write_ucn_file(fname, nlay, nrow, ncol, nper, nstp=1,
+                   text='CONCENTRATION', seed=0):
+    """
+    Write a synthetic single precision binary MT3D concentration (UCN)
+    file with a record for each layer of each time step.
+
+    Returns
+    -------
+    concentrations : numpy.ndarray
+        The concentrations, shape (nper * nstp, nlay, nrow, ncol).
+
+    """
+    return _write_layer_file(fname, 'ucn', nlay, nrow, ncol, nper, nstp,
+                             text, seed)
+
+
+def _write_layer_file(fname, bintype, nlay, nrow, ncol, nper, nstp, text,
+                      seed):
+    rng = np.random.RandomState(seed)
+    hdt = BinaryHeader.set_dtype(bintype=bintype)
+    data = np.empty((nper * nstp, nlay, nrow, ncol), dtype=np.float32)
+    header = np.zeros(1, dtype=hdt)
+    header['text'] = text.rjust(16).encode()
+    header['ncol'] = ncol
+    header['nrow'] = nrow
+    with open(fname, 'wb') as f:
+        for kper in range(nper):
+            for kstp in range(nstp):
+                n = kper * nstp + kstp
+                data[n] = 100. - n + rng.uniform(-1., 1., (nlay, nrow, ncol))
+                header['kstp'] = kstp + 1
+                header['kper'] = kper + 1
+                header['totim'] = n + 1.
+                if bintype == 'ucn':
+                    header['ntrans'] = n + 1
+                else:
+                    header['pertim'] = kstp + 1.
+                for k in range(nlay):
+                    header['ilay'] = k + 1
+                    header.tofile(f)
+                    data[n, k].tofile(f)
+    return data
+
+
+def write_budget_file(fname, nlay, nrow, ncol, nper, nstp=1, nlist=1000,
+                      seed=0):
+    """
+    Write a synthetic single precision binary cell budget file. Each time
+    step has FLOW RIGHT FACE, FLOW FRONT FACE and FLOW LOWER FACE records
+    (full 3D arrays), a STORAGE record (compact, an array) and WELLS and
+    RECHARGE records (compact, lists of nlist cells).
+
+    Returns
+    -------
+    texts : list of str
+        The record names of a time step.
+
+    """
+    rng = np.random.RandomState(seed)
+    h1dt = np.dtype([('kstp', 'i4'), ('kper', 'i4'), ('text', 'a16'),
+                     ('ncol', 'i4'), ('nrow', 'i4'), ('nlay', 'i4')])
+    h2dt = np.dtype([('imeth', 'i4'), ('delt', 'f4'), ('pertim', 'f4'),
+                     ('totim', 'f4')])
+    listdt = np.dtype([('node', 'i4'), ('q', 'f4')])
+    shape = (nlay, nrow, ncol)
+    ncells = nlay * nrow * ncol
+    records = [('FLOW RIGHT FACE', 0), ('FLOW FRONT FACE', 0),
+               ('FLOW LOWER FACE', 0), ('STORAGE', 1), ('WELLS', 2),
+               ('RECHARGE', 2)]
+    with open(fname, 'wb') as f:
+        for kper in range(nper):
+            for kstp in range(nstp):
+                totim = kper * nstp + kstp + 1.
+                for text, imeth in records:
+                    h1 = np.array([(kstp + 1, kper + 1, text.rjust(16),
+                                    ncol, nrow, nlay)], dtype=h1dt)
+                    if imeth == 0:
+                        h1.tofile(f)
+                        rng.normal(0., 1., shape).astype(np.float32).tofile(f)
+                        continue
+                    h1['nlay'] = -nlay
+                    h1.tofile(f)
+                    np.array([(imeth, 1., kstp + 1., totim)],
+                             dtype=h2dt).tofile(f)
+                    if imeth == 1:
+                        rng.normal(0., 1., shape).astype(np.float32).tofile(f)
+                    else:
+                        data = np.empty(nlist, dtype=listdt)
+                        data['node'] = rng.choice(ncells, nlist,
+                                                  replace=nlist > ncells) + 1
+                        data['q'] = rng.uniform(-100., 100., nlist)
+                        np.array([nlist], dtype=np.int32).tofile(f)
+                        data.tofile(f)
+    return [text for text, imeth in records]
+
+
+def write_pathline_file(fname, nparticles, npoints, nlay, nrow, ncol,
+                        seed=0):
+    """
+    Write a synthetic MODPATH 6 pathline file with npoints points for each
+    of nparticles particles.
+
+    """
+    rng = np.random.RandomState(seed)
+    n = nparticles * npoints
+    particleid = np.repeat(np.arange(1, nparticles + 1), npoints)
+    point = np.tile(np.arange(npoints), nparticles)
+    k, i, j = _random_cells(rng, n, nlay, nrow, ncol)
+    x = np.cumsum(rng.uniform(0., 10., n))
+    columns = [particleid, np.ones(n), point, point + 1,
+               point * 10., x, rng.uniform(0., nrow * 100., n),
+               rng.uniform(0., 100., n), k + 1, i + 1, j + 1, np.ones(n),
+               rng.uniform(0., 1., n), rng.uniform(0., 1., n),
+               rng.uniform(0., 1., n), np.ones(n)]
+    fmt = ['%10d', '%5d', '%5d', '%5d', '%24.15E', '%24.15E', '%24.15E',
+           '%24.15E', '%4d', '%4d', '%4d', '%2d', '%15.7E', '%15.7E',
+           '%15.7E', '%5d']
+    with open(fname, 'w') as f:
+        f.write('MODPATH_PATHLINE_FILE 6 0\n')
+        f.write(' 1   0.000000000000000E+00\n')
+        f.write('END HEADER\n')
+        np.savetxt(f, np.column_stack(columns), fmt=fmt, delimiter='')
@@ -0,0 +1,61 @@
+"""
+Run the benchmark suite on synthetic models and output files, or compare
+the results of two runs.
+
+    python run_benchmarks.py [--size small] [--repeat 3] [--output FILE]
+                             [--workspace DIR] [--select NAME ...]
+                             [--no-memory]
+    python run_benchmarks.py --compare BASE NEW [--threshold 0.1]
+
+The comparison exits with status 1 if a benchmark is slower, or allocates
+more memory, by more than the threshold.
+"""
+from __future__ import print_function
+import sys
+import argparse
+
+from benchmark import SIZES, get_benchmark_names, run_benchmarks, \
+    write_results, compare_results, print_comparison
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description='FloPy benchmarks')
+    parser.add_argument('--size', default='small', choices=sorted(SIZES),
+                        help='size of the synthetic models and outputs')
+    parser.add_argument('--repeat', type=int, default=3,
+                        help='number of timed runs of each benchmark')
+    parser.add_argument('--output', help='JSON file of the results')
+    parser.add_argument('--workspace',
+                        help='directory of the synthetic inputs (kept)')
+    parser.add_argument('--select', nargs='+',
+                        help='only run benchmarks whose names contain one of '
+                             'these strings')
+    parser.add_argument('--no-memory', action='store_true',
+                        help='do not measure the peak memory')
+    parser.add_argument('--list', action='store_true',
+                        help='list the benchmarks')
+    parser.add_argument('--compare', nargs=2, metavar=('BASE', 'NEW'),
+                        help='compare two JSON files of results')
+    parser.add_argument('--threshold', type=float, default=0.1,
+                        help='relative increase that is a regression')
+    args = parser.parse_args(args)
+
+    if args.list:
+        print('\n'.join(get_benchmark_names()))
+        return 0
+    if args.compare:
+        comparison = compare_results(args.compare[0], args.compare[1],
+                                     threshold=args.threshold)
+        print_comparison(comparison)
+        return int(any(row['regression'] for row in comparison))
+    results = run_benchmarks(size=args.size, workspace=args.workspace,
+                             repeat=args.repeat, select=args.select,
+                             memory=not args.no_memory)
+    if args.output:
+        write_results(results, args.output)
+    return int(any(result['status'] == 'error'
+                   for result in results['benchmarks'].values()))
+
+
+if __name__ == '__main__':
+    sys.exit(main())
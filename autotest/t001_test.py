@@ -8,5 +8,37 @@ def test_import():
     return
 
 
+def test_import_modules():
+    # modules imported by import flopy, in a new interpreter
+    import sys
+    import subprocess
+    code = 'import sys, flopy; print(" ".join(sorted(sys.modules)))'
+    out = subprocess.check_output([sys.executable, '-c', code])
+    modules = set(out.decode().split())
+    assert 'flopy.modflow' in modules
+    assert 'flopy.utils' in modules
+    # the modules are imported on first access from python 3.5, and by
+    # import flopy before
+    if sys.version_info >= (3, 5):
+        heavy = ['flopy.plot', 'flopy.export', 'flopy.pest', 'flopy.mf6',
+                 'matplotlib', 'pandas', 'scipy']
+        for name in heavy:
+            assert name not in modules, \
+                '{} imported by import flopy'.format(name)
+        code = 'import sys, flopy; flopy.plot; flopy.mf6.MFSimulation; ' + \
+               'print(" ".join(sorted(sys.modules)))'
+        out = subprocess.check_output([sys.executable, '-c', code])
+        modules = set(out.decode().split())
+        assert 'flopy.plot' in modules and 'flopy.mf6' in modules
+        assert 'flopy.export' not in modules
+    import flopy
+    assert flopy.export.utils is not None
+    assert flopy.pest.Params is not None
+    for name in ('plot', 'export', 'pest', 'mf6'):
+        assert name in dir(flopy)
+    return
+
+
 if __name__ == '__main__':
     test_import()
+    test_import_modules()
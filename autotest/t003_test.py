@@ -38,8 +38,250 @@ def test_loadtwrip():
     assert ml.load_fail is False
     return
 
+def test_load_n_workers():
+    import numpy as np
+    for pth, namefile in [('freyberg', 'freyberg.nam'),
+                          ('parameters', 'twrip.nam'),
+                          (os.path.join('mflgr_v2', 'ex3'), 'ex3_parent.nam')]:
+        pth = os.path.join('..', 'examples', 'data', pth)
+        ml = flopy.modflow.Modflow.load(namefile, model_ws=pth, check=False)
+        ml2 = flopy.modflow.Modflow.load(namefile, model_ws=pth, check=False,
+                                         n_workers=3)
+        assert ml2.load_fail is False
+        assert [p.name for p in ml2.packagelist] == \
+               [p.name for p in ml.packagelist]
+        assert ml2.output_fnames == ml.output_fnames
+        assert ml2.output_units == ml.output_units
+        assert ml2.external_units == ml.external_units
+        for p, p2 in zip(ml.packagelist, ml2.packagelist):
+            for key, value in p.__dict__.items():
+                if isinstance(value, (flopy.utils.Util2d, flopy.utils.Util3d)):
+                    assert np.array_equal(value.array, p2.__dict__[key].array)
+    return
+
+
+def test_load_lazy_packages():
+    pth = os.path.join('..', 'examples', 'data', 'freyberg')
+    ml = flopy.modflow.Modflow.load('freyberg.nam', model_ws=pth,
+                                    check=False)
+    ml2 = flopy.modflow.Modflow.load('freyberg.nam', model_ws=pth,
+                                     check=False, lazy_packages=True)
+    assert [p.name[0] for p in ml2.packagelist] == ['DIS', 'BAS6']
+    assert ml2.get_package_list() == ml.get_package_list()
+    assert ml2.has_package('WEL')
+    # packages are loaded when they are used, in name file order
+    assert ml2.wel.stress_period_data[0].shape == \
+           ml.wel.stress_period_data[0].shape
+    assert ml2.get_package('OC') is not None
+    assert [p.name[0] for p in ml2.packagelist] == ['DIS', 'BAS6', 'WEL',
+                                                    'OC']
+    assert ml2.get_package('GHB') is None
+    # the other packages are loaded before the model is written
+    ml2.change_model_ws(os.path.join('temp', 't003'))
+    ml2.write_input()
+    assert [p.name for p in ml2.packagelist] == \
+           [p.name for p in ml.packagelist]
+    assert ml2.external_units == ml.external_units
+
+    # the output files are written to the name file in the same order
+    pth = os.path.join('..', 'examples', 'data',
+                       'freyberg_multilayer_transient')
+    ml = flopy.modflow.Modflow.load('freyberg.nam', model_ws=pth,
+                                    check=False)
+    ml2 = flopy.modflow.Modflow.load('freyberg.nam', model_ws=pth,
+                                     check=False, lazy_packages=True)
+    assert ml2.upw is not None
+    namefiles = []
+    for model, name in [(ml, 'eager'), (ml2, 'lazy')]:
+        model.change_model_ws(os.path.join('temp', 't003_' + name))
+        model.write_input()
+        with open(os.path.join(model.model_ws, 'freyberg.nam')) as f:
+            namefiles.append(f.read())
+    assert namefiles[1] == namefiles[0]
+    assert ml2.output_units == ml.output_units
+
+    # packages that read one external unit read it in name file order
+    import numpy as np
+    pth = os.path.join('temp', 't003_shared')
+    ml = flopy.modflow.Modflow('shared', model_ws=pth)
+    dis = flopy.modflow.ModflowDis(ml, nlay=1, nrow=2, ncol=3)
+    bas = flopy.modflow.ModflowBas(ml)
+    lpf = flopy.modflow.ModflowLpf(ml)
+    rch = flopy.modflow.ModflowRch(ml)
+    ml.write_input()
+    for fname, name in [('shared.lpf', '#hk'), ('shared.rch', '#rech')]:
+        fname = os.path.join(pth, fname)
+        lines = [('EXTERNAL 50 1.0 (FREE) -1 {}\n'.format(name)
+                  if line.startswith('CONSTANT') and name in line else line)
+                 for line in open(fname).readlines()]
+        open(fname, 'w').write(''.join(lines))
+    with open(os.path.join(pth, 'shared.nam'), 'a') as f:
+        f.write('DATA 50 shared.dat\n')
+    hk = np.arange(1., 7.).reshape((2, 3))
+    rech = -hk
+    np.savetxt(os.path.join(pth, 'shared.dat'), np.vstack((hk, rech)))
+    ml2 = flopy.modflow.Modflow.load('shared.nam', model_ws=pth, check=False,
+                                     lazy_packages=True)
+    assert np.array_equal(ml2.rch.rech[0].array, rech)
+    assert np.array_equal(ml2.lpf.hk[0].array, hk)
+    return
+
+
+def test_load_cache():
+    import shutil
+    import numpy as np
+    pth = os.path.join('temp', 't003_cache')
+    cache = os.path.join(pth, 'cache')
+    if os.path.isdir(pth):
+        shutil.rmtree(pth)
+    shutil.copytree(os.path.join('..', 'examples', 'data', 'freyberg'), pth)
+    ml = flopy.modflow.Modflow.load('freyberg.nam', model_ws=pth,
+                                    check=False, cache=cache)
+    assert len(os.listdir(cache)) == 1
+    ml2 = flopy.modflow.Modflow.load('freyberg.nam', model_ws=pth,
+                                     check=False, cache=cache)
+    assert [p.name for p in ml2.packagelist] == \
+           [p.name for p in ml.packagelist]
+    assert ml2.output_fnames == ml.output_fnames
+    assert np.array_equal(ml2.lpf.hk.array, ml.lpf.hk.array)
+    assert np.array_equal(ml2.wel.stress_period_data[0],
+                          ml.wel.stress_period_data[0])
+    # the snapshot is not used once an input file has changed
+    hk = ml.lpf.hk.array * 2.
+    ml.lpf.hk = hk
+    ml.lpf.write_file()
+    ml3 = flopy.modflow.Modflow.load('freyberg.nam', model_ws=pth,
+                                     check=False, cache=cache)
+    assert np.allclose(ml3.lpf.hk.array, hk)
+    return
+
+
+def test_write_input_n_workers():
+    import shutil
+    import numpy as np
+    model_ws = os.path.join('temp', 't003_n_workers')
+    if os.path.isdir(model_ws):
+        shutil.rmtree(model_ws)
+    nlay, nrow, ncol = 3, 20, 30
+    hk = np.random.random((nlay, nrow, ncol)).astype(np.float32)
+    rech = np.random.random((nrow, ncol)).astype(np.float32)
+    ibound = np.ones((nlay, nrow, ncol), dtype=np.int32)
+    ibound[:, 0, 0] = -1
+
+    def build(name, external_path):
+        ml = flopy.modflow.Modflow(name, model_ws=model_ws,
+                                   external_path=external_path)
+        dis = flopy.modflow.ModflowDis(ml, nlay, nrow, ncol, nper=2,
+                                       botm=[-1., -2., -3.])
+        bas = flopy.modflow.ModflowBas(ml, ibound=ibound)
+        lpf = flopy.modflow.ModflowLpf(ml, hk=hk)
+        rch = flopy.modflow.ModflowRch(ml, rech={0: rech, 1: 2. * rech})
+        return ml
+
+    # array files written by worker processes are the same
+    for n_workers in (None, 2):
+        ml = build('serial' if n_workers is None else 'parallel',
+                   'ref_{}'.format(n_workers))
+        ml.write_input(n_workers=n_workers)
+    for fname in os.listdir(os.path.join(model_ws, 'ref_None')):
+        with open(os.path.join(model_ws, 'ref_None', fname)) as f:
+            s1 = f.read()
+        with open(os.path.join(model_ws, 'ref_2', fname)) as f:
+            s2 = f.read()
+        assert s1 == s2, fname
+
+    # large real arrays as binary files
+    ml = build('binary', None)
+    ml.write_input(n_workers=2, binary_arrays=nrow * ncol)
+    assert not ml.lpf.hk[0].format.binary
+    with open(os.path.join(model_ws, 'binary.lpf')) as f:
+        assert '(BINARY)' in f.read()
+    with open(os.path.join(model_ws, 'binary.bas')) as f:
+        assert '(BINARY)' not in f.read()
+    ml2 = flopy.modflow.Modflow.load('binary.nam', model_ws=model_ws)
+    np.testing.assert_equal(ml2.lpf.hk.array, hk)
+    np.testing.assert_equal(ml2.rch.rech.array, ml.rch.rech.array)
+    np.testing.assert_equal(ml2.bas6.ibound.array, ibound)
+
+
+def test_write_input_incremental():
+    import shutil
+    import numpy as np
+    model_ws = os.path.join('temp', 't003_incremental')
+    if os.path.isdir(model_ws):
+        shutil.rmtree(model_ws)
+    nlay, nrow, ncol = 3, 20, 30
+    ml = flopy.modflow.Modflow('incremental', model_ws=model_ws,
+                               external_path='ref')
+    dis = flopy.modflow.ModflowDis(ml, nlay, nrow, ncol, nper=2,
+                                   botm=[-1., -2., -3.])
+    bas = flopy.modflow.ModflowBas(ml)
+    lpf = flopy.modflow.ModflowLpf(ml, hk=np.random.random((nlay, nrow,
+                                                             ncol)))
+    wel = flopy.modflow.ModflowWel(ml, stress_period_data={0: [[0, 1, 1,
+                                                                -1.]]})
+    pcg = flopy.modflow.ModflowPcg(ml)
+
+    def mtimes():
+        fnames = [os.path.join(model_ws, fname)
+                  for fname in os.listdir(model_ws)] + \
+                 [os.path.join(model_ws, 'ref', fname)
+                  for fname in os.listdir(os.path.join(model_ws, 'ref'))]
+        return dict((os.path.relpath(fname, model_ws),
+                     os.stat(fname).st_mtime)
+                    for fname in fnames if os.path.isfile(fname))
+
+    def rewritten():
+        # set the modification times back, so that a new write is seen
+        for fname, mtime in before.items():
+            fname = os.path.join(model_ws, fname)
+            if os.path.isfile(fname):
+                os.utime(fname, (mtime - 10., mtime - 10.))
+        ml.write_input(incremental=True)
+        return sorted(fname for fname, mtime in mtimes().items()
+                      if mtime != before[fname] - 10.)
+
+    ml.write_input(incremental=True)
+    before = mtimes()
+    assert rewritten() == ['incremental.nam']
+
+    before = mtimes()
+    lpf.hk[1] = 5.
+    assert rewritten() == ['incremental.lpf', 'incremental.nam',
+                           os.path.join('ref', 'hk_layer_2.ref')]
+
+    before = mtimes()
+    wel.stress_period_data[0]['flux'][0] = -3.
+    os.remove(os.path.join(model_ws, 'incremental.pcg'))
+    assert rewritten() == ['incremental.nam', 'incremental.pcg',
+                           'incremental.wel',
+                           os.path.join('ref', 'WEL_0000.dat')]
+
+    # a change of the discretization writes all files
+    before = mtimes()
+    dis.perlen[1] = 10.
+    assert rewritten() == sorted(before)
+
+    ml2 = flopy.modflow.Modflow.load('incremental.nam', model_ws=model_ws)
+    np.testing.assert_equal(ml2.lpf.hk[1].array, 5.)
+    assert ml2.wel.stress_period_data[0]['flux'][0] == -3.
+    assert ml2.dis.perlen[1] == 10.
+
+    # a write_input() that is not incremental drops the fingerprints
+    lpf.hk[1] = 7.
+    ml.write_input()
+    lpf.hk[1] = 5.
+    ml.write_input(incremental=True)
+    ml2 = flopy.modflow.Modflow.load('incremental.nam', model_ws=model_ws)
+    np.testing.assert_equal(ml2.lpf.hk[1].array, 5.)
+
 
 if __name__ == '__main__':
     test_loadfreyberg()
+    #test_load_n_workers()
+    #test_load_lazy_packages()
+    #test_load_cache()
+    #test_write_input_n_workers()
+    #test_write_input_incremental()
     #test_loadoahu()
     #test_loadtwrip()
@@ -73,6 +73,51 @@ def test_load_txt_fixed():
     assert fa.dtype == a.dtype
 
 
+def test_load_txt_position():
+    # arrays that follow each other and other input in the same file
+    a = np.arange(12, dtype=np.float32).reshape((3, 4)) / 4.
+    b = np.array([[3, 3, 3, 1], [2, 2, 2, 2], [5, 6, 7, 8]], np.int32)
+    fp = StringIO(dedent(u'''\
+        0.0 0.25 0.5 0.75
+        1.0, 1.25 1.5
+        1.75 2.0 2.25 2.5 2.75 99.0
+        3*3 1 4*2
+        5 6 7 8
+         1.000E+00 2.000E+00
+         3.000E+00
+         4.000E+00
+        NEXT LINE
+    '''))
+    fa = Util2d.load_txt(a.shape, fp, a.dtype, '(FREE)')
+    np.testing.assert_equal(fa, a)
+    fb = Util2d.load_txt(b.shape, fp, b.dtype, '(FREE)')
+    np.testing.assert_equal(fb, b)
+    fc = Util2d.load_txt((4,), fp, np.float32, '(2E10.3)')
+    np.testing.assert_equal(fc, [1., 2., 3., 4.])
+    assert fp.readline() == 'NEXT LINE\n'
+
+    # large arrays written by flopy
+    a = np.random.RandomState(0).uniform(-10., 10., (50, 47))
+    a = a.astype(np.float32)
+    for fmtin in ['(FREE)', '(10E15.6)', '(7G13.5)']:
+        fp = StringIO()
+        Util2d.write_txt(a.shape, fp, a, fortran_format=fmtin)
+        fp.write(u'NEXT LINE\n')
+        fp.seek(0)
+        fa = Util2d.load_txt(a.shape, fp, a.dtype, fmtin)
+        decimal = 5 if fmtin == '(FREE)' else 3
+        np.testing.assert_almost_equal(fa, a, decimal=decimal)
+        assert fp.readline() == 'NEXT LINE\n'
+
+    # bad items raise the same error as before
+    fp = StringIO(u'1 2 3 x\n')
+    try:
+        Util2d.load_txt((4,), fp, np.float32, '(FREE)')
+        assert False, 'ValueError not raised'
+    except ValueError:
+        pass
+
+
 def test_load_block():
     a = np.ones((2, 5), dtype=np.int32) * 4
     fp = StringIO(dedent(u'''\
@@ -278,9 +323,10 @@ def test_util2d():
     assert np.array_equal(u2d_arange.array, a4a)
 
     # test view vs copy with .array
-    a5 = u2d.array
+    a5 = u2d.array_copy()
     a5 += 1
     assert not np.array_equal(a5, u2d.array)
+    assert not u2d.array.flags.writeable
 
     # Util2d.__mul__() overload
     new_2d = u2d * 2
@@ -715,6 +761,180 @@ def test_mflist():
     assert flx1.sum() == flx2.sum()
 
 
+def test_mflist_to_array():
+    ml = flopy.modflow.Modflow(model_ws=out_dir)
+    dis = flopy.modflow.ModflowDis(ml, nlay=2, nrow=3, ncol=4, nper=4)
+    sp_data = {1: [[0, 1, 1, 1., 10.], [0, 1, 1, 2., 20.], [1, 2, 3, 3., 5.]],
+               3: [[1, 0, 0, 4., 1.]]}
+    ghb = flopy.modflow.ModflowGhb(ml, stress_period_data=sp_data)
+    spd = ghb.stress_period_data
+    arrays = spd.to_array(kper=1)
+    assert arrays['bhead'].shape == (2, 3, 4)
+    # conductances are summed, heads are averaged
+    assert arrays['cond'][0, 1, 1] == 30.
+    assert arrays['bhead'][0, 1, 1] == 1.5
+    assert arrays['bhead'][1, 2, 3] == 3.
+    assert arrays['cond'].sum() == 35.
+    arrays = spd.to_array(kper=2, mask=True)
+    assert arrays['bhead'][0, 1, 1] == 1.5
+    assert np.isnan(arrays['bhead'][0, 0, 0])
+    assert np.isnan(spd.to_array(kper=0, mask=True)['cond']).all()
+
+    m4ds = spd.masked_4D_arrays
+    assert m4ds['cond'].shape == (4, 2, 3, 4)
+    assert np.isnan(m4ds['cond'][0]).all()
+    np.testing.assert_equal(m4ds['cond'][2], m4ds['cond'][1])
+    assert m4ds['cond'][3, 1, 0, 0] == 1.
+    for name, m4d in spd.masked_4D_arrays_itr():
+        np.testing.assert_equal(m4d, m4ds[name])
+    spd[3] = -1
+    np.testing.assert_equal(spd.to_array(kper=3)['cond'],
+                            spd.to_array(kper=1)['cond'])
+
+    # node indices of DISU models
+    ml = flopy.modflow.Modflow(model_ws=out_dir, version='mfusg',
+                               structured=False)
+    disu = flopy.modflow.ModflowDisU(ml, nodes=6, nlay=2, nper=3, njag=6,
+                                     iac=[1] * 6, ja=list(range(1, 7)),
+                                     cl12=1., fahl=1.)
+    wel = flopy.modflow.ModflowWel(ml, stress_period_data={
+        0: [[0, -1.], [3, -2.], [3, -3.]], 2: [[5, 4.]]})
+    spd = wel.stress_period_data
+    np.testing.assert_equal(spd.to_array(kper=1)['flux'],
+                            [-1., 0., 0., -5., 0., 0.])
+    m4d = spd.masked_4D_arrays['flux']
+    assert m4d.shape == (3, 6)
+    assert m4d[2, 5] == 4. and np.isnan(m4d[2, :5]).all()
+
+
+def test_mflist_columnar():
+    from flopy.utils import MfListStore
+    ml = flopy.modflow.Modflow(model_ws=out_dir)
+    dis = flopy.modflow.ModflowDis(ml, nlay=2, nrow=3, ncol=4, nper=4)
+    sp_data = {0: [[0, 1, 1, 1., 10.], [1, 2, 3, 3., 5.]],
+               1: -1,
+               2: [[1, 0, 0, 4., 1.]]}
+    ghb = flopy.modflow.ModflowGhb(ml, stress_period_data=sp_data)
+    ml_col = flopy.modflow.Modflow('col', model_ws=out_dir)
+    dis = flopy.modflow.ModflowDis(ml_col, nlay=2, nrow=3, ncol=4, nper=4)
+    ghb_col = flopy.modflow.ModflowGhb(ml_col, stress_period_data=sp_data)
+    ghb_col.stress_period_data.set_columnar()
+    spd = ghb_col.stress_period_data
+    assert spd.columnar and isinstance(spd.data, MfListStore)
+    assert list(spd.data.keys()) == [0, 1, 2]
+    # stress periods are views of one array
+    store = spd.data
+    assert isinstance(spd[0], np.recarray)
+    assert spd[0].base is spd[2].base is store._records
+    np.testing.assert_equal(spd[1], spd[0])
+    for kper in range(4):
+        np.testing.assert_equal(spd.to_array(kper)['cond'],
+                                ghb.stress_period_data.to_array(kper)['cond'])
+
+    # the last stress period is extended in place
+    spd.add_record(2, [0, 0, 0], [5., 2.])
+    ghb.stress_period_data.add_record(2, [0, 0, 0], [5., 2.])
+    assert spd.data.get_csr()[2].shape[0] == 4
+    assert spd[2].shape[0] == 2
+    spd.add_record(1, [1, 1, 1], [6., 3.])
+    ghb.stress_period_data.add_record(1, [1, 1, 1], [6., 3.])
+    kpers, offsets, records = store.get_csr()
+    np.testing.assert_equal(kpers, [0, 1, 2])
+    np.testing.assert_equal(offsets, [0, 2, 3, 5])
+    np.testing.assert_equal(records['cond'], [10., 5., 3., 1., 2.])
+
+    # replaced records are dropped
+    for i in range(4):
+        spd[0] = [[0, 2, 2, 7., float(i)]]
+    assert store._size < 10
+    assert spd[0]['cond'][0] == 3.
+    spd[0] = ghb.stress_period_data[0]
+    data = store.to_dict()
+    assert not np.shares_memory(data[2], spd[2])
+    store2 = MfListStore.from_dict(spd.dtype, data)
+    for kper in range(3):
+        np.testing.assert_equal(store2[kper], spd.data[kper])
+
+    # the same file is written
+    ghb.write_file()
+    ghb_col.write_file()
+    fn = os.path.join(out_dir, ghb.file_name[0])
+    fn_col = os.path.join(out_dir, ghb_col.file_name[0])
+    assert open(fn).readlines()[1:] == open(fn_col).readlines()[1:]
+    spd.set_columnar(False)
+    assert isinstance(spd.data, dict)
+
+    # models can store all lists in columns
+    ml.columnar_lists = True
+    wel = flopy.modflow.ModflowWel(ml, stress_period_data={
+        0: [[0, 0, 0, -1.]], 1: [[0, 0, 1, -2.]]})
+    assert wel.stress_period_data.columnar
+
+
+def test_mflist_write_transient():
+    ml = flopy.modflow.Modflow('wt', model_ws=out_dir)
+    dis = flopy.modflow.ModflowDis(ml, nlay=2, nrow=3, ncol=4, nper=5)
+    rec = flopy.modflow.ModflowWel.get_empty(3)
+    rec['k'] = [0, 1, 1]
+    rec['i'] = [0, 2, 1]
+    rec['j'] = [3, 0, 1]
+    rec['flux'] = [-1.5, 1.0e-7, 3.0e+12]
+    sp_data = {0: rec, 1: rec.copy(), 2: 0, 3: rec}
+    wel = flopy.modflow.ModflowWel(ml, stress_period_data=sp_data)
+    wel.write_file()
+    fn = os.path.join(out_dir, wel.file_name[0])
+    lines = open(fn).readlines()
+    itmps = [int(line.split()[0]) for line in lines
+             if 'stress period' in line]
+    assert itmps == [3, -1, 0, 3, -1]
+    assert lines[3].split() == ['1', '1', '4', '-1.5']
+    assert lines[5].split() == ['2', '2', '2', '3000000000000.0']
+    wel2 = flopy.modflow.ModflowWel.load(fn, ml)
+    for kper in [1, 3, 4]:
+        for name in rec.dtype.names:
+            np.testing.assert_equal(wel2.stress_period_data[kper][name],
+                                    rec[name])
+
+    # the file handle stays open
+    f = open(fn, 'w')
+    wel.stress_period_data.write_transient(f, reuse=False)
+    assert not f.closed
+    f.close()
+    lines = open(fn).readlines()
+    assert [int(line.split()[0]) for line in lines
+            if 'stress period' in line] == [3, 3, 0, 3, -1]
+
+
+def test_mflist_load_block():
+    ml = flopy.modflow.Modflow('lb', model_ws=out_dir)
+    dis = flopy.modflow.ModflowDis(ml, nlay=2, nrow=3, ncol=4, nper=3)
+    fn = os.path.join(out_dir, 'lb.wel')
+    with open(fn, 'w') as f:
+        f.write('# wel\n         3         0\n')
+        # free format, with comments and extra values
+        f.write('         3         0 # stress period 1\n')
+        f.write('1 1 4 -1.5 # well 1\n2 3 1 1.0E-07\n  2  2  2  3e12 7 8\n')
+        # fixed format
+        f.write('         2         0\n')
+        f.write('         1         2         3-1.000E+02\n')
+        f.write('         2         1         1    2.5E00\n')
+        # mixed free and fixed format
+        f.write('         2         0\n')
+        f.write('         1         2         3-1.000E+02\n')
+        f.write('1 1 1 5.\n')
+    wel = flopy.modflow.ModflowWel.load(fn, ml)
+    spd = wel.stress_period_data
+    np.testing.assert_equal(spd[0].k, [0, 1, 1])
+    np.testing.assert_equal(spd[0].i, [0, 2, 1])
+    np.testing.assert_equal(spd[0].j, [3, 0, 1])
+    np.testing.assert_equal(spd[0].flux, np.float32([-1.5, 1.0e-7, 3.0e12]))
+    np.testing.assert_equal(spd[1].k, [0, 1])
+    np.testing.assert_equal(spd[1].i, [1, 0])
+    np.testing.assert_equal(spd[1].flux, np.float32([-100., 2.5]))
+    np.testing.assert_equal(spd[2].j, [2, 0])
+    np.testing.assert_equal(spd[2].flux, np.float32([-100., 5.]))
+
+
 def test_how():
     import numpy as np
     import flopy
@@ -743,7 +963,243 @@ def test_util3d_reset():
 
 
 
+def test_array_cache():
+    ml = flopy.modflow.Modflow(model_ws=out_dir)
+    dis = flopy.modflow.ModflowDis(ml, nlay=2, nrow=3, ncol=4, nper=3)
+    a = np.arange(12, dtype=np.float32).reshape((3, 4))
+    u2d = Util2d(ml, (3, 4), np.float32, a, 'test', cnstnt=2.0)
+    arr = u2d.array
+    assert not arr.flags.writeable
+    try:
+        arr[0, 0] = -1.
+        raise AssertionError('array is writeable')
+    except ValueError:
+        pass
+    np.testing.assert_equal(u2d.array, 2. * a)
+    assert u2d.array.base is arr.base
+
+    # changes of cnstnt and value are seen by array
+    u2d.cnstnt = 3.0
+    np.testing.assert_equal(u2d.array, 3. * a)
+    u2d.cnstnt = 1.0
+    u2d[0, 0] = 100.
+    assert u2d.array[0, 0] == 100.
+    np.testing.assert_equal(arr, 2. * a)
+
+    # array_copy can be modified
+    c = u2d.array_copy()
+    c[:] = 0.
+    assert u2d.array[0, 0] == 100.
+
+    u3d = Util3d(ml, (2, 3, 4), np.float32, [a, 1.], 'test')
+    arr = u3d.array
+    assert not arr.flags.writeable
+    assert u3d.array.base is arr.base
+    u3d[1] = 5.
+    np.testing.assert_equal(u3d.array[1], 5.)
+    u3d[0].cnstnt = 2.
+    np.testing.assert_equal(u3d.array[0], 2. * a)
+    np.testing.assert_equal(arr[0], a)
+
+    # in-place changes through _array are seen by array
+    u3d[1]._array[0, 0] *= 3.
+    assert u3d[1].array[0, 0] == 15.
+    assert u3d.array[1, 0, 0] == 15.
+    u3d[0]._array[0, 1] = -1.
+    assert u3d[0].array[0, 1] == -2.
+    assert u3d.array[0, 0, 1] == -2.
+
+    t2d = Transient2d(ml, (3, 4), np.float32, {1: a}, 'test')
+    arr = t2d.array
+    assert arr.shape == (3, 1, 3, 4)
+    assert not arr.flags.writeable
+    np.testing.assert_equal(arr[0], 0.)
+    np.testing.assert_equal(arr[2, 0], a)
+    t2d.cnstnt = 2.
+    np.testing.assert_equal(t2d.array[2, 0], 2. * a)
+    t2d[2] = 7.
+    np.testing.assert_equal(t2d.array[2], 7.)
+    np.testing.assert_equal(t2d.array[1, 0], 2. * a)
+    c = t2d.array_copy()
+    c[:] = -1.
+    np.testing.assert_equal(t2d.array[2], 7.)
+    t2d[2]._array[0, 0] = 1.
+    assert t2d.array[2, 0, 0, 0] == 1.
+
+
+def test_array2string():
+    a = np.arange(1, 7, dtype=np.float32).reshape((2, 3))
+    s = Util2d.array2string(a.shape, a, fortran_format='(2E10.2)')
+    assert s == ('  1.00E+00  2.00E+00\n  3.00E+00\n'
+                 '  4.00E+00  5.00E+00\n  6.00E+00\n')
+    s = Util2d.array2string(a.shape, a, fortran_format='(3E10.2)')
+    assert s == '  1.00E+00  2.00E+00  3.00E+00\n' \
+                '  4.00E+00  5.00E+00  6.00E+00\n'
+    # with one value per line, the first two values of a row share a line
+    i = a.astype(np.int32)
+    s = Util2d.array2string(i.shape, i, fortran_format='(1I3)')
+    assert s == '  1  2\n  3\n  4  5\n  6\n'
+    s = Util2d.array2string((3,), i[0], python_format=[2, '{0:>4}'])
+    assert s == '   1   2\n   3\n'
+
+    # write_txt writes the same string
+    fname = os.path.join(out_dir, 'array2string.txt')
+    b = np.random.random((25, 37)).astype(np.float32)
+    Util2d.write_txt(b.shape, fname, b, fortran_format='(10E15.6)')
+    with open(fname) as f:
+        s = f.read()
+    assert s == Util2d.array2string(b.shape, b, fortran_format='(10E15.6)')
+    assert s.splitlines()[0] == ''.join('{0:15.6E}'.format(v) for v in b[0, :10])
+    assert len(s.splitlines()) == 25 * 4
+    np.testing.assert_allclose(Util2d.load_txt(b.shape, fname, np.float32,
+                                               '(10E15.6)'), b, rtol=1e-5)
+
+
+def test_transient_shared_arrays():
+    ml = flopy.modflow.Modflow('shared', model_ws=out_dir)
+    dis = flopy.modflow.ModflowDis(ml, nlay=2, nrow=3, ncol=4, nper=5)
+    a = np.arange(12, dtype=np.float32).reshape((3, 4))
+    rch = flopy.modflow.ModflowRch(ml, rech={0: a, 1: a.copy(), 2: 2. * a,
+                                             3: a.copy()})
+    t2d = rch.rech
+
+    # equal stress periods share one array
+    assert t2d[1]._shares_value(t2d[0])
+    assert t2d[3]._shares_value(t2d[0])
+    assert not t2d[2]._shares_value(t2d[0])
+
+    # setting items of one stress period does not change the others
+    t2d[1][0, 0] = 100.
+    assert t2d[1].array[0, 0] == 100.
+    assert t2d[0].array[0, 0] == 0.
+    assert t2d[3].array[0, 0] == 0.
+    t2d[1] = a.copy()
+    assert t2d[1]._shares_value(t2d[0])
+
+    # repeated stress periods are reused with itmp = -1
+    assert t2d.get_kper_entry(1) == (-1, '')
+    assert t2d.get_kper_entry(2)[0] == 1
+    assert t2d.get_kper_entry(3)[0] == 1
+    ml.write_input()
+    ml2 = flopy.modflow.Modflow.load('shared.nam', model_ws=out_dir)
+    np.testing.assert_equal(ml2.rch.rech.array, t2d.array)
+
+    # repeated arrays share one external file
+    ext_path = os.path.join(out_dir, 'shared_ref')
+    if not os.path.exists(ext_path):
+        os.mkdir(ext_path)
+    ml = flopy.modflow.Modflow('shared_ext', model_ws=out_dir,
+                               external_path='shared_ref')
+    dis = flopy.modflow.ModflowDis(ml, nlay=2, nrow=3, ncol=4, nper=5)
+    rch = flopy.modflow.ModflowRch(ml, rech={0: a, 2: 2. * a, 3: a.copy()})
+    entry = rch.rech.get_kper_entry(0)[1]
+    rch.rech.get_kper_entry(2)
+    assert rch.rech.get_kper_entry(3) == (1, entry.replace('rech_1', 'rech_4'))
+    assert not os.path.exists(os.path.join(ext_path, 'rech_3.ref'))
+
+    t3d = Transient3d(ml, (2, 3, 4), np.float32, {0: a, 1: 2. * a, 2: a},
+                      'test')
+    assert t3d[2][0]._shares_value(t3d[0][1])
+    assert t3d[1][0]._shares_value(t3d[1][1])
+    t3d[3] = [a.copy(), a.copy()]
+    assert t3d.get_kper_entry(3) == (-1, '')
+
+
+def test_transient_shared_arrays_inplace():
+    # in-place changes through _array do not change the shared array
+    ml = flopy.modflow.Modflow('shared_inplace', model_ws=out_dir)
+    dis = flopy.modflow.ModflowDis(ml, nlay=1, nrow=3, ncol=4, nper=3)
+    rch = flopy.modflow.ModflowRch(ml, rech={0: np.ones((3, 4)),
+                                             1: np.ones((3, 4)),
+                                             2: np.ones((3, 4))})
+    assert rch.rech[1]._shares_value(rch.rech[0])
+    rch.rech[1]._array[0, 0] = 5.
+    assert [rch.rech[k].array[0, 0] for k in range(3)] == [1., 5., 1.]
+    assert not rch.rech[1]._shares_value(rch.rech[0])
+    assert rch.rech[2]._shares_value(rch.rech[0])
+    ml.write_input()
+    ml2 = flopy.modflow.Modflow.load('shared_inplace.nam', model_ws=out_dir)
+    assert [ml2.rch.rech[k].array[0, 0] for k in range(3)] == [1., 5., 1.]
+    np.testing.assert_equal(ml2.rch.rech.array, rch.rech.array)
+
+
+def test_util2d_lazy_load():
+    from flopy.utils.util_array import _DeferredArray
+    ws = os.path.join(out_dir, 'lazy')
+    os.mkdir(ws)
+    ml = flopy.modflow.Modflow(model_ws=ws)
+    ml.lazy_arrays = True
+    a = np.arange(60, dtype=np.float32).reshape((6, 10)) / 3.
+    b = np.arange(60, dtype=np.int32).reshape((6, 10))
+    Util2d.write_txt(a.shape, os.path.join(ws, 'a.dat'), a)
+    fname = os.path.join(ws, 'arrays.dat')
+    with open(fname, 'w') as f:
+        f.write('INTERNAL 2.0 (10E15.6) -1\n')
+        Util2d.write_txt(a.shape, f, a, '(10E15.6)')
+        f.write('INTERNAL 1 (FREE) -1\n')
+        Util2d.write_txt(b.shape, f, b)
+        f.write("OPEN/CLOSE 'a.dat' 1.0 (FREE) -1\n")
+        f.write('CONSTANT 7\n')
+
+    # arrays are located, but only read on first access
+    with open(fname, 'r') as f:
+        u2ds = [Util2d.load(f, ml, a.shape, np.float32, 'a'),
+                Util2d.load(f, ml, b.shape, np.int32, 'b'),
+                Util2d.load(f, ml, a.shape, np.float32, 'c'),
+                Util2d.load(f, ml, b.shape, np.int32, 'd')]
+    for u2d in u2ds[:3]:
+        assert isinstance(u2d._lazy_array, _DeferredArray)
+    np.testing.assert_allclose(u2ds[0].array, 2. * a, rtol=1e-6)
+    np.testing.assert_equal(u2ds[1].array, b)
+    np.testing.assert_allclose(u2ds[2].array, a, rtol=1e-6)
+    np.testing.assert_equal(u2ds[3].array, 7)
+    assert u2ds[1].array.dtype == np.int32
+    assert not isinstance(u2ds[0]._lazy_array, _DeferredArray)
+
+    # a file that has changed since it was loaded is not read
+    with open(fname, 'r') as f:
+        u2d = Util2d.load(f, ml, a.shape, np.float32, 'a')
+    with open(fname, 'a') as f:
+        f.write('\n')
+    try:
+        u2d.array
+        raise AssertionError('IOError not raised')
+    except IOError:
+        pass
+
+    # lazy and eager loads of a model, written back to the same workspace
+    model_ws = os.path.join(ws, 'freyberg')
+    shutil.copytree(os.path.join('..', 'examples', 'data', 'freyberg'),
+                    model_ws)
+    shutil.copy(os.path.join(model_ws, 'freyberg.nam'),
+                os.path.join(model_ws, 'original.nam'))
+    m1 = flopy.modflow.Modflow.load('freyberg.nam', model_ws=model_ws,
+                                    check=False)
+    m2 = flopy.modflow.Modflow.load('freyberg.nam', model_ws=model_ws,
+                                    check=False, lazy_arrays=True)
+    m2.write_input()
+    m3 = flopy.modflow.Modflow.load('original.nam', model_ws=model_ws,
+                                    check=False)
+    for pak in m1.packagelist:
+        for key, value in pak.__dict__.items():
+            if isinstance(value, (Util2d, Util3d)):
+                for m in (m2, m3):
+                    other = m.get_package(pak.name[0]).__dict__[key]
+                    np.testing.assert_allclose(other.array, value.array,
+                                               rtol=1e-6)
+
+
 if __name__ == '__main__':
+    # test_mflist_load_block()
+    # test_mflist_write_transient()
+    # test_mflist_columnar()
+    # test_mflist_to_array()
+    # test_array2string()
+    # test_transient_shared_arrays()
+    # test_transient_shared_arrays_inplace()
+    # test_array_cache()
+    # test_util2d_lazy_load()
+    # test_load_txt_position()
     # test_util3d_reset()
     # test_mflist()
     # test_new_get_file_entry()
@@ -103,9 +103,50 @@ def test_properties_check():
     assert 'vertical hydraulic conductivity values above checker threshold of 100000.0' in ind3_errors
 
 
+def test_check_all_periods():
+    mf = flopy.modflow.Modflow(version='mf2005', model_ws=mpth)
+    dis = flopy.modflow.ModflowDis(mf, nlay=2, nrow=3, ncol=3, nper=4,
+                                   top=100, botm=[90., 80.])
+    ibound = np.ones((2, 3, 3), dtype=int)
+    ibound[0, 0, 0] = 0
+    bas = flopy.modflow.ModflowBas(mf, ibound=ibound)
+    # stage below the bottom in period 0, inactive cells in periods 0 and 2
+    ghb = flopy.modflow.ModflowGhb(mf, stress_period_data={
+        0: [[0, 0, 0, 95., 1.], [1, 1, 1, 70., 1.]],
+        1: [[0, 1, 1, 95., 1.]],
+        2: [[0, 0, 0, 95., 1.], [0, 2, 2, 95., 1.]],
+        3: -1})
+    pcg = flopy.modflow.ModflowPcg(mf)
+    for n_workers in (None, 2):
+        chk = mf.check(verbose=False, n_workers=n_workers)
+        assert [s.strip() for s in chk.summary_array.desc] == \
+               ['GHB package: BC in inactive cell',
+                'GHB package: BC elevation below cell bottom',
+                'GHB package: BC in inactive cell']
+        assert chk.summary_array.k.tolist() == [0, 1, 0]
+        assert chk.summary_array.value.tolist() == [0., 70., 0.]
+        # failed in any stress period
+        assert 'GHB package: BC in inactive cells' not in chk.passed
+        assert 'GHB package: BC indices valid' in chk.passed
+
+    # isolated cells
+    a = np.ones((3, 4, 5))
+    a[1, 2, 3] = 0
+    a[0] = 0
+    neighbors = flopy.utils.get_neighbors(a)
+    neighbors[np.isnan(neighbors)] = 0
+    isolated = flopy.utils.all_neighbors(a, lambda v: v < 1)
+    assert np.array_equal(isolated, np.all(neighbors < 1, axis=0))
+    # neighbors outside of the grid are nan
+    assert np.array_equal(flopy.utils.all_neighbors(a, lambda v: v > 0,
+                                                    edge=False),
+                          np.all(flopy.utils.get_neighbors(a) > 0, axis=0))
+
+
 if __name__ == '__main__':
     print('numpy version: {}'.format(np.__version__))
     for mfnam in testmodels:
         checker_on_load(mfnam)
     test_bcs_check()
     test_properties_check()
+    test_check_all_periods()
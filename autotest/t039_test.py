@@ -3,14 +3,19 @@ Test zonbud utility
 """
 import os
 import numpy as np
-from flopy.utils import CellBudgetFile, ZoneBudget, \
-    MfListBudget, read_zbarray, write_zbarray
+import flopy
+from flopy.utils import CellBudgetFile, ZoneBudget, ZoneBudgetPlan, \
+    ZoneBudgetUnstructured, MfListBudget, read_zbarray, write_zbarray
+from flopy.utils.zonbud import sum_flux_bincount, sum_flux_tuples
 
 loadpth = os.path.join('..', 'examples', 'data', 'zonbud_examples')
 outpth = os.path.join('temp', 't039')
 cbc_f = os.path.join(loadpth, 'freyberg.gitcbc')
 zon_f = os.path.join(loadpth, 'zonef_mlt.zbr')
 zbud_f = os.path.join(loadpth, 'freyberg_mlt.csv')
+usgpth = os.path.join('..', 'examples', 'data', 'mfusg_test',
+                      '01A_nestedgrid_nognc')
+grb_f = os.path.join('..', 'examples', 'data', 'mfgrd_test', 'flow.disu.grb')
 
 if not os.path.isdir(outpth):
     os.makedirs(outpth)
@@ -232,10 +237,190 @@ def test_get_model_shape():
     return
 
 
+def test_zonbud_multiple_times():
+    """
+    t039 Test that budgets computed for several times in a single pass
+    match budgets computed for each time separately
+    """
+    zon = read_zbarray(zon_f)
+    cbc = CellBudgetFile(cbc_f)
+    kstpkper = cbc.get_kstpkper()[-3:]
+    bud = ZoneBudget(cbc, zon, kstpkper=kstpkper).get_budget()
+    for kstp, kper in kstpkper:
+        bud1 = ZoneBudget(cbc, zon, kstpkper=(kstp, kper)).get_budget()
+        idx = (bud['time_step'] == kstp) & (bud['stress_period'] == kper)
+        assert np.array_equal(bud[idx]['name'], bud1['name'])
+        for name in bud.dtype.names[4:]:
+            assert np.allclose(bud[idx][name], bud1[name]), \
+                'Budgets do not match for {} at {}'.format(name,
+                                                            (kstp, kper))
+    return
+
+
+def test_zonbud_no_constant_head():
+    # a budget file without a CONSTANT HEAD record
+    nlay, nrow, ncol = 1, 2, 3
+    if not os.path.isdir(outpth):
+        os.makedirs(outpth)
+    fname = os.path.join(outpth, 'no_constant_head.cbc')
+    h1dt = np.dtype([('kstp', 'i4'), ('kper', 'i4'), ('text', 'a16'),
+                     ('ncol', 'i4'), ('nrow', 'i4'), ('nlay', 'i4')])
+    h2dt = np.dtype([('imeth', 'i4'), ('delt', 'f4'), ('pertim', 'f4'),
+                     ('totim', 'f4')])
+    frf = np.ones((nlay, nrow, ncol), dtype=np.float32)
+    storage = np.arange(-3, 3, dtype=np.float32).reshape(nlay, nrow, ncol)
+    with open(fname, 'wb') as f:
+        np.array([(1, 1, 'FLOW RIGHT FACE'.rjust(16), ncol, nrow, nlay)],
+                 dtype=h1dt).tofile(f)
+        frf.tofile(f)
+        np.array([(1, 1, 'STORAGE'.rjust(16), ncol, nrow, -nlay)],
+                 dtype=h1dt).tofile(f)
+        np.array([(1, 1., 1., 1.)], dtype=h2dt).tofile(f)
+        storage.tofile(f)
+    zon = np.array([[[1, 1, 2], [1, 2, 2]]])
+    bud = ZoneBudget(fname, zon).get_budget()
+    names = list(bud['name'])
+    assert 'FROM_CONSTANT_HEAD' not in names
+    # negative storage flows are out of the cells
+    assert np.allclose(bud[names.index('FROM_STORAGE')][['ZONE_1', 'ZONE_2']]
+                       .tolist(), [0., 3.])
+    assert np.allclose(bud[names.index('TO_STORAGE')][['ZONE_1', 'ZONE_2']]
+                       .tolist(), [5., 1.])
+    # flow from zone 1 to zone 2 across the right faces of (0, 0, 1) and
+    # (0, 1, 0)
+    assert np.allclose(bud[names.index('TO_ZONE_2')]['ZONE_1'], 2.)
+    return
+
+
+def test_zonbud_zone0_constant_head():
+    # flow from zone 0 into zone 1, and a constant-head cell in zone 2 on
+    # the boundary with zone 1, in a row of four cells
+    nlay, nrow, ncol = 1, 1, 4
+    if not os.path.isdir(outpth):
+        os.makedirs(outpth)
+    fname = os.path.join(outpth, 'zone0_constant_head.cbc')
+    h1dt = np.dtype([('kstp', 'i4'), ('kper', 'i4'), ('text', 'a16'),
+                     ('ncol', 'i4'), ('nrow', 'i4'), ('nlay', 'i4')])
+    chd = np.array([[[0., 0., 0., -2.]]], dtype=np.float32)
+    frf = np.array([[[1., 2., 2., 0.]]], dtype=np.float32)
+    with open(fname, 'wb') as f:
+        for text, data in [('CONSTANT HEAD', chd), ('FLOW RIGHT FACE', frf)]:
+            np.array([(1, 1, text.rjust(16), ncol, nrow, nlay)],
+                     dtype=h1dt).tofile(f)
+            data.tofile(f)
+    zon = np.array([[[0, 1, 1, 2]]])
+    bud = ZoneBudget(fname, zon).get_budget()
+    names = list(bud['name'])
+
+    def values(name):
+        return bud[names.index(name)][['ZONE_1', 'ZONE_2']].tolist()
+
+    # as in ZONBUD, flow from zone 0 is an inflow of zone 1, and the flow
+    # into the constant-head cell is an outflow of the zone of that cell
+    assert np.allclose(values('FROM_ZONE_0'), [1., 0.])
+    assert np.allclose(values('TO_ZONE_0'), [0., 0.])
+    assert np.allclose(values('FROM_ZONE_1'), [0., 2.])
+    assert np.allclose(values('TO_ZONE_2'), [2., 0.])
+    assert np.allclose(values('FROM_CONSTANT_HEAD'), [0., 0.])
+    assert np.allclose(values('TO_CONSTANT_HEAD'), [0., 2.])
+    return
+
+
+def test_sum_flux_bincount():
+    """
+    t039 Test zone-pair flux aggregation
+    """
+    nzones = 5
+    fz = np.random.randint(0, nzones, size=1000)
+    tz = np.random.randint(0, nzones, size=1000)
+    q = np.random.random(1000)
+    flux = sum_flux_bincount(fz, tz, q, nzones)
+    assert flux.shape == (nzones, nzones)
+    assert np.isclose(flux.sum(), q.sum())
+    fzi, tzi, fi = sum_flux_tuples(fz, tz, q)
+    assert np.allclose(flux[fzi, tzi], fi)
+    return
+
+
+def test_zonbud_plan():
+    """
+    t039 Test evaluating several zone arrays with a zonbud plan
+    """
+    zon = read_zbarray(zon_f)
+    zon2 = np.ones(zon.shape, dtype=zon.dtype)
+    zon2[:, :, zon.shape[2] // 2:] = 2
+    kstpkper = CellBudgetFile(cbc_f).get_kstpkper()[:2]
+    plan = ZoneBudgetPlan(cbc_f, kstpkper=kstpkper)
+    zbs = plan.evaluate([zon, zon2], n_workers=2)
+    assert len(zbs) == 2, 'Budgets not returned for every zone array.'
+    for z, zb in zip([zon, zon2], zbs):
+        bud = zb.get_budget()
+        bud1 = ZoneBudget(cbc_f, z, kstpkper=kstpkper).get_budget()
+        assert np.array_equal(bud['name'], bud1['name'])
+        for name in bud.dtype.names[4:]:
+            assert np.allclose(bud[name], bud1[name]), \
+                'Budgets do not match for {}'.format(name)
+    return
+
+
+def test_zonbud_n_workers():
+    """
+    t039 Test computing the budgets with several processes
+    """
+    zon = read_zbarray(zon_f)
+    kstpkper = CellBudgetFile(cbc_f).get_kstpkper()[:4]
+    zb = ZoneBudget(cbc_f, zon, kstpkper=kstpkper, n_workers=2)
+    bud = zb.get_budget()
+    bud1 = ZoneBudget(cbc_f, zon, kstpkper=kstpkper).get_budget()
+    assert np.array_equal(bud['name'], bud1['name'])
+    assert np.array_equal(bud['totim'], bud1['totim'])
+    for name in bud.dtype.names[4:]:
+        assert np.allclose(bud[name], bud1[name]), \
+            'Budgets do not match for {}'.format(name)
+    return
+
+
+def test_zonbud_unstructured():
+    """
+    t039 Test zonbud for an unstructured grid
+    """
+    m = flopy.modflow.Modflow.load('flow.nam', model_ws=usgpth,
+                                   version='mfusg', load_only=['disu'],
+                                   check=False)
+    cbc = CellBudgetFile(os.path.join(usgpth, 'output', 'flow.cbc'))
+    zon = np.ones(m.disu.nodes, dtype=np.int32)
+    zon[:40] = 2
+    zon[60:80] = 3
+    zb = ZoneBudgetUnstructured(cbc, zon, m.disu)
+    assert zb.get_model_shape() == (1, 1, m.disu.nodes)
+    bud = zb.get_budget()
+    for name in ['ZONE_1', 'ZONE_2', 'ZONE_3']:
+        inout = bud[bud['name'] == 'IN-OUT'][name]
+        total = bud[bud['name'] == 'TOTAL_IN'][name]
+        assert np.allclose(inout, 0., atol=1e-5 * total), \
+            'Budget for {} does not balance'.format(name)
+    for z1, z2 in [(1, 2), (1, 3), (2, 3)]:
+        q12 = bud[bud['name'] == 'FROM_ZONE_{}'.format(z1)]
+        q21 = bud[bud['name'] == 'TO_ZONE_{}'.format(z2)]
+        assert np.allclose(q12['ZONE_{}'.format(z2)],
+                           q21['ZONE_{}'.format(z1)]), \
+            'Flow between zones {} and {} does not match'.format(z1, z2)
+
+    # The connectivity from the binary grid file matches the DISU package
+    zb1 = ZoneBudgetUnstructured(cbc, zon, grb_f)
+    bud1 = zb1.get_budget()
+    for name in bud.dtype.names[4:]:
+        assert np.allclose(bud[name], bud1[name]), \
+            'Budgets do not match for {}'.format(name)
+    return
+
+
 if __name__ == '__main__':
     # test_comare2mflist_mlt()
     test_compare2zonebudget()
     test_zonbud_aliases()
+    test_zonbud_no_constant_head()
+    test_zonbud_zone0_constant_head()
     test_zonbud_to_csv()
     test_zonbud_math()
     test_zonbud_copy()
@@ -244,3 +429,8 @@ if __name__ == '__main__':
     test_dataframes()
     test_get_budget()
     test_get_model_shape()
+    test_zonbud_multiple_times()
+    test_sum_flux_bincount()
+    test_zonbud_plan()
+    test_zonbud_n_workers()
+    test_zonbud_unstructured()
@@ -0,0 +1,202 @@
+"""
+Test run_models() with a stub executable
+"""
+import io
+import os
+import sys
+import time
+import shutil
+
+if sys.version_info < (3, 5):
+    from unittest import SkipTest
+    raise SkipTest('run_models needs python 3.5 or later')
+
+import asyncio
+import flopy
+
+cpth = os.path.join('temp', 't062')
+# delete the directory if it exists
+if os.path.isdir(cpth):
+    shutil.rmtree(cpth)
+# make the directory
+os.makedirs(cpth)
+
+# the stub executable runs the commands of its name file
+stub = """#!{}
+import sys, time
+for line in open(sys.argv[1]):
+    cmd, arg = line.split(None, 1)
+    if cmd == 'sleep':
+        time.sleep(float(arg))
+    elif cmd == 'print':
+        print(arg.strip())
+        sys.stdout.flush()
+    elif cmd == 'exit':
+        sys.exit(int(arg))
+""".format(sys.executable)
+exe_name = os.path.abspath(os.path.join(cpth, 'stubmodel'))
+with open(exe_name, 'w') as f:
+    f.write(stub)
+os.chmod(exe_name, 0o755)
+
+
+def make_job(name, commands):
+    model_ws = os.path.join(cpth, name)
+    if not os.path.isdir(model_ws):
+        os.makedirs(model_ws)
+    with open(os.path.join(model_ws, name + '.nam'), 'w') as f:
+        f.write('\n'.join(commands) + '\n')
+    return exe_name, name + '.nam', model_ws
+
+
+def test_run_models():
+    jobs = [make_job('ok', ['print starting', 'sleep 0.1',
+                            'print Normal termination of simulation']),
+            make_job('fail', ['print starting', 'print failed to converge',
+                              'exit 3']),
+            make_job('slow', ['print starting', 'sleep 30',
+                              'print normal termination']),
+            ('nonexistent_exe', 'ok.nam', os.path.join(cpth, 'ok')),
+            {'exe_name': exe_name, 'namefile': 'ok.nam',
+             'model_ws': os.path.join(cpth, 'ok'), 'name': 'ok2'}]
+    t = time.time()
+    results = flopy.run_models(jobs, n_workers=2, timeout=2.,
+                               stdout_dir=os.path.join(cpth, 'stdout'))
+    assert time.time() - t < 20.
+    assert [r.name for r in results] == ['ok', 'fail', 'slow', 'ok', 'ok2']
+    ok, fail, slow, missing, ok2 = results
+
+    assert ok.success and ok.returncode == 0 and not ok.timed_out
+    with open(ok.stdout_file) as f:
+        assert f.read().split('\n')[:2] == \
+               ['starting', 'Normal termination of simulation']
+    assert ok2.success
+    assert ok.stdout_file != missing.stdout_file
+
+    assert not fail.success and fail.returncode == 3
+    with open(fail.stdout_file) as f:
+        assert 'failed to converge' in f.read()
+
+    assert slow.timed_out and not slow.success
+    assert 1.5 < slow.elapsed < 20.
+    with open(slow.stdout_file) as f:
+        assert f.read().strip() == 'starting'
+
+    assert not missing.success and missing.error is not None
+
+    # a list of normal termination messages
+    results = flopy.run_models([jobs[1]], normal_msg=['failed', 'normal'])
+    assert results[0].success
+    assert os.path.isfile(os.path.join(cpth, 'fail', 'fail.stdout'))
+
+    # models
+    ml = flopy.modflow.Modflow('model', exe_name=exe_name,
+                               model_ws=os.path.join(cpth, 'model'))
+    dis = flopy.modflow.ModflowDis(ml)
+    ml.write_input()
+    results = flopy.run_models([ml])
+    assert results[0].name == 'model' and results[0].returncode == 0
+    assert not results[0].success
+    assert os.path.isfile(os.path.join(cpth, 'model', 'model.stdout'))
+
+
+def test_run_models_concurrent():
+    jobs = [make_job('job{}'.format(i), ['sleep 0.5', 'print normal '
+                                                      'termination'])
+            for i in range(4)]
+    t = time.time()
+    results = flopy.run_models(jobs, n_workers=4)
+    # the runs overlap
+    assert time.time() - t < 1.9
+    assert all(r.success for r in results)
+
+
+def test_run_models_async():
+    jobs = [make_job('async{}'.format(i), ['print normal termination'])
+            for i in range(3)]
+
+    blocking = []
+
+    def run_blocking():
+        # the blocking function works while the event loop is running
+        blocking.extend(flopy.run_models(jobs[:1]))
+
+    loop = asyncio.new_event_loop()
+    try:
+        task = loop.create_task(flopy.run_models_async(jobs, n_workers=2))
+        loop.call_soon(run_blocking)
+        results = loop.run_until_complete(task)
+    finally:
+        loop.close()
+    assert len(results) == 3 and len(blocking) == 1
+    assert all(r.success for r in results + blocking)
+
+
+def test_run_model_callbacks():
+    exe, namefile, model_ws = make_job('stream', ['print Solving stress '
+                                                  'period 1',
+                                                  'sleep 1.0',
+                                                  'print Solving stress '
+                                                  'period 2',
+                                                  'print Normal termination'])
+    lines = []
+    for use_async in (False, True):
+        del lines[:]
+        t = time.process_time()
+        success, buff = flopy.run_model(exe, namefile, model_ws=model_ws,
+                                        silent=True, report=True,
+                                        use_async=use_async,
+                                        callback=lambda line, elapsed:
+                                        lines.append((line, elapsed)))
+        # stdout is not polled while the model runs
+        assert time.process_time() - t < 0.5
+        assert success
+        assert [line for line, elapsed in lines] == \
+               ['Solving stress period 1', 'Solving stress period 2',
+                'Normal termination']
+        assert lines[1][1] - lines[0][1] > 0.5
+        assert len(buff) == 3
+        if use_async:
+            assert buff[1].startswith('(elapsed:')
+            assert buff[1].endswith('-->solving stress period 2')
+        else:
+            assert buff[1] == 'Solving stress period 2'
+
+
+def test_run_model_echo_interval():
+    exe, namefile, model_ws = make_job('echo', ['print line {}'.format(i)
+                                                for i in range(100)] +
+                                       ['print normal termination'])
+    stdout = sys.stdout
+    sys.stdout = f = io.StringIO()
+    try:
+        success, buff = flopy.run_model(exe, namefile, model_ws=model_ws,
+                                        echo_interval=60.)
+    finally:
+        sys.stdout = stdout
+    assert success
+    # the first and the last line
+    assert f.getvalue().split('\n')[-3:] == ['line 0', 'normal termination',
+                                             '']
+
+
+def test_run_model_async():
+    exe, namefile, model_ws = make_job('coroutine', ['print normal '
+                                                     'termination'])
+    loop = asyncio.new_event_loop()
+    try:
+        success, buff = loop.run_until_complete(
+            flopy.run_model_async(exe, namefile, model_ws=model_ws,
+                                  silent=True, report=True))
+    finally:
+        loop.close()
+    assert success and buff == ['normal termination']
+
+
+if __name__ == '__main__':
+    test_run_models()
+    test_run_models_concurrent()
+    test_run_models_async()
+    test_run_model_callbacks()
+    test_run_model_echo_interval()
+    test_run_model_async()
@@ -0,0 +1,92 @@
+"""
+Test the profiling of loads, writes and output queries
+"""
+import os
+import sys
+import json
+import shutil
+import flopy
+
+cpth = os.path.join('temp', 't063')
+# delete the directory if it exists
+if os.path.isdir(cpth):
+    shutil.rmtree(cpth)
+# make the directory
+os.makedirs(cpth)
+
+pth = os.path.join('..', 'examples', 'data', 'freyberg')
+hds_file = os.path.join('..', 'examples', 'data', 'preserve_unitnums',
+                        'testsfr2.hds')
+
+
+def test_profiling():
+    with flopy.profiling() as profiler:
+        assert flopy.utils.get_profiler() is profiler
+        ml = flopy.modflow.Modflow.load('freyberg.nam', model_ws=pth,
+                                        check=False)
+        ml.change_model_ws(cpth)
+        ml.write_input()
+        hds = flopy.utils.HeadFile(hds_file)
+        hds.get_data()
+        hds.get_ts((0, 0, 0))
+    assert flopy.utils.get_profiler() is None
+
+    summary = profiler.get_summary()
+    assert sorted(summary) == ['load', 'output', 'util2d', 'write']
+    packages = [p.name[0] for p in ml.packagelist]
+    assert sorted(summary['load']) == sorted(packages)
+    assert sorted(summary['write']) == sorted(packages)
+    lpf = summary['load']['LPF']
+    assert lpf['count'] == 1 and lpf['elapsed'] > 0.
+    assert lpf['nbytes'] == os.path.getsize(os.path.join(pth,
+                                                         'freyberg.lpf'))
+    assert summary['write']['LPF']['nbytes'] == \
+           os.path.getsize(os.path.join(cpth, 'freyberg.lpf'))
+    assert summary['util2d']['top']['nbytes'] == \
+           ml.dis.nrow * ml.dis.ncol * 4
+    assert summary['output']['HeadFile.get_data']['nbytes'] == \
+           hds.get_data().nbytes
+    assert 'HeadFile.get_ts' in summary['output']
+
+    # arrays are parsed in package loads
+    events = profiler.get_events()
+    load = [e for e in events if e['category'] == 'load'][0]
+    arrays = [e for e in events if e['category'] == 'util2d']
+    assert min(e['depth'] for e in arrays) == 1
+    assert all(e['start'] >= events[0]['start'] for e in events)
+    if sys.version_info >= (3, 9):
+        assert load['peak_bytes'] > 0
+
+    # Chrome trace
+    fname = os.path.join(cpth, 'trace.json')
+    profiler.write_chrome_trace(fname)
+    with open(fname) as f:
+        trace = json.load(f)
+    assert len(trace['traceEvents']) == len(events)
+    assert all(e['ph'] == 'X' for e in trace['traceEvents'])
+
+    try:
+        import pandas
+        df = profiler.get_dataframe(summary=True)
+        assert len(df) == sum(len(names) for names in summary.values())
+        assert len(profiler.get_dataframe()) == len(events)
+    except ImportError:
+        pass
+
+
+def test_set_profiling():
+    profiler = flopy.set_profiling(True, memory=False)
+    hds = flopy.utils.HeadFile(hds_file)
+    hds.get_data()
+    assert flopy.set_profiling(False) is profiler
+    # nothing is recorded when profiling is off
+    hds.get_data()
+    events = profiler.get_events('output')
+    assert len(events) == 1
+    assert events[0]['peak_bytes'] is None
+    assert flopy.set_profiling(False) is None
+
+
+if __name__ == '__main__':
+    test_profiling()
+    test_set_profiling()
@@ -0,0 +1,107 @@
+"""
+Test the benchmark suite and its synthetic models and output files
+"""
+import os
+import copy
+import shutil
+import numpy as np
+import flopy
+from benchmark import synthetic, get_benchmark_names, run_benchmarks, \
+    write_results, read_results, compare_results
+
+cpth = os.path.join('temp', 't064')
+# delete the directory if it exists
+if os.path.isdir(cpth):
+    shutil.rmtree(cpth)
+# make the directory
+os.makedirs(cpth)
+
+
+def test_synthetic_outputs():
+    nlay, nrow, ncol, nper = 2, 3, 4, 3
+    fname = os.path.join(cpth, 'test.hds')
+    heads = synthetic.write_head_file(fname, nlay, nrow, ncol, nper, nstp=2)
+    hds = flopy.utils.HeadFile(fname)
+    assert len(hds.get_kstpkper()) == nper * 2
+    assert np.array_equal(hds.get_alldata(), heads)
+    assert np.array_equal(hds.get_ts((1, 2, 3))[:, 1], heads[:, 1, 2, 3])
+
+    fname = os.path.join(cpth, 'test.ucn')
+    conc = synthetic.write_ucn_file(fname, nlay, nrow, ncol, nper)
+    assert np.array_equal(flopy.utils.UcnFile(fname).get_alldata(), conc)
+
+    fname = os.path.join(cpth, 'test.cbc')
+    texts = synthetic.write_budget_file(fname, nlay, nrow, ncol, nper,
+                                        nlist=5)
+    cbc = flopy.utils.CellBudgetFile(fname)
+    assert [text.decode().strip() for text in
+            cbc.get_unique_record_names()] == texts
+    assert len(cbc.get_kstpkper()) == nper
+    assert cbc.get_data(text='WELLS')[0].shape == (5,)
+    assert cbc.get_data(text='STORAGE')[0].shape == (nlay, nrow, ncol)
+
+    fname = os.path.join(cpth, 'test.mppth')
+    synthetic.write_pathline_file(fname, 5, 4, nlay, nrow, ncol)
+    pathlines = flopy.utils.PathlineFile(fname).get_alldata()
+    assert len(pathlines) == 5
+    assert all(len(p) == 4 for p in pathlines)
+
+
+def test_synthetic_models():
+    ws = os.path.join(cpth, 'models')
+    ml = synthetic.make_structured_model(ws, nlay=2, nrow=5, ncol=6, nper=3,
+                                         nwel=4, nghb=7)
+    ml2 = flopy.modflow.Modflow.load('synthetic.nam', model_ws=ws,
+                                     check=False)
+    assert [p.name[0] for p in ml2.packagelist] == \
+           [p.name[0] for p in ml.packagelist]
+    assert ml2.nper == 3
+    assert ml2.ghb.stress_period_data[2].shape == (7,)
+    assert np.allclose(ml2.lpf.hk.array, ml.lpf.hk.array)
+
+    ws = os.path.join(cpth, 'mf6')
+    synthetic.make_unstructured_simulation(ws, nlay=2, nrow=5, ncol=6,
+                                           nper=3, nwel=4, nghb=7)
+    sim = flopy.mf6.MFSimulation.load(sim_ws=ws, verbosity_level=0)
+    gwf = sim.get_model('synthetic')
+    assert gwf.disv.ncpl.get_data() == 30
+    assert len(gwf.disv.vertices.get_data()) == 42
+    assert len(gwf.wel.stress_period_data.get_data(2)) == 4
+
+
+def test_run_benchmarks():
+    results = run_benchmarks(size='tiny', repeat=1,
+                             workspace=os.path.join(cpth, 'tiny'),
+                             verbose=False)
+    assert sorted(results['benchmarks']) == sorted(get_benchmark_names())
+    for name, result in results['benchmarks'].items():
+        assert result['status'] in ('ok', 'skipped'), \
+            '{}: {}'.format(name, result['error'])
+        if result['status'] == 'ok':
+            assert len(result['times']) == 1 and result['min'] > 0.
+    assert results['benchmarks']['Modflow.load']['status'] == 'ok'
+
+    fname = os.path.join(cpth, 'results.json')
+    write_results(results, fname)
+    assert read_results(fname) == results
+
+    # a slower run
+    new = copy.deepcopy(results)
+    new['benchmarks']['Modflow.load']['min'] *= 2.
+    comparison = compare_results(fname, new)
+    regressions = [row['name'] for row in comparison if row['regression']]
+    assert regressions == ['Modflow.load']
+
+    # selected benchmarks
+    results = run_benchmarks(size='tiny', repeat=1, select=['HeadFile'],
+                             memory=False, verbose=False, nper=2)
+    assert sorted(results['benchmarks']) == \
+           ['HeadFile', 'HeadFile.get_data', 'HeadFile.get_ts']
+    assert results['params']['nper'] == 2
+    assert results['benchmarks']['HeadFile']['peak_bytes'] is None
+
+
+if __name__ == '__main__':
+    test_synthetic_outputs()
+    test_synthetic_models()
+    test_run_benchmarks()
@@ -34,8 +34,41 @@ from . import seawat
 from . import modpath
 from . import modflowlgr
 from . import utils
-from . import plot
-from . import export
-from . import pest
-from . import mf6
 from .mbase import run_model, which
+from .utils.profiler import set_profiling, profiling
+import sys as _sys
+import types as _types
+if _sys.version_info >= (3, 5):
+    from .batchrun import run_models, run_models_async, run_model_async
+
+# plot, export, pest and mf6 (and matplotlib, pandas and scipy, which they
+# use) are imported on first access, flopy.plot etc. work as before
+_lazy_modules = ('plot', 'export', 'pest', 'mf6')
+
+
+class _FlopyModule(_types.ModuleType):
+    """
+    Module type of flopy, imports the modules in _lazy_modules when they
+    are first accessed.
+
+    """
+
+    def __getattr__(self, name):
+        if name in _lazy_modules:
+            import importlib
+            return importlib.import_module('.' + name, self.__name__)
+        raise AttributeError("module '{}' has no attribute '{}'"
+                             .format(self.__name__, name))
+
+    def __dir__(self):
+        return sorted(set(self.__dict__) | set(_lazy_modules))
+
+
+if _sys.version_info >= (3, 5):
+    # the class of a module can be set from python 3.5
+    _sys.modules[__name__].__class__ = _FlopyModule
+else:
+    from . import plot
+    from . import export
+    from . import pest
+    from . import mf6
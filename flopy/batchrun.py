@@ -0,0 +1,369 @@
+"""
+batchrun module.  Contains the run_models() and run_models_async()
+functions, which run a batch of models concurrently, the BatchRunResult
+class of their results, and run_model_async(), the asyncio version of
+run_model(). The module requires Python 3.5 or later (asyncio).
+
+"""
+import os
+import sys
+import time
+import asyncio
+import threading
+import subprocess as sp
+
+from .mbase import _get_normal_msg, _get_exe, _check_namefile, _get_argv, \
+    _RunOutput
+
+
+class BatchRunResult(object):
+    """
+    Result of a model run of run_models().
+
+    Attributes
+    ----------
+    name : str
+        Name of the run, the model name or the name file without extension.
+    exe_name : str
+        Executable of the run.
+    namefile : str
+        Name file of the run (can be None).
+    model_ws : str
+        Model workspace the executable was run in.
+    stdout_file : str
+        File with the standard output (and standard error) of the run.
+    success : bool
+        True if a line of the output contains a normal termination message
+        and the run did not time out.
+    returncode : int
+        Exit code of the executable, None if it was not started or it was
+        killed after timing out.
+    timed_out : bool
+        True if the run was killed after the timeout.
+    elapsed : float
+        Run time in seconds.
+    error : str
+        Error message if the run could not be started (missing executable or
+        name file), otherwise None.
+
+    """
+
+    def __init__(self, name, exe_name, namefile, model_ws, stdout_file):
+        self.name = name
+        self.exe_name = exe_name
+        self.namefile = namefile
+        self.model_ws = model_ws
+        self.stdout_file = stdout_file
+        self.success = False
+        self.returncode = None
+        self.timed_out = False
+        self.elapsed = 0.
+        self.error = None
+
+    def __repr__(self):
+        if self.error is not None:
+            status = 'error: {}'.format(self.error)
+        elif self.timed_out:
+            status = 'timed out'
+        else:
+            status = 'success' if self.success else 'failed'
+        return 'BatchRunResult({}: {}, {:.2f} s)'.format(self.name, status,
+                                                        self.elapsed)
+
+
+def _get_job(job):
+    # exe_name, namefile, model_ws, cargs and name of a job of run_models()
+    if hasattr(job, 'exe_name') and hasattr(job, 'namefile'):
+        return job.exe_name, job.namefile, job.model_ws, None, job.name
+    if isinstance(job, dict):
+        job = dict(job)
+        exe_name = job.pop('exe_name')
+        namefile = job.pop('namefile', None)
+        model_ws = job.pop('model_ws', './')
+        cargs = job.pop('cargs', None)
+        name = job.pop('name', None)
+        if job:
+            raise ValueError('unknown run_models() job keys: {}'
+                             .format(', '.join(sorted(job))))
+    else:
+        exe_name, namefile, model_ws = job[:3]
+        cargs = job[3] if len(job) > 3 else None
+        name = None
+    if name is None:
+        if namefile is not None:
+            name = os.path.splitext(os.path.basename(namefile))[0]
+        else:
+            name = os.path.splitext(os.path.basename(exe_name))[0]
+    return exe_name, namefile, model_ws, cargs, name
+
+
+async def _create_process(argv, cwd):
+    return await asyncio.create_subprocess_exec(
+        *argv, stdout=sp.PIPE, stderr=sp.STDOUT, cwd=cwd, limit=2 ** 20)
+
+
+async def _communicate(proc, add_line):
+    # pass the lines of stdout to add_line() as they are written, and wait
+    # for the process
+    while True:
+        line = await proc.stdout.readline()
+        if not line:
+            break
+        add_line(line)
+    return await proc.wait()
+
+
+async def _stream_process(argv, cwd, add_line):
+    # run a process, the lines of stdout are passed to add_line()
+    proc = await _create_process(argv, cwd)
+    try:
+        return await _communicate(proc, add_line)
+    finally:
+        # cancelled
+        if proc.returncode is None:
+            proc.kill()
+            await proc.wait()
+
+
+async def _wait_job(result, proc, f, normal_msg, timeout):
+    # the output is written to the file and checked for the normal
+    # termination message
+    output = _RunOutput(normal_msg, True, False)
+
+    def add_line(line):
+        f.write(line)
+        output.add_line(line)
+
+    try:
+        result.returncode = await asyncio.wait_for(
+            _communicate(proc, add_line), timeout)
+        result.success = output.success
+    except asyncio.TimeoutError:
+        result.timed_out = True
+    finally:
+        # timed out or cancelled
+        if proc.returncode is None:
+            proc.kill()
+            await proc.wait()
+
+
+async def _run_job(result, argv, normal_msg, timeout, semaphore, silent):
+    async with semaphore:
+        start = time.time()
+        with open(result.stdout_file, 'wb') as f:
+            try:
+                proc = await _create_process(argv, result.model_ws)
+            except OSError as e:
+                proc = None
+                result.error = str(e)
+            if proc is not None:
+                await _wait_job(result, proc, f, normal_msg, timeout)
+        result.elapsed = time.time() - start
+    if not silent:
+        print(result)
+    return result
+
+
+async def run_models_async(jobs, n_workers=None, timeout=None,
+                           stdout_dir=None, normal_msg='normal termination',
+                           silent=True):
+    """
+    Run a batch of models concurrently, asyncio version of run_models().
+
+    Parameters
+    ----------
+    see run_models()
+
+    Returns
+    -------
+    results : list of BatchRunResult
+        Results of the jobs, in the order of the jobs.
+
+    Examples
+    --------
+
+    >>> import asyncio
+    >>> import flopy
+    >>> results = asyncio.get_event_loop().run_until_complete(
+    ...     flopy.run_models_async([ml1, ml2], n_workers=2))
+
+    """
+    if n_workers is None:
+        n_workers = os.cpu_count() or 1
+    normal_msg = _get_normal_msg(normal_msg)
+    if stdout_dir is not None and not os.path.isdir(stdout_dir):
+        os.makedirs(stdout_dir)
+
+    semaphore = asyncio.Semaphore(max(int(n_workers), 1))
+    results = []
+    tasks = []
+    stdout_files = set()
+    for job in jobs:
+        exe_name, namefile, model_ws, cargs, name = _get_job(job)
+        if stdout_dir is None:
+            stdout_file = os.path.join(model_ws, name + '.stdout')
+        else:
+            stdout_file = os.path.join(stdout_dir, name + '.stdout')
+        if stdout_file in stdout_files:
+            # runs with the same name
+            stdout_file = os.path.splitext(stdout_file)[0] + \
+                          '_{}.stdout'.format(len(results))
+        stdout_files.add(stdout_file)
+        result = BatchRunResult(name, exe_name, namefile, model_ws,
+                                stdout_file)
+        results.append(result)
+        try:
+            _get_exe(exe_name)
+            _check_namefile(namefile, model_ws)
+        except Exception as e:
+            result.error = str(e)
+            if not silent:
+                print(result)
+            continue
+        argv = _get_argv(exe_name, namefile, cargs)
+        tasks.append(_run_job(result, argv, normal_msg, timeout, semaphore,
+                              silent))
+    if tasks:
+        await asyncio.gather(*tasks)
+    return results
+
+
+def run_models(jobs, n_workers=None, timeout=None, stdout_dir=None,
+               normal_msg='normal termination', silent=True):
+    """
+    Run a batch of models concurrently, at most n_workers at a time.
+
+    The standard output of each run is written to a file, and it is
+    checked for the normal termination message like run_model() does.
+
+    Parameters
+    ----------
+    jobs : list
+        Models (for example Modflow instances) or (exe_name, namefile,
+        model_ws) or (exe_name, namefile, model_ws, cargs) tuples, or dicts
+        with the keys exe_name, namefile, model_ws, cargs and name (the
+        name of the run). Only exe_name is required in a dict.
+    n_workers : int
+        Maximum number of concurrent runs. (default is the number of CPUs)
+    timeout : float
+        Runs that take longer than timeout seconds are killed. (default is
+        None, no timeout)
+    stdout_dir : str
+        Directory of the standard output files '<name>.stdout' of the runs.
+        (default is None, the files are written to the model workspaces)
+    normal_msg : str or list of str
+        Normal termination message(s) used to determine if a run
+        terminated normally. (default is 'normal termination')
+    silent : bool
+        Do not print the result of each run when it finishes. (default is
+        True)
+
+    Returns
+    -------
+    results : list of BatchRunResult
+        Results of the jobs, in the order of the jobs.
+
+    Notes
+    -----
+    Runs that can not be started (missing executable or name file) do not
+    stop the batch, their results have an error message.
+
+    This function can be called while an asyncio event loop is running
+    (for example in a notebook), the batch then runs in a separate thread.
+    Use run_models_async() in coroutines.
+
+    Examples
+    --------
+
+    >>> import flopy
+    >>> results = flopy.run_models([ml1, ml2, ml3], n_workers=2,
+    ...                            timeout=3600.)
+    >>> failed = [r.name for r in results if not r.success]
+
+    """
+    return _run_coroutine(run_models_async(
+        jobs, n_workers=n_workers, timeout=timeout, stdout_dir=stdout_dir,
+        normal_msg=normal_msg, silent=silent))
+
+
+async def run_model_async(exe_name, namefile, model_ws='./', silent=False,
+                          report=False, normal_msg='normal termination',
+                          cargs=None, callback=None, echo_interval=None):
+    """
+    Run a model, asyncio version of run_model(). The stdout lines are read
+    as they are written, without polling.
+
+    Parameters
+    ----------
+    see run_model()
+
+    Returns
+    -------
+    (success, buff)
+    success : boolean
+    buff : list of lines of stdout
+
+    Examples
+    --------
+
+    >>> import asyncio
+    >>> import flopy
+    >>> async def main():
+    ...     return await flopy.run_model_async('mf2005', 'model.nam',
+    ...                                        silent=True)
+    >>> success, buff = asyncio.get_event_loop().run_until_complete(main())
+
+    """
+    exe = _get_exe(exe_name)
+    if not silent:
+        s = 'FloPy is using the following ' + \
+            ' executable to run the model: {}'.format(exe)
+        print(s)
+    _check_namefile(namefile, model_ws)
+    argv = _get_argv(exe_name, namefile, cargs)
+    output = _RunOutput(normal_msg, silent, report, callback=callback,
+                        echo_interval=echo_interval)
+    await _stream_process(argv, model_ws, output.add_line)
+    output.close()
+    return output.success, output.buff
+
+
+def _run_coroutine(coro):
+    # run a coroutine to completion in a new event loop, in a separate
+    # thread if an event loop is running (they can not be nested)
+    get_running_loop = getattr(asyncio, 'get_running_loop',
+                               asyncio.get_event_loop)
+    try:
+        running = get_running_loop().is_running()
+    except RuntimeError:
+        running = False
+    if not running:
+        return _run_in_new_loop(coro)
+
+    results = []
+    errors = []
+
+    def target():
+        try:
+            results.append(_run_in_new_loop(coro))
+        except BaseException as e:
+            errors.append(e)
+
+    thread = threading.Thread(target=target)
+    thread.start()
+    thread.join()
+    if errors:
+        raise errors[0]
+    return results[0]
+
+
+def _run_in_new_loop(coro):
+    if sys.platform == 'win32' and sys.version_info < (3, 8):
+        # subprocesses need the proactor event loop
+        loop = asyncio.ProactorEventLoop()
+    else:
+        loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coro)
+    finally:
+        loop.close()
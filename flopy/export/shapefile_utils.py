@@ -100,7 +100,7 @@ def write_grid_shapefile(filename, sr, array_dict, nan_val=-1.0e9):
     names.sort()
     # for name,array in array_dict.items():
     for name in names:
-        array = array_dict[name]
+        array = array_dict[name].copy()
         if array.ndim == 3:
             assert array.shape[0] == 1
             array = array[0, :, :]
@@ -482,8 +482,7 @@ def mflist_helper(f, mfl, **kwargs):
             raise Exception("MfList.to_shapefile: SpatialReference not set")
         import flopy.utils.flopy_io as fio
         if kper is None:
-            keys = mfl.data.keys()
-            keys.sort()
+            keys = sorted(mfl.data.keys())
         else:
             keys = [kper]
         if not sparse:
@@ -618,7 +617,7 @@ def transient2d_helper(f, t2d, **kwargs):
             mask = ibnd == 0
 
         # f.log("getting 4D array for {0}".format(t2d.name_base))
-        array = t2d.array
+        array = t2d.array_copy()
         # f.log("getting 4D array for {0}".format(t2d.name_base))
         with np.errstate(invalid="ignore"):
             if array.dtype not in [int, np.int, np.int32, np.int64]:
@@ -719,7 +718,7 @@ def util3d_helper(f, u3d, **kwargs):
     elif isinstance(f, NetCdf) or isinstance(f, dict):
         var_name = u3d.name[0].replace(' ', '_').lower()
         # f.log("getting 3D array for {0}".format(var_name))
-        array = u3d.array
+        array = u3d.array_copy()
 
         # this is for the crappy vcont in bcf6
         # if isinstance(f,NetCdf) and array.shape != f.shape:
@@ -844,7 +843,7 @@ def util2d_helper(f, u2d, **kwargs):
 
         # try to mask the array - assume layer 1 ibound is a good mask
         # f.log("getting 2D array for {0}".format(u2d.name))
-        array = u2d.array
+        array = u2d.array_copy()
         # f.log("getting 2D array for {0}".format(u2d.name))
 
         with np.errstate(invalid="ignore"):
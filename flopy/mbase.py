@@ -10,16 +10,14 @@ import sys
 import os
 import subprocess as sp
 import shutil
+import time
+import pickle
+import hashlib
 import threading
-
-if sys.version_info > (3, 0):
-    import queue as Queue
-else:
-    import Queue
-from datetime import datetime
 import copy
 import numpy as np
 from flopy import utils
+from .utils import profiler
 from .version import __version__
 
 if sys.version_info >= (3, 3):
@@ -33,6 +31,145 @@ iprn = -1  # Printout flag. If >= 0 then array values read are printed in listin
 
 
 
+class _ArrayFileWriter(object):
+    """
+    Writes external array files in a multiprocessing.Pool while
+    BaseModel.write_input() writes the package files.
+
+    """
+
+    def __init__(self, n_workers):
+        import multiprocessing
+        self.pool = multiprocessing.Pool(n_workers)
+        self.results = {}
+
+    def submit(self, fname, func, args):
+        # files with the same name are written in the order submitted
+        if fname in self.results:
+            self.results.pop(fname).get()
+        self.results[fname] = self.pool.apply_async(func, args)
+
+    def close(self):
+        """
+        Wait until all files are written; errors of the workers are raised
+        here.
+
+        """
+        self.pool.close()
+        try:
+            for result in self.results.values():
+                result.get()
+        except:
+            self.pool.terminate()
+            raise
+        finally:
+            self.pool.join()
+            self.results = {}
+
+
+class _PackageLoadPool(object):
+    """
+    Loads package files in a thread pool for the load() method of a model.
+
+    The changes a package loader makes to the model (add_package(),
+    add_output_file(), ...) are recorded in the worker thread and applied
+    to the model in the order the loaders were submitted, so the model is
+    built as if the packages were loaded one at a time.
+
+    """
+
+    def __init__(self, model, n_workers):
+        self.model = model
+        self.n_workers = n_workers
+        self._calls = {}
+        self._index = {}
+        self._next = 0
+        self._done = set()
+        self._condition = threading.Condition()
+
+    def record(self, name, args, kwargs):
+        # record a call of a model method made by a loader, returns False
+        # if the method is not called from a worker
+        calls = self._calls.get(threading.current_thread().ident)
+        if calls is None:
+            return False
+        calls.append((name, args, kwargs))
+        return True
+
+    @staticmethod
+    def preload(func):
+        """
+        Call func now, in this thread, and return a function that returns
+        its result (or raises its error) for imap().
+
+        """
+        try:
+            result = func()
+        except Exception as e:
+            error = e
+
+            def load():
+                raise error
+        else:
+            def load():
+                return result
+        return load
+
+    def wait_for_earlier(self):
+        """
+        Wait until all loaders submitted before the loader of this thread
+        are done, e.g. before reading from an external unit that may be
+        shared with a package loaded earlier.
+
+        """
+        index = self._index.get(threading.current_thread().ident)
+        if index is None:
+            return
+        with self._condition:
+            while self._next < index:
+                self._condition.wait()
+
+    def _run(self, args):
+        index, func = args
+        ident = threading.current_thread().ident
+        calls = []
+        self._calls[ident] = calls
+        self._index[ident] = index
+        result, error = None, None
+        try:
+            result = func()
+        except Exception as e:
+            error = e
+        finally:
+            del self._calls[ident]
+            del self._index[ident]
+            with self._condition:
+                self._done.add(index)
+                while self._next in self._done:
+                    self._next += 1
+                self._condition.notify_all()
+        return result, error, calls
+
+    def imap(self, funcs):
+        """
+        Call funcs in the thread pool and yield (result, error) in the order
+        of funcs, after applying the recorded model changes of each call.
+        error is the exception raised by the call, or None.
+
+        """
+        from multiprocessing.pool import ThreadPool
+        pool = ThreadPool(self.n_workers)
+        try:
+            for result, error, calls in pool.imap(self._run,
+                                                  enumerate(funcs)):
+                for name, args, kwargs in calls:
+                    getattr(self.model, name)(*args, **kwargs)
+                yield result, error
+        finally:
+            pool.terminate()
+            pool.join()
+
+
 class FileDataEntry(object):
     def __init__(self, fname, unit, binflag=False, output=False, package=None):
         self.fname = fname
@@ -58,6 +195,50 @@ class FileData(object):
         return
 
 
+class _FingerprintPickler(pickle.Pickler):
+    """
+    Hashes the state of a package for BaseModel.write_input(
+    incremental=True). The model is not part of the state, and the data of
+    arrays is hashed instead of pickled.
+
+    """
+
+    def __init__(self, h):
+        pickle.Pickler.__init__(self, self, 2)
+        self.h = h
+        self.arrays = {}
+
+    def write(self, data):
+        self.h.update(data)
+
+    def persistent_id(self, obj):
+        if isinstance(obj, BaseModel):
+            return 'model'
+        if not isinstance(obj, np.ndarray) or obj.dtype.hasobject:
+            return None
+        # arrays shared by several objects are hashed once
+        key = self.arrays.get(id(obj))
+        if key is None:
+            a = np.ascontiguousarray(obj)
+            self.h.update(a.reshape(-1).view(np.uint8))
+            key = 'array', len(self.arrays), repr(a.dtype.descr), a.shape
+            self.arrays[id(obj)] = key, obj
+        else:
+            key = key[0]
+        return key
+
+
+def _fingerprint(obj):
+    # hash of the state of a package for incremental writes, None if it can
+    # not be pickled
+    h = hashlib.sha1()
+    try:
+        _FingerprintPickler(h).dump(obj)
+    except Exception:
+        return None
+    return h.hexdigest()
+
+
 class BaseModel(object):
     """
     MODFLOW based models base class
@@ -123,6 +304,16 @@ class BaseModel(object):
         self.array_free_format = True
         self.free_format_input = True
         self.parameter_load = False
+        self.lazy_arrays = False
+        self.columnar_lists = False
+        self._array_writer = None
+        self._load_pool = None
+        self._package_stubs = []
+        self._earlier_stubs = []
+        self._stub_outputs = {}
+        self._package_order = []
+        self._write_fingerprints = {}
+        self._write_records = None
         self.array_format = None
         self.external_fnames = []
         self.external_units = []
@@ -162,6 +353,104 @@ class BaseModel(object):
         from .export import utils
         return utils.model_helper(f, self, **kwargs)
 
+    def _defer(self, name, *args, **kwargs):
+        # record changes made by package loaders running in the threads of
+        # a _PackageLoadPool; they are applied in name file order
+        return self._load_pool is not None and \
+               self._load_pool.record(name, args, kwargs)
+
+    def _add_package_stub(self, name, load, forgive=False):
+        # register a package of a model loaded with lazy_packages=True;
+        # load() is called to load the package when it is first used
+        self._package_stubs.append((name.upper(), load, forgive))
+
+    def _load_package_stubs(self, name=None):
+        """
+        Load the packages registered with _add_package_stub().
+
+        Parameters
+        ----------
+        name : str
+            Name of the package to load. All packages are loaded if name is
+            None. (default is None)
+
+        """
+        # __getattr__ may call this before __init__ has set the stubs
+        stubs = self.__dict__.get('_package_stubs')
+        if not stubs:
+            return
+        if name is not None:
+            name = name.upper()
+        npackages = len(self.packagelist)
+        for stub in list(stubs):
+            if name is not None and stub[0] != name:
+                continue
+            # the stub may have been loaded by _load_earlier_packages()
+            if stub in stubs:
+                self._load_package_stub(stub)
+        if len(self.packagelist) != npackages and self._package_order:
+            # keep the packages, and the output files they add, in name
+            # file order, as if loaded together
+            order = {}
+            for i, pname in enumerate(self._package_order):
+                order.setdefault(pname.upper(), i)
+            self.packagelist.sort(
+                key=lambda p: order.get(p.name[0].upper(), len(order)))
+            # output files of the packages loaded before the stubs first
+            key = [order.get(self._stub_outputs.get(unit), -1)
+                   for unit in self.output_units]
+            idx = sorted(range(len(key)), key=key.__getitem__)
+            for values in (self.output_units, self.output_fnames,
+                           self.output_binflag, self.output_packages):
+                values[:] = [values[i] for i in idx]
+
+    def _load_package_stub(self, stub):
+        # load the package of a stub registered with _add_package_stub()
+        pname, load, forgive = stub
+        stubs = self._package_stubs
+        # remove the stub first, the loader may look up other packages
+        index = stubs.index(stub)
+        self._earlier_stubs.append(stubs[:index])
+        del stubs[index]
+        npop = len(self.pop_key_list)
+        units = set(self.output_units)
+        try:
+            load()
+        except Exception as e:
+            if not forgive:
+                raise
+            self.load_fail = True
+            if self.verbose:
+                print('   {:4s} package load...failed'.format(pname))
+                print('   {!s}'.format(e))
+            return
+        finally:
+            self._earlier_stubs.pop()
+        # the units read by the package are not external files
+        for key in self.pop_key_list[npop:]:
+            self.remove_external(unit=key)
+        # the output files added by the package (or by the earlier packages
+        # it loaded first)
+        for unit in self.output_units:
+            if unit not in units:
+                self._stub_outputs.setdefault(unit, pname)
+
+    def _load_earlier_packages(self):
+        """
+        Make sure the packages before the package that is being loaded in
+        the name file are loaded, e.g. before reading from an external unit
+        that may be shared with a package loaded earlier. Packages of a
+        _PackageLoadPool are waited for, packages of a model loaded with
+        lazy_packages=True are loaded in name file order.
+
+        """
+        if self._load_pool is not None:
+            self._load_pool.wait_for_earlier()
+        if self._earlier_stubs:
+            for stub in self._earlier_stubs[-1]:
+                if stub in self._package_stubs:
+                    self._load_package_stub(stub)
+
     def add_package(self, p):
         """
         Add a package.
@@ -171,6 +460,8 @@ class BaseModel(object):
         p : Package object
 
         """
+        if self._defer('add_package', p):
+            return
         for idx, u in enumerate(p.unit_number):
             if u != 0:
                 if u in self.package_units or u in self.external_units:
@@ -245,6 +536,10 @@ class BaseModel(object):
         using self.dis.delr, self.dis.delc, and self.dis.lenuni before being
         returned
         """
+        if item.startswith('__') or 'packagelist' not in self.__dict__:
+            # special attributes are not packages, and the model may not be
+            # set up yet, e.g. when it is unpickled
+            raise AttributeError(item)
         if item == 'sr':
             if self.dis is not None:
                 return self.dis.sr
@@ -315,6 +610,10 @@ class BaseModel(object):
             Default is None
 
         """
+        if self._defer('add_output_file', unit, fname=fname,
+                       extension=extension, binflag=binflag,
+                       package=package):
+            return
         add_cbc = False
         if unit > 0:
             add_cbc = True
@@ -376,6 +675,9 @@ class BaseModel(object):
             binary or not. (default is False)
 
         """
+        if self._defer('add_output', fname, unit, binflag=binflag,
+                       package=package):
+            return
         if fname in self.output_fnames:
             print("BaseModel.add_output() warning: " +
                   "replacing existing filename {0}".format(fname))
@@ -413,6 +715,8 @@ class BaseModel(object):
             unit number of output array
 
         """
+        if self._defer('remove_output', fname=fname, unit=unit):
+            return
         if fname is not None:
             for i, e in enumerate(self.output_fnames):
                 if fname in e:
@@ -561,6 +865,9 @@ class BaseModel(object):
             binary or not. (default is False)
 
         """
+        if self._defer('add_external', fname, unit, binflag=binflag,
+                       output=output):
+            return
         if fname in self.external_fnames:
             print("BaseModel.add_external() warning: " +
                   "replacing existing filename {}".format(fname))
@@ -706,6 +1013,9 @@ class BaseModel(object):
             for pn in p.name:
                 if pn.upper() == name:
                     return True
+        for stub in self._package_stubs:
+            if stub[0] == name:
+                return True
         return False
 
     def get_package(self, name):
@@ -729,6 +1039,13 @@ class BaseModel(object):
         for pp in (self.packagelist):
             if pp.name[0].upper() == name:
                 return pp
+        # load the package if the model was loaded with lazy_packages=True
+        stubs = self.__dict__.get('_package_stubs')
+        if stubs and any(stub[0] == name for stub in stubs):
+            self._load_package_stubs(name)
+            for pp in (self.packagelist):
+                if pp.name[0].upper() == name:
+                    return pp
         return None
 
     def get_package_list(self):
@@ -748,6 +1065,11 @@ class BaseModel(object):
         val = []
         for pp in (self.packagelist):
             val.append(pp.name[0].upper())
+        # packages of a model loaded with lazy_packages=True that have not
+        # been loaded yet
+        for stub in self._package_stubs:
+            if stub[0] not in val:
+                val.append(stub[0])
         return val
 
     def set_version(self, version):
@@ -799,6 +1121,8 @@ class BaseModel(object):
         """
         if new_pth is None:
             new_pth = os.getcwd()
+        # packages not loaded yet read their files from the old workspace
+        self._load_package_stubs()
         if not os.path.exists(new_pth):
             try:
                 sys.stdout.write(
@@ -912,7 +1236,8 @@ class BaseModel(object):
             super(BaseModel, self).__setattr__(key, value)
 
     def run_model(self, silent=False, pause=False, report=False,
-                  normal_msg='normal termination'):
+                  normal_msg='normal termination', use_async=False,
+                  callback=None, echo_interval=None):
         """
         This method will run the model using subprocess.Popen.
 
@@ -928,6 +1253,15 @@ class BaseModel(object):
         normal_msg : str
             Normal termination message used to determine if the
             run terminated normally. (default is 'normal termination')
+        use_async : boolean
+            Read stdout with asyncio and save the lines with timestamps.
+            (default is False)
+        callback : callable or list of callables
+            Function(s) called as callback(line, elapsed) for each line of
+            stdout. (default is None)
+        echo_interval : float
+            Echo at most one line of stdout per echo_interval seconds.
+            (default is None)
 
         Returns
         -------
@@ -939,7 +1273,8 @@ class BaseModel(object):
 
         return run_model(self.exe_name, self.namefile, model_ws=self.model_ws,
                          silent=silent, pause=pause, report=report,
-                         normal_msg=normal_msg)
+                         normal_msg=normal_msg, use_async=use_async,
+                         callback=callback, echo_interval=echo_interval)
 
     def load_results(self):
 
@@ -947,15 +1282,97 @@ class BaseModel(object):
 
         return None
 
-    def write_input(self, SelPackList=False, check=False):
+    def _get_util2ds(self):
+        """
+        Get the Util2d instances of the arrays of all packages.
+
+        """
+        u2ds = []
+        for p in self.packagelist:
+            values = []
+            for value in p.__dict__.values():
+                if isinstance(value, list):
+                    values += value
+                else:
+                    values.append(value)
+            for value in values:
+                if isinstance(value, utils.Util2d):
+                    u2ds.append(value)
+                elif isinstance(value, utils.Util3d):
+                    u2ds += value.util_2ds
+                elif isinstance(value, utils.Transient2d):
+                    u2ds += value.transient_2ds.values()
+                elif isinstance(value, utils.Transient3d):
+                    u2ds += [u2d for u3d in value.transient_3ds.values()
+                             for u2d in u3d.util_2ds]
+        return u2ds
+
+    def _load_deferred_arrays(self):
+        """
+        Read the arrays of the packages that have not been read yet
+        because the model was loaded with lazy_arrays=True.
+
+        """
+        for u2d in self._get_util2ds():
+            u2d._load_deferred()
+
+    def _set_binary_arrays(self, min_size):
+        """
+        Switch the format of the 2-D float32 arrays with at least min_size
+        values to binary. Returns a list of (Util2d, format) to
+        switch the formats back after writing.
+
+        """
+        if self.array_format != 'modflow':
+            raise Exception('binary arrays can only be written for ' +
+                            'MODFLOW models')
+        formats = []
+        for u2d in self._get_util2ds():
+            if len(u2d.shape) != 2 or u2d.format.binary or \
+                    u2d.dtype != np.float32 or \
+                    u2d.vtype != np.ndarray or \
+                    u2d.shape[0] * u2d.shape[1] < min_size:
+                continue
+            formats.append((u2d, u2d._format))
+            u2d._format = copy.copy(u2d._format)
+            u2d._format.binary = True
+        return formats
+
+    def write_input(self, SelPackList=False, check=False, n_workers=None,
+                    binary_arrays=False, incremental=False):
         """
         Write the input.
 
         Parameters
         ----------
         SelPackList : False or list of packages
+        check : boolean
+            Check model input for common errors before writing.
+            (default is False)
+        n_workers : int
+            Number of worker processes that write the external array files
+            while the package files are written. Array files are written
+            in this process if n_workers is None or less than 2.
+            (default is None)
+        binary_arrays : bool or int
+            Write the 2-D real arrays that are not constant as external
+            binary files (MODFLOW models only). If an int, only arrays with at
+            least that many values are written as binary files. The array
+            formats are only changed while writing. (default is False)
+        incremental : bool
+            Only write the package files and external array files whose
+            content has changed since they were last written by
+            write_input(incremental=True). The content is compared by a hash
+            of the package (or array) and of the model settings, DIS and
+            BAS6; package files that no longer exist, and all files after a
+            write_input() that is not incremental, are written. The name file
+            is always written. (default is False)
 
         """
+        # packages that were not loaded on a lazy model load are loaded
+        # before any of the model files are written
+        self._load_package_stubs()
+
         if check:
             # run check prior to writing input
             self.check(f='{}.chk'.format(self.name), verbose=self.verbose,
@@ -969,11 +1386,88 @@ class BaseModel(object):
                       'preserve the precision of the parameter data.')
             self.free_format_input = True
 
+        # arrays that were not read on a lazy model load are read before
+        # the files they are stored in can be overwritten
+        if self.lazy_arrays:
+            self._load_deferred_arrays()
+
         if self.verbose:
             print('\nWriting packages:')
 
+        formats = []
+        if binary_arrays is not False and binary_arrays is not None:
+            min_size = 0 if binary_arrays is True else int(binary_arrays)
+            formats = self._set_binary_arrays(min_size)
+        if n_workers is not None and n_workers > 1:
+            self._array_writer = _ArrayFileWriter(n_workers)
+        if incremental:
+            if self._write_fingerprints.get(None) != self._get_write_state():
+                # the model settings, DIS or BAS6 have changed since the last
+                # write, all files are written
+                self._write_fingerprints.clear()
+            self._write_records = self._write_fingerprints
+        else:
+            # the files may no longer match the fingerprints of the last
+            # incremental write
+            self._write_fingerprints.clear()
+        try:
+            written = self._write_packages(SelPackList)
+        finally:
+            self._write_records = None
+            writer, self._array_writer = self._array_writer, None
+            for u2d, fmt in formats:
+                u2d._format = fmt
+            if writer is not None:
+                writer.close()
+        if self.verbose:
+            print(' ')
+        # write name file
+        self.write_name_file()
+        if incremental:
+            # writing may change the packages (array formats, attributes
+            # computed when they are first used), so the fingerprints are
+            # taken after all files have been written
+            records = self._write_fingerprints
+            for p in written:
+                records[p.fn_path] = _fingerprint(p)
+            records[None] = self._get_write_state()
+        # os.chdir(org_dir)
+        return
+
+    def _get_write_state(self):
+        # the model settings and the packages that other packages depend on
+        # when they are written, part of the fingerprints of the packages
+        settings = [(key, value) for key, value in self.__dict__.items()
+                    if isinstance(value, (str, int, float, bool)) or
+                    value is None]
+        state = [repr(sorted(settings))]
+        for name in ('DIS', 'DISU', 'BAS6'):
+            p = self.get_package(name)
+            if p is not None:
+                state.append(_fingerprint(p))
+        return state
+
+    def _is_unchanged(self, p):
+        # True if write_input(incremental=True) does not need to write the
+        # package, its fingerprint is compared with the one of the last write
+        if self._write_records is None or not os.path.isfile(p.fn_path):
+            return False
+        fingerprint = self._write_records.get(p.fn_path)
+        if fingerprint is None:
+            return False
+        if fingerprint != _fingerprint(p):
+            return False
+        if self.verbose:
+            print('   Package: ', p.name[0], '(unchanged)')
+        return True
+
+    def _write_packages(self, SelPackList=False):
+        # returns the packages that have been written
+        written = []
         if SelPackList == False:
             for p in self.packagelist:
+                if self._is_unchanged(p):
+                    continue
                 if self.verbose:
                     print('   Package: ', p.name[0])
                 # prevent individual package checks from running after
@@ -982,27 +1476,37 @@ class BaseModel(object):
                 # or the model level check procedure would have to be split up
                 # or each package would need a check arguemnt,
                 # or default for package level check would have to be False
-                try:
-                    p.write_file(check=False)
-                except TypeError:
-                    p.write_file()
+                with profiler.scope('write', p.name[0],
+                                    files=self._package_files(p)):
+                    try:
+                        p.write_file(check=False)
+                    except TypeError:
+                        p.write_file()
+                written.append(p)
         else:
             for pon in SelPackList:
                 for i, p in enumerate(self.packagelist):
                     if pon in p.name:
+                        if self._is_unchanged(p):
+                            continue
                         if self.verbose:
                             print('   Package: ', p.name[0])
-                        try:
-                            p.write_file(check=False)
-                        except TypeError:
-                            p.write_file()
-                            break
-        if self.verbose:
-            print(' ')
-        # write name file
-        self.write_name_file()
-        # os.chdir(org_dir)
-        return
+                        with profiler.scope('write', p.name[0],
+                                            files=self._package_files(p)):
+                            try:
+                                p.write_file(check=False)
+                            except TypeError:
+                                p.write_file()
+                                written.append(p)
+                                break
+                        written.append(p)
+        return written
+
+    def _package_files(self, p):
+        # files written by a package, if profiling is on
+        if profiler.get_profiler() is None:
+            return None
+        return [os.path.join(self.model_ws, fname) for fname in p.file_name]
 
     def write_name_file(self):
         """
@@ -1053,7 +1557,7 @@ class BaseModel(object):
         if key not in self.pop_key_list:
             self.pop_key_list.append(key)
 
-    def check(self, f=None, verbose=True, level=1):
+    def check(self, f=None, verbose=True, level=1, n_workers=None):
         """
         Check model data for common errors.
 
@@ -1070,6 +1574,12 @@ class BaseModel(object):
         level : int
             Check method analysis level. If level=0, summary checks are
             performed. If level=1, full checks are performed.
+        n_workers : int
+            Number of threads that check the packages concurrently. The
+            package checks spend most of their time in numpy, which runs
+            in parallel. Packages that have not been loaded yet
+            (lazy_packages) are loaded first. (default is None, the packages
+            are checked one after another)
 
         Returns
         -------
@@ -1087,10 +1597,30 @@ class BaseModel(object):
         chk = utils.check(self, f=f, verbose=verbose, level=level)
         results = {}
 
-        for p in self.packagelist:
-            if chk.package_check_levels.get(p.name[0].lower(), 0) <= level:
-                results[p.name[0]] = p.check(f=None, verbose=False,
-                                             level=level - 1)
+        concurrent = n_workers is not None and n_workers > 1
+        if concurrent:
+            # the package checks look up other packages, which must not be
+            # loaded by several threads at once
+            self._load_package_stubs()
+        packages = [p for p in self.packagelist
+                    if chk.package_check_levels.get(p.name[0].lower(),
+                                                    0) <= level]
+
+        def check_package(p):
+            return p.check(f=None, verbose=False, level=level - 1)
+
+        if concurrent and len(packages) > 1:
+            from multiprocessing.pool import ThreadPool
+            pool = ThreadPool(min(n_workers, len(packages)))
+            try:
+                checks = pool.map(check_package, packages)
+            finally:
+                pool.close()
+                pool.join()
+        else:
+            checks = [check_package(p) for p in packages]
+        for p, r in zip(packages, checks):
+            results[p.name[0]] = r
 
         # model level checks
         # solver check
@@ -1280,10 +1810,122 @@ class BaseModel(object):
         return
 
 
+def _get_normal_msg(normal_msg):
+    # the normal termination messages of run_model() in lower case
+    if isinstance(normal_msg, str):
+        return [normal_msg.lower()]
+    return [s.lower() for s in normal_msg]
+
+
+def _get_exe(exe_name):
+    # the path of the executable of run_model()
+    exe = which(exe_name)
+    if exe is None:
+        import platform
+        if platform.system() in 'Windows':
+            if not exe_name.lower().endswith('.exe'):
+                exe = which(exe_name + '.exe')
+    if exe is None:
+        s = 'The program {} does not exist or is not executable.'.format(
+            exe_name)
+        raise Exception(s)
+    return exe
+
+
+def _check_namefile(namefile, model_ws):
+    if namefile is not None:
+        if not os.path.isfile(os.path.join(model_ws, namefile)):
+            s = 'The namefile for this model ' + \
+                'does not exists: {}'.format(namefile)
+            raise Exception(s)
+
+
+def _get_argv(exe_name, namefile, cargs=None):
+    # the command line of run_model()
+    argv = [exe_name]
+    if namefile is not None:
+        argv.append(namefile)
+
+    # add additional arguments to Popen arguments
+    if cargs is not None:
+        if isinstance(cargs, str):
+            cargs = [cargs]
+        for t in cargs:
+            argv.append(t)
+    return argv
+
+
+class _RunOutput(object):
+    """
+    Processes the stdout lines of run_model(): looks for the normal
+    termination message, saves and echoes the lines and calls the line
+    callbacks.
+
+    """
+
+    def __init__(self, normal_msg, silent, report, timestamps=False,
+                 callback=None, echo_interval=None):
+        self.normal_msg = _get_normal_msg(normal_msg)
+        self.silent = silent
+        self.report = report
+        self.timestamps = timestamps
+        if callback is None:
+            callback = []
+        elif callable(callback):
+            callback = [callback]
+        self.callbacks = list(callback)
+        self.echo_interval = echo_interval
+        self.success = False
+        self.buff = []
+        self.start = time.time()
+        self.last = self.start
+        self.last_echo = None
+        self.skipped = None
+
+    def add_line(self, line):
+        c = line.decode('utf-8', 'replace').rstrip('\r\n')
+        now = time.time()
+        if not self.success:
+            lc = c.lower()
+            for msg in self.normal_msg:
+                if msg in lc:
+                    self.success = True
+                    break
+        for callback in self.callbacks:
+            callback(c, now - self.start)
+        if self.timestamps:
+            # lines with the time since the previous line
+            c = c.lower().strip()
+            if c == '':
+                return
+            c = "(elapsed:{0})-->{1}".format(now - self.last, c)
+            self.last = now
+            self.buff.append(c)
+        elif self.report:
+            self.buff.append(c)
+        if not self.silent:
+            self.echo(c, now)
+
+    def echo(self, c, now):
+        if self.echo_interval is not None and self.last_echo is not None \
+                and now - self.last_echo < self.echo_interval:
+            self.skipped = c
+            return
+        print(c)
+        self.last_echo = now
+        self.skipped = None
+
+    def close(self):
+        # the last line is echoed
+        if self.skipped is not None:
+            print(self.skipped)
+            self.skipped = None
+
+
 def run_model(exe_name, namefile, model_ws='./',
               silent=False, pause=False, report=False,
               normal_msg='normal termination', use_async=False,
-              cargs=None):
+              cargs=None, callback=None, echo_interval=None):
     """
     This function will run the model using subprocess.Popen.  It
     communicates with the model's stdout asynchronously and reports
@@ -1313,135 +1955,72 @@ def run_model(exe_name, namefile, model_ws='./',
         run terminated normally. (default is 'normal termination')
     use_async : boolean
         asynchonously read model stdout and report with timestamps.  good for
-        models that take long time to run.  not good for models that run
-        really fast
+        models that take long time to run.
     cargs : str or list of strings
         additional command line arguments to pass to the executable.
         Default is None
+    callback : callable or list of callables
+        Function(s) called as callback(line, elapsed) for each line of
+        stdout, with the line (without line end) and the seconds since the
+        start of the run, for example to report progress or to parse the
+        solver convergence. Default is None
+    echo_interval : float
+        Echo at most one line of stdout per echo_interval seconds (the last
+        line is always echoed), for models that write many lines.
+        Default is None, all lines are echoed unless silent is True
+
     Returns
     -------
     (success, buff)
     success : boolean
     buff : list of lines of stdout
 
-    """
-    success = False
-    buff = []
+    Notes
+    -----
+    With use_async=True (Python 3.5+) stdout is read by an asyncio event loop
+    (in a separate thread if an event loop is already running), the lines
+    are saved with the time elapsed since the previous line.
 
-    # convert normal_msg to lower case for comparison
-    if isinstance(normal_msg, str):
-        normal_msg = [normal_msg.lower()]
-    elif isinstance(normal_msg, list):
-        for idx, s in enumerate(normal_msg):
-            normal_msg[idx] = s.lower()
+    Examples
+    --------
 
-    # Check to make sure that program and namefile exist
-    exe = which(exe_name)
-    if exe is None:
-        import platform
-        if platform.system() in 'Windows':
-            if not exe_name.lower().endswith('.exe'):
-                exe = which(exe_name + '.exe')
-    if exe is None:
-        s = 'The program {} does not exist or is not executable.'.format(
-            exe_name)
-        raise Exception(s)
-    else:
-        if not silent:
-            s = 'FloPy is using the following ' + \
-                ' executable to run the model: {}'.format(exe)
-            print(s)
-
-    if namefile is not None:
-        if not os.path.isfile(os.path.join(model_ws, namefile)):
-            s = 'The namefile for this model ' + \
-                'does not exists: {}'.format(namefile)
-            raise Exception(s)
+    >>> import flopy
+    >>> def progress(line, elapsed):
+    ...     if 'stress period' in line.lower():
+    ...         print('{:.0f} s: {}'.format(elapsed, line.strip()))
+    >>> success, buff = flopy.run_model('mf2005', 'model.nam', silent=True,
+    ...                                 callback=progress)
 
-    # simple little function for the thread to target
-    def q_output(output, q):
-        for line in iter(output.readline, b''):
-            q.put(line)
-            # time.sleep(1)
-            # output.close()
+    """
+    # Check to make sure that program and namefile exist
+    exe = _get_exe(exe_name)
+    if not silent:
+        s = 'FloPy is using the following ' + \
+            ' executable to run the model: {}'.format(exe)
+        print(s)
+    _check_namefile(namefile, model_ws)
 
     # create a list of arguments to pass to Popen
-    argv = [exe_name]
-    if namefile is not None:
-        argv.append(namefile)
-
-    # add additional arguments to Popen arguments
-    if cargs is not None:
-        if isinstance(cargs, str):
-            cargs = [cargs]
-        for t in cargs:
-            argv.append(t)
-
-    # run the model with Popen
-    proc = sp.Popen(argv,
-                    stdout=sp.PIPE, stderr=sp.STDOUT, cwd=model_ws)
-
-    if not use_async:
-        while True:
-            line = proc.stdout.readline()
-            c = line.decode('utf-8')
-            if c != '':
-                for msg in normal_msg:
-                    if msg in c.lower():
-                        success = True
-                        break
-                c = c.rstrip('\r\n')
-                if not silent:
-                    print('{}'.format(c))
-                if report == True:
-                    buff.append(c)
-            else:
-                break
-        return success, buff
-
-    # some tricks for the async stdout reading
-    q = Queue.Queue()
-    thread = threading.Thread(target=q_output, args=(proc.stdout, q))
-    thread.daemon = True
-    thread.start()
-
-    failed_words = ["fail", "error"]
-    last = datetime.now()
-    lastsec = 0.
-    while True:
-        try:
-            line = q.get_nowait()
-        except Queue.Empty:
-            pass
-        else:
-            if line == '':
-                break
-            line = line.decode().lower().strip()
-            if line != '':
-                now = datetime.now()
-                dt = now - last
-                tsecs = dt.total_seconds() - lastsec
-                line = "(elapsed:{0})-->{1}".format(tsecs, line)
-                lastsec = tsecs + lastsec
-                buff.append(line)
-                if not silent:
-                    print(line)
-                for fword in failed_words:
-                    if fword in line:
-                        success = False
-                        break
-        if proc.poll() is not None:
-            break
-    proc.wait()
-    thread.join(timeout=1)
-    buff.extend(proc.stdout.readlines())
-    proc.stdout.close()
-
-    for line in buff:
-        if normal_msg in line:
-            print("success")
-            success = True
-            break
+    argv = _get_argv(exe_name, namefile, cargs)
+
+    output = _RunOutput(normal_msg, silent, report, timestamps=use_async,
+                        callback=callback, echo_interval=echo_interval)
+    if use_async and sys.version_info >= (3, 5):
+        # the lines are read by the asyncio event loop as they are written
+        from .batchrun import _run_coroutine, _stream_process
+        _run_coroutine(_stream_process(argv, model_ws, output.add_line))
+    else:
+        # run the model with Popen, readline() blocks until the next line
+        proc = sp.Popen(argv,
+                        stdout=sp.PIPE, stderr=sp.STDOUT, cwd=model_ws)
+        for line in iter(proc.stdout.readline, b''):
+            output.add_line(line)
+        proc.stdout.close()
+        proc.wait()
+    output.close()
+    success, buff = output.success, output.buff
+    if use_async and success and not silent:
+        print("success")
 
     if pause:
         input('Press Enter to continue...')
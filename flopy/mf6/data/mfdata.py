@@ -303,7 +303,7 @@ class LayerStorage(object):
     def __getattr__(self, attr):
         if attr == 'array':
             return self._data_storage_parent.get_data(self._lay_indexes, True)
-        elif attr == '__getstate__':
+        elif attr in ('__getstate__', '__setstate__'):
             raise AttributeError(attr)
 
     def set_data(self, data):
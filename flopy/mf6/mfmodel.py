@@ -155,6 +155,9 @@ class MFModel(PackageContainer):
             Package object of type :class:`flopy.pakbase.Package`
 
         """
+        if item.startswith('__'):
+            # special attributes are not packages, e.g. when unpickled
+            raise AttributeError(item)
         return self.get_package(item)
 
     def __setattr__(self, key, value):
@@ -8,6 +8,7 @@ import collections
 import os.path
 import numpy as np
 from flopy.mbase import run_model
+from flopy.utils.snapshot import ModelSnapshotCache
 from flopy.mf6.mfbase import PackageContainer, MFFileMgmt, ExtFileAction, \
                              PackageContainerType, MFDataException, \
                              FlopyException, VerbosityLevel
@@ -51,6 +52,12 @@ class SimulationDict(collections.OrderedDict):
         self._path = path
         collections.OrderedDict.__init__(self)
 
+    def __reduce__(self):
+        # the path is restored after the dictionary is created, it refers
+        # back to the simulation that holds the dictionary
+        return (self.__class__, (None,), {'_path': self._path}, None,
+                iter(list(self.items())))
+
     def __getitem__(self, key):
         # check if the key refers to a binary output file, or an observation
         # output file, if so override the dictionary request and call output
@@ -366,6 +373,9 @@ class MFSimulation(PackageContainer):
             :class:flopy6.mfpackage
 
         """
+        if item.startswith('__'):
+            # special attributes are not packages, e.g. when unpickled
+            raise AttributeError(item)
 
         models = []
         if item in self.structure.model_types:
@@ -424,7 +434,7 @@ class MFSimulation(PackageContainer):
 
     @classmethod
     def load(cls, sim_name='modflowsim', version='mf6', exe_name='mf6.exe',
-             sim_ws='.', strict=True, verbosity_level=1):
+             sim_ws='.', strict=True, verbosity_level=1, cache=None):
         """
         Load an existing model.
 
@@ -448,6 +458,12 @@ class MFSimulation(PackageContainer):
                     messages
                 2 : verbose mode with full error/warning/informational
                     messages.  this is ideal for debugging
+        cache : string or flopy.utils.snapshot.ModelSnapshotCache
+            path of a cache directory.  if the simulation name file and the
+            input files it refers to have not changed since the simulation
+            was last loaded with the same arguments, the simulation is
+            restored from its snapshot in the cache, otherwise it is loaded
+            and the snapshot is created
         Returns
         -------
         sim : MFSimulation object
@@ -456,6 +472,15 @@ class MFSimulation(PackageContainer):
         --------
         >>> s = flopy6.mfsimulation.load('my simulation')
         """
+        if cache is not None:
+            # restore the simulation from its snapshot, or load it and
+            # create one
+            kwargs = dict(sim_name=sim_name, version=version,
+                          exe_name=exe_name, sim_ws=sim_ws, strict=strict,
+                          verbosity_level=verbosity_level)
+            return ModelSnapshotCache.get(cache).load(
+                cls.load, os.path.join(sim_ws, 'mfsim.nam'), sim_ws, kwargs)
+
         # initialize
         instance = cls(sim_name, version, exe_name, sim_ws, verbosity_level)
         verbosity_level = instance.simulation_data.verbosity_level
@@ -909,9 +934,10 @@ class MFSimulation(PackageContainer):
 
     def run_simulation(self, silent=None, pause=False, report=False,
                        normal_msg='normal termination',
-                       use_async=False, cargs=None):
+                       use_async=False, cargs=None, callback=None,
+                       echo_interval=None):
         """
-        Run the simulation.
+        Run the simulation. See flopy.mbase.run_model() for the arguments.
         """
         if silent is None:
             if self.simulation_data.verbosity_level.value >= \
@@ -922,7 +948,8 @@ class MFSimulation(PackageContainer):
         return run_model(self.exe_name, None,
                          self.simulation_data.mfpath.get_sim_path(),
                          silent=silent, pause=pause, report=report,
-                         normal_msg=normal_msg, use_async=use_async, cargs=cargs)
+                         normal_msg=normal_msg, use_async=use_async, cargs=cargs,
+                         callback=callback, echo_interval=echo_interval)
 
     def delete_output_files(self):
         """
@@ -6,13 +6,34 @@ mf module.  Contains the ModflowGlobal, ModflowList, and Modflow classes.
 
 import os
 import inspect
+import functools
 import flopy
-from ..mbase import BaseModel
+from ..mbase import BaseModel, _PackageLoadPool
 from ..pakbase import Package
 from ..utils import mfreadnam, SpatialReference, TemporalReference
+from ..utils.snapshot import ModelSnapshotCache
+from ..utils import profiler
 from .mfpar import ModflowPar
 
 
+try:
+    getargspec = inspect.getfullargspec
+except AttributeError:
+    getargspec = inspect.getargspec
+
+
+def _load_package(item, ml, ext_unit_dict):
+    # load the package file of a name file entry
+    package_load_args = list(getargspec(item.package.load))[0]
+    with profiler.scope('load', item.filetype, files=[item.filename]):
+        if "check" in package_load_args:
+            return item.package.load(item.filename, ml,
+                                     ext_unit_dict=ext_unit_dict,
+                                     check=False)
+        return item.package.load(item.filename, ml,
+                                 ext_unit_dict=ext_unit_dict)
+
+
 class ModflowGlobal(Package):
     """
     ModflowGlobal Package class
@@ -480,9 +501,85 @@ class Modflow(BaseModel):
         else:
             return hdObj, ddObj, bdObj
 
+    @staticmethod
+    def _load_packages(ml, ext_unit_dict, load_only, forgive, loaded,
+                       files_successfully_loaded, files_not_loaded,
+                       lazy_packages=False):
+        # load the packages in ext_unit_dict, or take them from loaded
+        # (the results of a _PackageLoadPool) if it is not None
+        stub_unit_dict = dict(ext_unit_dict)
+        for key, item in ext_unit_dict.items():
+            if item.package is not None:
+                if item.filetype in load_only:
+                    error = None
+                    if lazy_packages and item.filetype != 'BAS6':
+                        # the package is loaded when it is first used
+                        ml._add_package_stub(
+                            item.package.ftype(),
+                            functools.partial(_load_package, item, ml,
+                                              stub_unit_dict),
+                            forgive=forgive)
+                        if ml.verbose:
+                            print('   {:4s} package load...deferred'
+                                  .format(item.filetype))
+                        continue
+                    if loaded is not None:
+                        pck, error = next(loaded)
+                        if error is not None and not forgive:
+                            raise error
+                        if item.filetype == 'BAS6' and error is None:
+                            # BAS6 was added before the other packages
+                            ml.packagelist.remove(pck)
+                            ml.packagelist.append(pck)
+                    elif forgive:
+                        try:
+                            pck = _load_package(item, ml, ext_unit_dict)
+                        except Exception as e:
+                            error = e
+                    else:
+                        pck = _load_package(item, ml, ext_unit_dict)
+                    if error is None:
+                        files_successfully_loaded.append(item.filename)
+                        if ml.verbose:
+                            print('   {:4s} package load...success'
+                                  .format(item.filetype))
+                    else:
+                        ml.load_fail = True
+                        if ml.verbose:
+                            print('   {:4s} package load...failed\n   {!s}'
+                                  .format(item.filetype, error))
+                        files_not_loaded.append(item.filename)
+                else:
+                    if ml.verbose:
+                        print('   {:4s} package load...skipped'
+                              .format(item.filetype))
+                    files_not_loaded.append(item.filename)
+            elif "data" not in item.filetype.lower():
+                files_not_loaded.append(item.filename)
+                if ml.verbose:
+                    print('   {:4s} package load...skipped'
+                          .format(item.filetype))
+            elif "data" in item.filetype.lower():
+                if ml.verbose:
+                    print('   {} file load...skipped\n      {}'
+                          .format(item.filetype,
+                                  os.path.basename(item.filename)))
+                if key not in ml.pop_key_list:
+                    # do not add unit number (key) if it already exists
+                    if key not in ml.external_units:
+                        ml.external_fnames.append(item.filename)
+                        ml.external_units.append(key)
+                        ml.external_binflag.append("binary"
+                                                   in item.filetype.lower())
+                        ml.external_output.append(False)
+            else:
+                raise KeyError('unhandled case: {}, {}'.format(key, item))
+
     @staticmethod
     def load(f, version='mf2005', exe_name='mf2005.exe', verbose=False,
-             model_ws='.', load_only=None, forgive=True, check=True):
+             model_ws='.', load_only=None, forgive=True, check=True,
+             lazy_arrays=False, columnar_lists=False, n_workers=None,
+             lazy_packages=False, cache=None):
         """
         Load an existing MODFLOW model.
 
@@ -510,6 +607,36 @@ class Modflow(BaseModel):
             useful for debugging. Default False.
         check : boolean, optional
             Check model input for common errors. Default True.
+        lazy_arrays : bool, optional
+            If True, the open/close, internal and external arrays are only
+            located in their files when the model is loaded, and are read
+            the first time they are used. Arrays that have not been used are
+            read by write_input(), before any file is overwritten. The check
+            reads most arrays, so check=False is usually passed with this
+            option. Default False.
+        columnar_lists : bool, optional
+            If True, the stress period data of list packages (WEL, GHB,
+            RIV, ...) is stored in a flopy.utils.MfListStore, which keeps
+            the records of all stress periods in one contiguous array.
+            Default False.
+        n_workers : int, optional
+            If larger than 1, the package files are loaded in a pool of
+            n_workers threads after the DIS file, and the packages are
+            added to the model in name file order. Default None.
+        lazy_packages : bool, optional
+            If True, only the name file, DIS and BAS6 are loaded, and each
+            of the other packages is loaded the first time it is used
+            (ml.lpf, ml.get_package('LPF')), or by write_input() and
+            change_model_ws(). ml.packagelist only holds the packages that
+            have been loaded; ml.get_package_list() also lists the others.
+            The check only covers DIS and BAS6. Default False.
+        cache : str or flopy.utils.snapshot.ModelSnapshotCache, optional
+            Path of a cache directory. If the name file and the input files
+            it refers to have not changed since the model was last loaded
+            with the same arguments, the model is restored from its snapshot
+            in the cache, otherwise it is loaded and the snapshot is
+            created. lazy_arrays and lazy_packages are not used with a
+            cache. Default None.
 
         Returns
         -------
@@ -531,6 +658,19 @@ class Modflow(BaseModel):
         if not os.path.isfile(namefile_path):
             raise IOError('cannot find name file: ' + str(namefile_path))
 
+        if cache is not None:
+            # restore the model from its snapshot, or load it and create one
+            kwargs = dict(f=f, version=version, exe_name=exe_name,
+                          verbose=verbose, model_ws=model_ws,
+                          load_only=load_only, forgive=forgive, check=False,
+                          columnar_lists=columnar_lists, n_workers=n_workers)
+            ml = ModelSnapshotCache.get(cache, verbose=verbose).load(
+                Modflow.load, namefile_path, model_ws, kwargs)
+            if check:
+                ml.check(f='{}.chk'.format(ml.name), verbose=ml.verbose,
+                         level=0)
+            return ml
+
         # Determine model name from 'f', without any extension or path
         modelname = os.path.splitext(os.path.basename(f))[0]
 
@@ -541,6 +681,8 @@ class Modflow(BaseModel):
                   .format(modelname, 50 * '-'))
         ml = Modflow(modelname, version=version, exe_name=exe_name,
                      verbose=verbose, model_ws=model_ws)
+        ml.lazy_arrays = lazy_arrays
+        ml.columnar_lists = columnar_lists
 
         files_successfully_loaded = []
         files_not_loaded = []
@@ -609,9 +751,11 @@ class Modflow(BaseModel):
         if dis_key is None:
             raise KeyError('discretization entry not found in nam file')
         disnamdata = ext_unit_dict[dis_key]
-        dis = disnamdata.package.load(
-                disnamdata.filename, ml,
-                ext_unit_dict=ext_unit_dict, check=False)
+        with profiler.scope('load', disnamdata.filetype,
+                            files=[disnamdata.filename]):
+            dis = disnamdata.package.load(
+                    disnamdata.filename, ml,
+                    ext_unit_dict=ext_unit_dict, check=False)
         files_successfully_loaded.append(disnamdata.filename)
         if ml.verbose:
             print('   {:4s} package load...success'.format(dis.name[0]))
@@ -665,71 +809,34 @@ class Modflow(BaseModel):
             assert ml.pop_key_list.pop() == ext_pkg_d.get('MULT')
 
         # try loading packages in ext_unit_dict
-        for key, item in ext_unit_dict.items():
-            if item.package is not None:
-                if item.filetype in load_only:
-                    if forgive:
-                        try:
-                            package_load_args = \
-                                list(inspect.getargspec(item.package.load))[0]
-                            if "check" in package_load_args:
-                                pck = item.package.load(
-                                        item.filename, ml,
-                                        ext_unit_dict=ext_unit_dict, check=False)
-                            else:
-                                pck = item.package.load(
-                                        item.filename, ml,
-                                        ext_unit_dict=ext_unit_dict)
-                            files_successfully_loaded.append(item.filename)
-                            if ml.verbose:
-                                print('   {:4s} package load...success'
-                                      .format(item.filetype))
-                        except Exception as e:
-                            ml.load_fail = True
-                            if ml.verbose:
-                                print('   {:4s} package load...failed\n   {!s}'
-                                      .format(item.filetype, e))
-                            files_not_loaded.append(item.filename)
-                    else:
-                        package_load_args = \
-                            list(inspect.getargspec(item.package.load))[0]
-                        if "check" in package_load_args:
-                            pck = item.package.load(
-                                item.filename, ml,
-                                ext_unit_dict=ext_unit_dict, check=False)
-                        else:
-                            pck = item.package.load(
-                                item.filename, ml,
-                                ext_unit_dict=ext_unit_dict)
-                        files_successfully_loaded.append(item.filename)
-                        if ml.verbose:
-                            print('   {:4s} package load...success'
-                                  .format(item.filetype))
-                else:
-                    if ml.verbose:
-                        print('   {:4s} package load...skipped'
-                              .format(item.filetype))
-                    files_not_loaded.append(item.filename)
-            elif "data" not in item.filetype.lower():
-                files_not_loaded.append(item.filename)
-                if ml.verbose:
-                    print('   {:4s} package load...skipped'
-                          .format(item.filetype))
-            elif "data" in item.filetype.lower():
-                if ml.verbose:
-                    print('   {} file load...skipped\n      {}'
-                          .format(item.filetype,
-                                  os.path.basename(item.filename)))
-                if key not in ml.pop_key_list:
-                    # do not add unit number (key) if it already exists
-                    if key not in ml.external_units:
-                        ml.external_fnames.append(item.filename)
-                        ml.external_units.append(key)
-                        ml.external_binflag.append("binary"
-                                                   in item.filetype.lower())
-                        ml.external_output.append(False)
-            else:
-                raise KeyError('unhandled case: {}, {}'.format(key, item))
+        if lazy_packages:
+            # packages loaded later are put back in name file order
+            ml._package_order = [dis.name[0]] + [
+                item.package.ftype() for item in ext_unit_dict.values()
+                if item.package is not None and item.filetype in load_only]
+        loaded = None
+        if n_workers is not None and n_workers > 1 and not lazy_packages:
+            # parse the package files in threads, the packages are added
+            # to the model in name file order
+            funcs = []
+            for item in ext_unit_dict.values():
+                if item.package is not None and item.filetype in load_only:
+                    func = functools.partial(_load_package, item, ml,
+                                             ext_unit_dict)
+                    if item.filetype == 'BAS6':
+                        # other packages need BAS6 (ifrefm) to load
+                        func = _PackageLoadPool.preload(func)
+                    funcs.append(func)
+            ml._load_pool = _PackageLoadPool(ml, n_workers)
+            loaded = ml._load_pool.imap(funcs)
+        try:
+            Modflow._load_packages(ml, ext_unit_dict, load_only, forgive,
+                                   loaded, files_successfully_loaded,
+                                   files_not_loaded, lazy_packages)
+        finally:
+            if loaded is not None:
+                loaded.close()
+            ml._load_pool = None
 
         # pop binary output keys and any external file units that are now
         # internal
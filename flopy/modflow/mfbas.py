@@ -12,7 +12,7 @@ import re
 import sys
 import numpy as np
 from ..pakbase import Package
-from ..utils import Util3d, check, get_neighbors
+from ..utils import Util3d, check, all_neighbors
 
 class ModflowBas(Package):
     """
@@ -182,10 +182,10 @@ class ModflowBas(Package):
         """
         chk = check(self, f=f, verbose=verbose, level=level)
 
-        neighbors = get_neighbors(self.ibound.array)
-        neighbors[np.isnan(neighbors)] = 0 # set neighbors at edges to 0 (inactive)
+        # neighbors at edges are inactive
+        isolated = all_neighbors(self.ibound.array, lambda v: v < 1)
         chk.values(self.ibound.array,
-                  (self.ibound.array > 0) & np.all(neighbors < 1, axis=0),
+                  (self.ibound.array > 0) & isolated,
                    'isolated cells in ibound array', 'Warning')
         chk.values(self.ibound.array, np.isnan(self.ibound.array),
                    error_name='Not a number', error_type='Error')
@@ -515,6 +515,12 @@ class ModflowLak(Package):
         for kper in range(nper):
             itmp, file_entry_lakarr = self.lakarr.get_kper_entry(kper)
             ibd, file_entry_bdlknc = self.bdlknc.get_kper_entry(kper)
+            if itmp < 0 and (ibd > 0 or kper in ds8_keys):
+                # lkarr, bdlknc and the sill data are read together
+                itmp = 1
+                file_entry_lakarr = self.lakarr[kper].get_file_entry()
+            if itmp > 0 and ibd < 0:
+                file_entry_bdlknc = self.bdlknc[kper].get_file_entry()
 
             itmp2 = 0
             if kper in ds9_keys:
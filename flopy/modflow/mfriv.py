@@ -206,26 +206,23 @@ class ModflowRiv(Package):
         chk = check(self, f=f, verbose=verbose, level=level)
         chk.summary_array = basechk.summary_array
 
-        for per in self.stress_period_data.data.keys():
-            if isinstance(self.stress_period_data.data[per], np.recarray):
-                spd = self.stress_period_data.data[per]
-                inds = (spd.k, spd.i, spd.j) if self.parent.structured else (spd.node)
-
-                # check that river stage and bottom are above model cell bottoms
-                # also checks for nan values
-                botms = self.parent.dis.botm.array[inds]
-
-                for elev in ['stage', 'rbot']:
-                    chk.stress_period_data_values(spd, spd[elev] < botms,
-                                                  col=elev,
-                                                  error_name='{} below cell bottom'.format(elev),
-                                                  error_type='Error')
-
-                # check that river stage is above the rbot
-                chk.stress_period_data_values(spd, spd['rbot'] > spd['stage'],
-                                              col='stage',
-                                              error_name='RIV stage below rbots',
-                                              error_type='Error')
+        # all stress periods are checked in one pass
+        spd, periods = chk.get_all_periods(self.stress_period_data)
+        if spd is not None:
+            inds = (spd.k, spd.i, spd.j) if self.parent.structured else (spd.node)
+
+            # check that river stage and bottom are above model cell bottoms
+            # also checks for nan values
+            botms = self.parent.dis.botm.array[inds]
+
+            checks = [(spd[elev] < botms, elev,
+                       '{} below cell bottom'.format(elev), 'Error', None)
+                      for elev in ['stage', 'rbot']]
+
+            # check that river stage is above the rbot
+            checks.append((spd['rbot'] > spd['stage'], 'stage',
+                           'RIV stage below rbots', 'Error', None))
+            chk.stress_period_data_checks(spd, periods, checks)
         chk.summarize()
         return chk
 
@@ -13,11 +13,6 @@ from ..utils.flopy_io import line_parse
 from ..utils import SpatialReference
 from ..utils.recarray_utils import create_empty_recarray
 
-try:
-    import pandas as pd
-except:
-    pd = False
-
 
 class ModflowSfr2(Package):
     """
@@ -501,11 +496,12 @@ class ModflowSfr2(Package):
 
     @property
     def df(self):
-        if pd:
-            return pd.DataFrame(self.reach_data)
-        else:
+        try:
+            import pandas as pd
+        except ImportError:
             msg = 'ModflowSfr2.df: pandas not available'
             raise ImportError(msg)
+        return pd.DataFrame(self.reach_data)
 
     def _set_paths(self):
         graph = self.graph
@@ -929,7 +925,7 @@ class ModflowSfr2(Package):
         new BAS6 package file, model.write() or flopy.model.ModflowBas6.write()
         must be run.
         """
-        ib = self.parent.bas6.ibound.array
+        ib = self.parent.bas6.ibound.array_copy()
         deact_lays = [list(range(i)) for i in self.reach_data.k]
         for ks, i, j in zip(deact_lays, self.reach_data.i, self.reach_data.j):
             for k in ks:
@@ -1275,7 +1271,9 @@ class ModflowSfr2(Package):
         ax : matplotlib.axes._subplots.AxesSubplot object
         """
         import matplotlib.pyplot as plt
-        if not pd:
+        try:
+            import pandas as pd
+        except ImportError:
             msg = 'ModflowSfr2.plot_path: pandas not available'
             raise ImportError(msg)
 
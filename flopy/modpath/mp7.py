@@ -7,7 +7,6 @@ mp7 module.  Contains the Modpath7List and Modpath7 classes.
 import numpy as np
 from ..mbase import BaseModel
 from ..modflow import Modflow
-from ..mf6 import MFModel
 from ..pakbase import Package
 from .mp7bas import Modpath7Bas
 from .mp7sim import Modpath7Sim
@@ -109,6 +108,8 @@ class Modpath7(BaseModel):
         self.mpnamefile = '{}.{}'.format(self.name, namefile_ext)
         self.mpbas_file = '{}.mpbas'.format(modelname)
 
+        # mf6 is imported when it is needed
+        from ..mf6 import MFModel
         if not isinstance(flowmodel, (Modflow, MFModel)):
             msg = 'Modpath7: flow model is not an instance of ' + \
                   'flopy.modflow.Modflow or flopy.mf6.MFModel. ' + \
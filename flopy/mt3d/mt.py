@@ -1,9 +1,11 @@
 import os
 import sys
+import functools
 import numpy as np
 from ..mbase import BaseModel
 from ..pakbase import Package
 from ..utils import mfreadnam
+from ..utils.snapshot import ModelSnapshotCache
 from .mtbtn import Mt3dBtn
 from .mtadv import Mt3dAdv
 from .mtdsp import Mt3dDsp
@@ -432,7 +434,8 @@ class Mt3dms(BaseModel):
 
     @staticmethod
     def load(f, version='mt3dms', exe_name='mt3dms.exe', verbose=False,
-             model_ws='.', load_only=None, forgive=False, modflowmodel=None):
+             model_ws='.', load_only=None, forgive=False, modflowmodel=None,
+             lazy_packages=False, cache=None):
         """
         Load an existing model.
 
@@ -465,6 +468,20 @@ class Mt3dms(BaseModel):
             This is a flopy Modflow model object upon which this Mt3dms
             model is based. (the default is None)
 
+        lazy_packages : bool
+            If True, only the name file and BTN are loaded, and each of the
+            other packages is loaded the first time it is used (mt.adv,
+            mt.get_package('ADV')), or by write_input() and
+            change_model_ws(). (default is False)
+
+        cache : str or flopy.utils.snapshot.ModelSnapshotCache
+            Path of a cache directory. If the name file and the input files
+            it refers to have not changed since the model was last loaded
+            with the same arguments, the model is restored from its snapshot
+            in the cache, otherwise it is loaded and the snapshot is
+            created. The cache is not used if modflowmodel is passed, and
+            lazy_packages is not used with a cache. (default is None)
+
         Returns
         -------
         mt : flopy.mt3d.mt.Mt3dms
@@ -486,6 +503,14 @@ class Mt3dms(BaseModel):
         >>> mt.ftlfilename = 'example.ftl'
 
         """
+        if cache is not None and modflowmodel is None:
+            # restore the model from its snapshot, or load it and create one
+            kwargs = dict(f=f, version=version, exe_name=exe_name,
+                          verbose=verbose, model_ws=model_ws,
+                          load_only=load_only, forgive=forgive)
+            return ModelSnapshotCache.get(cache, verbose=verbose).load(
+                Mt3dms.load, os.path.join(model_ws, f), model_ws, kwargs)
+
         # test if name file is passed with extension (i.e., is a valid file)
         modelname_extension = None
         if os.path.isfile(os.path.join(model_ws, f)):
@@ -596,10 +621,28 @@ class Mt3dms(BaseModel):
                     "in the ext_unit_dict: " + ','.join(not_found))
 
         # try loading packages in ext_unit_dict
+        if lazy_packages:
+            # packages loaded later are put back in name file order
+            mt._package_order = [pck.name[0]] + [
+                item.package.ftype() for item in ext_unit_dict.values()
+                if item.package is not None and item.filetype in load_only]
+        stub_unit_dict = dict(ext_unit_dict)
         for key, item in ext_unit_dict.items():
             if item.package is not None:
                 if item.filetype in load_only:
-                    if forgive:
+                    if lazy_packages:
+                        # the package is loaded when it is first used
+                        mt._add_package_stub(
+                            item.package.ftype(),
+                            functools.partial(item.package.load,
+                                              item.filename, mt,
+                                              ext_unit_dict=stub_unit_dict),
+                            forgive=forgive)
+                        if mt.verbose:
+                            sys.stdout.write(
+                                '   {:4s} package load...deferred\n'
+                                    .format(item.filetype))
+                    elif forgive:
                         try:
                             pck = item.package.load(item.filename, mt,
                                                     ext_unit_dict=ext_unit_dict)
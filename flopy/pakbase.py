@@ -17,6 +17,7 @@ from numpy.lib.recfunctions import stack_arrays
 
 from .modflow.mfparbc import ModflowParBc as mfparbc
 from .utils import Util2d, Util3d, Transient2d, MfList, check
+from .utils.flopy_io import read_list_records
 
 
 class Package(object):
@@ -222,39 +223,13 @@ class Package(object):
 
         if self.__dict__.get('stress_period_data', None) is not None and \
                         self.name[0] != 'OC':
-            spd_inds_valid = True
             chk = check(self, f=f, verbose=verbose, level=level)
-            spd = getattr(self, 'stress_period_data')
-            for per in spd.data.keys():
-                if isinstance(spd.data[per], np.recarray):
-                    spdata = self.stress_period_data.data[per]
-                    inds = (spdata.k, spdata.i, spdata.j) if self.parent.structured \
-                        else (spdata.node)
-
-                    # General BC checks
-                    # check for valid cell indices
-                    spd_inds_valid = chk._stress_period_data_valid_indices(spdata)
-
-                    # first check for and list nan values
-                    chk._stress_period_data_nans(spdata)
-
-                    if spd_inds_valid:
-                        # next check for BCs in inactive cells
-                        chk._stress_period_data_inactivecells(spdata)
-
-                        # More specific BC checks
-                        # check elevations in the ghb, drain, and riv packages
-                        if self.name[0] in check.bc_stage_names.keys():
-                            # check that bc elevations are above model cell bottoms
-                            # also checks for nan values
-                            elev_name = chk.bc_stage_names[self.name[0]]
-                            botms = self.parent.dis.botm.array[inds]
-                            chk.stress_period_data_values(spdata,
-                                                          spdata[elev_name] < botms,
-                                                          col=elev_name,
-                                                          error_name='BC elevation below cell bottom',
-                                                          error_type='Error')
-
+            # General BC checks of all stress periods: valid cell indices,
+            # nan values and BCs in inactive cells, and for the ghb and
+            # drain packages, elevations above the model cell bottoms
+            chk._stress_period_data_checks(
+                self.stress_period_data,
+                elev_name=chk.bc_stage_names.get(self.name[0]))
             chk.summarize()
 
         # check property values in upw and lpf packages
@@ -629,6 +604,32 @@ class Package(object):
         print('IMPLEMENTATION ERROR: write_file must be overloaded')
         return
 
+    @staticmethod
+    def _load_list_block(lines, current):
+        """
+        Parse the records of a stress period (lines) into the recarray
+        current. The records are parsed in bulk as free format, then as
+        fixed format, and one line at a time if both fail.
+
+        """
+        for free in (True, False):
+            try:
+                return read_list_records(lines, current.dtype, free=free)
+            except Exception:
+                pass
+        for ibnd, line in enumerate(lines):
+            try:
+                t = line.strip().split()
+                current[ibnd] = tuple(t[:len(current.dtype.names)])
+            except:
+                t = []
+                for ivar in range(len(current.dtype.names)):
+                    istart = ivar * 10
+                    istop = istart + 10
+                    t.append(line[istart:istop])
+                current[ibnd] = tuple(t[:len(current.dtype.names)])
+        return current
+
     @staticmethod
     def load(model, pack_type, f, nper=None, pop_key_list=None, check=True,
              unitnumber=None, ext_unit_dict=None):
@@ -751,69 +752,62 @@ class Package(object):
             elif itmp > 0:
                 current = pack_type.get_empty(itmp, aux_names=aux_names,
                                               structured=model.structured)
-                for ibnd in range(itmp):
-                    line = f.readline()
-                    if "open/close" in line.lower():
-                        binary = False
-                        if '(binary)' in line.lower():
-                            binary = True
-                        # need to strip out existing path seps and
-                        # replace current-system path seps
-                        raw = line.strip().split()
-                        fname = raw[1]
-                        if '/' in fname:
-                            raw = fname.split('/')
-                        elif '\\' in fname:
-                            raw = fname.split('\\')
-                        else:
-                            raw = [fname]
-                        fname = os.path.join(*raw)
-                        oc_filename = os.path.join(model.model_ws, fname)
-                        assert os.path.exists(
-                            oc_filename), "Package.load() error: open/close filename " + \
-                                          oc_filename + " not found"
-                        try:
-                            if binary:
-                                dtype2 = []
-                                for name in current.dtype.names:
-                                    dtype2.append((name, np.float32))
-                                dtype2 = np.dtype(dtype2)
-                                d = np.fromfile(oc_filename,
-                                                dtype=dtype2,
-                                                count=itmp)
-                                current = np.array(d, dtype=current.dtype)
-                            else:
-                                #current = np.genfromtxt(oc_filename,
-                                #                         dtype=current.dtype)
-                                #if len(current.shape) == 1:
-                                cd = current.dtype
-                                current = np.loadtxt(oc_filename).transpose()
-                                if current.ndim == 1:
-                                    current = np.atleast_2d(current).transpose()
-                                #current = np.atleast_2d(np.loadtxt(oc_filename,
-                                #                                   dtype=current.dtype)).transpose()
-                                current = np.core.records.fromarrays(current, dtype=cd)
-                            current = current.view(np.recarray)
-                        except Exception as e:
-                            raise Exception(
-                                "Package.load() error loading open/close file " + oc_filename + \
-                                " :" + str(e))
-                        assert current.shape[
-                                   0] == itmp, "Package.load() error: open/close rec array from file " + \
-                                               oc_filename + " shape (" + str(current.shape) + \
-                                               ") does not match itmp: {0:d}".format(
-                                                   itmp)
-                        break
+                line = f.readline()
+                if "open/close" in line.lower():
+                    binary = False
+                    if '(binary)' in line.lower():
+                        binary = True
+                    # need to strip out existing path seps and
+                    # replace current-system path seps
+                    raw = line.strip().split()
+                    fname = raw[1]
+                    if '/' in fname:
+                        raw = fname.split('/')
+                    elif '\\' in fname:
+                        raw = fname.split('\\')
+                    else:
+                        raw = [fname]
+                    fname = os.path.join(*raw)
+                    oc_filename = os.path.join(model.model_ws, fname)
+                    assert os.path.exists(
+                        oc_filename), "Package.load() error: open/close filename " + \
+                                      oc_filename + " not found"
                     try:
-                        t = line.strip().split()
-                        current[ibnd] = tuple(t[:len(current.dtype.names)])
-                    except:
-                        t = []
-                        for ivar in range(len(current.dtype.names)):
-                            istart = ivar * 10
-                            istop = istart + 10
-                            t.append(line[istart:istop])
-                        current[ibnd] = tuple(t[:len(current.dtype.names)])
+                        if binary:
+                            dtype2 = []
+                            for name in current.dtype.names:
+                                dtype2.append((name, np.float32))
+                            dtype2 = np.dtype(dtype2)
+                            d = np.fromfile(oc_filename,
+                                            dtype=dtype2,
+                                            count=itmp)
+                            current = np.array(d, dtype=current.dtype)
+                        else:
+                            #current = np.genfromtxt(oc_filename,
+                            #                         dtype=current.dtype)
+                            #if len(current.shape) == 1:
+                            cd = current.dtype
+                            current = np.loadtxt(oc_filename).transpose()
+                            if current.ndim == 1:
+                                current = np.atleast_2d(current).transpose()
+                            #current = np.atleast_2d(np.loadtxt(oc_filename,
+                            #                                   dtype=current.dtype)).transpose()
+                            current = np.core.records.fromarrays(current, dtype=cd)
+                        current = current.view(np.recarray)
+                    except Exception as e:
+                        raise Exception(
+                            "Package.load() error loading open/close file " + oc_filename + \
+                            " :" + str(e))
+                    assert current.shape[
+                               0] == itmp, "Package.load() error: open/close rec array from file " + \
+                                           oc_filename + " shape (" + str(current.shape) + \
+                                           ") does not match itmp: {0:d}".format(
+                                               itmp)
+                else:
+                    # read the itmp records as one block
+                    lines = [line] + [f.readline()
+                                      for ibnd in range(itmp - 1)]
+                    current = Package._load_list_block(lines, current)
 
                 # convert indices to zero-based
                 if model.structured:
@@ -74,7 +74,13 @@ class Transient2dTpl:
             u2dtpl = Util2dTpl(chararray, u2d.name, multiplier, indexed_param)
             return (1, u2dtpl.get_file_entry())
         else:
-            return self.transient2d.get_kper_entry(kper)
+            itmp, file_entry = self.transient2d.get_kper_entry(kper)
+            if itmp < 0 and kper in self.transient2d.transient_2ds and \
+                    (kper - 1 in self.params or kper - 1 in self.multipliers):
+                # the previous stress period is written as a template
+                itmp = 1
+                file_entry = self.transient2d[kper].get_file_entry()
+            return (itmp, file_entry)
 
 
 class Util3dTpl(object):
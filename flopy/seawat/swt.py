@@ -1,4 +1,5 @@
 import os
+import functools
 from ..mbase import BaseModel
 from ..pakbase import Package
 from ..modflow import Modflow
@@ -209,6 +210,7 @@ class Seawat(BaseModel):
         #return
 
     def change_model_ws(self, new_pth=None, reset_external=False):
+        self._load_package_stubs()
         #if hasattr(self,"_mf"):
         if self._mf is not None:
             self._mf.change_model_ws(new_pth=new_pth,
@@ -219,6 +221,22 @@ class Seawat(BaseModel):
                                      reset_external=reset_external)
         super(Seawat,self).change_model_ws(new_pth=new_pth,
                                            reset_external=reset_external)
+
+    def _load_package_stub(self, model, name):
+        # load a package of the MODFLOW or MT3DMS model loaded with
+        # lazy_packages=True and move it to this model, as load() does.
+        # BAS6 has been moved to this model and reports its free format
+        # flag, the loader has to see the flag of the model it loads into
+        free_format_input = self.free_format_input
+        self.free_format_input = model.free_format_input
+        try:
+            p = model.get_package(name)
+        finally:
+            self.free_format_input = free_format_input
+        if p is not None:
+            p.parent = self
+            self.add_package(p)
+
     def write_name_file(self):
         """
         Write the name file
@@ -314,7 +332,7 @@ class Seawat(BaseModel):
 
     @staticmethod
     def load(f, version='seawat', exe_name='swt_v4', verbose=False,
-             model_ws='.', load_only=None):
+             model_ws='.', load_only=None, lazy_packages=False):
         """
         Load an existing model.
 
@@ -343,6 +361,12 @@ class Seawat(BaseModel):
             Filetype(s) to load (e.g. ['lpf', 'adv'])
             (default is None, which means that all will be loaded)
 
+        lazy_packages : bool
+            If True, only the name file, DIS, BAS6 and BTN are loaded, and
+            each of the other packages is loaded the first time it is used
+            (m.lpf, m.get_package('LPF')), or by write_input() and
+            change_model_ws(). (default is False)
+
         Returns
         -------
         m : flopy.seawat.swt.Seawat
@@ -369,10 +393,11 @@ class Seawat(BaseModel):
 
         mf = Modflow.load(f, version='mf2k', exe_name=None, verbose=verbose,
                           model_ws=model_ws, load_only=load_only, forgive=True,
-                          check=False)
+                          check=False, lazy_packages=lazy_packages)
 
         mt = Mt3dms.load(f, version='mt3dms', exe_name=None, verbose=verbose,
-                         model_ws=model_ws, forgive=True)
+                         model_ws=model_ws, forgive=True,
+                         lazy_packages=lazy_packages)
 
         # set listing and global files using mf objects
         ms.lst = mf.lst
@@ -392,6 +417,15 @@ class Seawat(BaseModel):
             ms._mt = mt
         ms._mf = mf
 
+        # packages that are loaded when they are first used
+        for model in (mf, mt):
+            if model is None:
+                continue
+            for name, load, forgive in model._package_stubs:
+                ms._add_package_stub(name, functools.partial(
+                    ms._load_package_stub, model, name))
+            ms._package_order += model._package_order
+
 
 
         # return model object
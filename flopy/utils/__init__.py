@@ -22,7 +22,7 @@
     """
 from .mfreadnam import parsenamefile
 from .util_array import Util3d, Util2d, Transient2d, Transient3d, read1d
-from .util_list import MfList
+from .util_list import MfList, MfListStore
 from .binaryfile import BinaryHeader, HeadFile, UcnFile, CellBudgetFile, \
     HeadUFile
 from .formattedfile import FormattedHeadFile
@@ -34,12 +34,15 @@ from .reference import SpatialReference, SpatialReferenceUnstructured, \
     crs, TemporalReference
 from .mflistfile import MfListBudget, MfusgListBudget, SwtListBudget, \
     SwrListBudget, Mf6ListBudget
-from .check import check, get_neighbors
+from .check import check, get_neighbors, all_neighbors
 from .utils_def import FlopyBinaryData, totim_to_datetime
 from .flopy_io import read_fixed_var, write_fixed_var
-from .zonbud import ZoneBudget, read_zbarray, write_zbarray
+from .zonbud import ZoneBudget, ZoneBudgetUnstructured, ZoneBudgetPlan, \
+    read_zbarray, write_zbarray
 from .mfgrdfile import MfGrdFile
 from .postprocessing import get_transmissivities
 from .sfroutputfile import SfrFile
 from .recarray_utils import create_empty_recarray, ra_slice
 from .mtlistfile import MtListBudget
+from .snapshot import ModelSnapshotCache
+from .profiler import Profiler, set_profiling, profiling, get_profiler
@@ -13,6 +13,7 @@ import numpy as np
 import warnings
 from collections import OrderedDict
 from ..utils.datafile import Header, LayerFile
+from .profiler import profiled
 
 
 class BinaryHeader(Header):
@@ -322,6 +323,7 @@ class BinaryLayerFile(LayerFile):
         header = binaryread(self.file, self.header_dtype, (1,))
         return header[0]
 
+    @profiled('output')
     def get_ts(self, idx):
         """
         Get a time series from the binary file.
@@ -985,6 +987,7 @@ class CellBudgetFile(object):
             ipos = self.iposarray[idx]
         return ipos
 
+    @profiled('output')
     def get_data(self, idx=None, kstpkper=None, totim=None, text=None,
                  paknam=None, full3D=False):
         """
@@ -1110,6 +1113,7 @@ class CellBudgetFile(object):
 
         return recordlist
 
+    @profiled('output')
     def get_ts(self, idx, text=None, times=None):
         """
         Get a time series from the binary budget file.
@@ -1668,6 +1672,7 @@ class HeadUFile(BinaryLayerFile):
         npl = nend - nstrt + 1
         return npl * np.int64(self.realtype(1).nbytes)
 
+    @profiled('output')
     def get_ts(self, idx):
         """
         Get a time series from the binary HeadUFile (not implemented).
@@ -276,6 +276,70 @@ class check:
         else:
             self.append_passed('not a number (Nan) entries')
 
+    def _stress_period_data_checks(self, stress_period_data, elev_name=None):
+        """Run the general checks of the stress period data of a list
+        package (valid indices, nan values, BCs in inactive cells and BC
+        elevations below the cell bottoms if elev_name is not None) for all
+        stress periods in one pass."""
+        spdata, periods = self.get_all_periods(stress_period_data)
+        if spdata is None:
+            return
+        names = set(spdata.dtype.names)
+        if self.model.has_package('DIS') and \
+                {'k', 'i', 'j'}.intersection(names) != {'k', 'i', 'j'}:
+            self._add_to_summary(type='Error',
+                                 desc='\r    Stress period data missing k, i, j for structured grid.')
+            return
+        elif self.model.has_package('DISU') and 'node' not in names:
+            self._add_to_summary(type='Error',
+                                 desc='\r    Stress period data missing node number for unstructured grid.')
+            return
+
+        # check for BCs indices that are invalid for grid
+        inds = (spdata.k, spdata.i, spdata.j) if self.structured \
+            else (spdata.node)
+        invalid = ~self.isvalid(inds)
+        checks = [(invalid, None, 'invalid BC index', 'Error',
+                   'BC indices valid')]
+
+        # nan values
+        isnan = np.array([np.isnan(spdata[c])
+                          for c in spdata.dtype.names
+                          if not isinstance(spdata.dtype[c], np.object)]).transpose()
+        row_has_nan = np.any(isnan, axis=1) if np.any(isnan) \
+            else np.zeros(len(spdata), dtype=bool)
+        checks.append((row_has_nan, None, 'Not a number', 'Error',
+                       'not a number (Nan) entries'))
+
+        # the other checks skip the periods with invalid indices
+        valid = np.ones(len(spdata), dtype=bool)
+        for p in periods:
+            if invalid[p].any():
+                valid[p] = False
+        if not valid.any():
+            self.stress_period_data_checks(spdata, periods, checks)
+            return
+        if self.structured:
+            inds = tuple(ind[valid] for ind in inds)
+        else:
+            inds = inds[valid]
+
+        # BCs in cells with ibound=0
+        if 'BAS6' in self.model.get_package_list():
+            inactive = np.zeros(len(spdata), dtype=bool)
+            inactive[valid] = self.model.bas6.ibound.array[inds] == 0
+            checks.append((inactive, None, 'BC in inactive cell', 'Warning',
+                           'BC in inactive cells'))
+
+        # BC elevations above the cell bottoms
+        if elev_name is not None:
+            below = np.zeros(len(spdata), dtype=bool)
+            below[valid] = spdata[elev_name][valid] < \
+                           self.model.dis.botm.array[inds]
+            checks.append((below, elev_name, 'BC elevation below cell bottom',
+                           'Error', None))
+        self.stress_period_data_checks(spdata, periods, checks)
+
     def _stress_period_data_inactivecells(self, stress_period_data):
         """Check for and list any stress period data in cells with ibound=0."""
         spd = stress_period_data
@@ -320,6 +384,83 @@ class check:
         tp = [error_type] * len(v)
         return self._get_summary_array(np.column_stack([tp, pn, inds, v, en]))
 
+    def get_all_periods(self, stress_period_data):
+        """Get the stress period data of all stress periods as one record
+        array, for checks of all stress periods in one pass.
+
+        Parameters
+        ----------
+        stress_period_data : MfList
+            Stress period data of a package.
+
+        Returns
+        -------
+        spdata : record array
+            Data of the stress periods with a record array (periods that
+            reuse the data of the previous period are skipped), None if
+            there are no such periods.
+        periods : list of slices
+            Rows of each stress period in spdata.
+        """
+        data = stress_period_data.data
+        arrays = [data[per] for per in data.keys()
+                  if isinstance(data[per], np.recarray)]
+        if len(arrays) == 0:
+            return None, []
+        bounds = np.cumsum([0] + [len(a) for a in arrays])
+        periods = [slice(bounds[i], bounds[i + 1])
+                   for i in range(len(arrays))]
+        if len(arrays) == 1:
+            return arrays[0], periods
+        return np.concatenate(arrays).view(np.recarray), periods
+
+    def stress_period_data_checks(self, spdata, periods, checks):
+        """Add the violations of several checks of the stress period data
+        of all stress periods, evaluated in one pass. The summary is the
+        same as if stress_period_data_values() was called for each check
+        and each stress period.
+
+        Parameters
+        ----------
+        spdata : record array
+            Stress period data of all stress periods (see get_all_periods).
+        periods : list of slices
+            Rows of each stress period in spdata.
+        checks : list of tuples
+            (criteria, col, error_name, error_type, passed) of each check,
+            where criteria is a boolean array that is True for the rows of
+            spdata that violate the check, and passed is the name of the
+            check in the passed list (error_name if passed is None).
+        """
+        if len(checks) == 0:
+            return
+        starts = np.array([p.start for p in periods])
+        stops = np.array([p.stop for p in periods])
+        counts = []
+        for criteria, col, error_name, error_type, passed in checks:
+            total = np.concatenate(([0], np.cumsum(criteria)))
+            counts.append(total[stops] - total[starts])
+            if passed is None:
+                passed = error_name
+            if total[-1] > 0:
+                self.remove_passed(passed)
+            else:
+                self.append_passed(passed)
+        counts = np.array(counts)
+
+        # only the periods with violations are listed
+        sa = [self.summary_array]
+        for n in np.nonzero(counts.sum(axis=0))[0]:
+            p = periods[n]
+            for c, (criteria, col, error_name, error_type, passed) in \
+                    enumerate(checks):
+                if counts[c, n] > 0:
+                    sa.append(self._list_spd_check_violations(
+                        spdata[p], criteria[p], col, error_name=error_name,
+                        error_type=error_type))
+        if len(sa) > 1:
+            self.summary_array = np.concatenate(sa).view(np.recarray)
+
     def append_passed(self, message):
         """Add a check to the passed list if it isn't already in there."""
         self.passed.append(message) if message not in self.passed else None
@@ -588,13 +729,55 @@ def get_neighbors(a):
         Nan is returned for values at edges.
     """
     nk, ni, nj = a.shape
-    tmp = np.empty((nk+2, ni+2, nj+2), dtype=float)
-    tmp[:, :, :] = np.nan
-    tmp[1:-1, 1:-1, 1:-1] = a[:, :, :]
-    neighbors = np.vstack([tmp[0:-2, 1:-1, 1:-1].ravel(), # k-1
-                           tmp[2:, 1:-1, 1:-1].ravel(), # k+1
-                           tmp[1:-1, 0:-2, 1:-1].ravel(), # i-1
-                           tmp[1:-1, 2:, 1:-1].ravel(), # i+1
-                           tmp[1:-1, 1:-1, :-2].ravel(), # j-1
-                           tmp[1:-1, 1:-1, 2:].ravel()]) # j+1
-    return neighbors.reshape(6, nk, ni, nj)
\ No newline at end of file
+    neighbors = np.empty((6, nk, ni, nj), dtype=float)
+    neighbors[:] = np.nan
+    # the neighbors are copied from views of a
+    for n, (target, source) in enumerate(_neighbor_slices()):
+        neighbors[(n,) + target] = a[source]
+    return neighbors
+
+
+def _neighbor_slices():
+    """Returns the (target, source) slices of the 6 neighbors (k-1, k+1,
+    i-1, i+1, j-1, j+1) of a 3-D array; a[source] are the neighbors of the
+    cells a[target]."""
+    slices = []
+    for axis in range(3):
+        lower = [slice(None)] * 3
+        upper = [slice(None)] * 3
+        lower[axis] = slice(None, -1)
+        upper[axis] = slice(1, None)
+        slices.append((tuple(upper), tuple(lower)))  # previous cell
+        slices.append((tuple(lower), tuple(upper)))  # next cell
+    return slices
+
+
+def all_neighbors(a, criteria, edge=True):
+    """Tests criteria for the 6 neighboring values of each value in a.
+    Unlike get_neighbors(), no array of the neighbors is built; criteria
+    is evaluated on views of a.
+
+    Parameters
+    ----------
+    a : 3-D array
+        Model array in layer, row, column order.
+    criteria : callable
+        Function that returns a boolean array for an array of neighboring
+        values, for example lambda v: v < 1.
+    edge : bool
+        Value of criteria for neighbors outside of the grid. (default True)
+
+    Returns
+    -------
+    result : 3-D boolean array
+        True where criteria is True for all 6 neighbors.
+    """
+    nk, ni, nj = a.shape
+    result = np.ones((nk, ni, nj), dtype=bool)
+    for target, source in _neighbor_slices():
+        result[target] &= criteria(a[source])
+    if not edge:
+        result[[0, -1], :, :] = False
+        result[:, [0, -1], :] = False
+        result[:, :, [0, -1]] = False
+    return result
\ No newline at end of file
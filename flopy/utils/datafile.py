@@ -7,6 +7,7 @@ from __future__ import print_function
 import os
 import numpy as np
 import flopy.utils
+from .profiler import profiled
 
 
 class Header(object):
@@ -371,6 +372,7 @@ class LayerFile(object):
             kstpkper.append((kstp - 1, kper - 1))
         return kstpkper
 
+    @profiled('output')
     def get_data(self, kstpkper=None, idx=None, totim=None, mflay=None):
         """
         Get data from the file for the specified conditions.
@@ -428,6 +430,7 @@ class LayerFile(object):
         else:
             return data[mflay, :, :]
 
+    @profiled('output')
     def get_alldata(self, mflay=None, nodata=-9999):
         """
         Get all of the data from the file.
@@ -168,6 +168,53 @@ def read_fixed_var(line, ncol=1, length=10, ipos=None, free=False):
             istart = istop
     return out
 
+
+def read_list_records(lines, dtype, free=True, length=10):
+    """
+    Parse a block of list records, e.g. the records of a WEL or GHB
+    stress period, in one pass.
+
+    Parameters
+    ----------
+    lines : list of str
+        lines to parse, one record per line.
+    dtype : np.dtype
+        dtype of the records. Values after the last field are ignored.
+    free : bool
+        boolean indicating if the lines are free format. If False, each
+        field is length characters wide. (default is True)
+    length : int
+        length of each column for fixed column widths. (default is 10)
+
+    Returns
+    -------
+    ra : np.recarray
+        the records, one per line
+
+    Raises
+    ------
+    ValueError
+        if a line doesn't have a valid value for every field
+
+    """
+    dtype = np.dtype(dtype)
+    nfield = len(dtype.names)
+    if free:
+        ra = np.loadtxt(lines, dtype=dtype, usecols=range(nfield), ndmin=1)
+        if ra.shape[0] != len(lines):
+            raise ValueError('read_list_records: {} records '.format(
+                ra.shape[0]) + 'found in {} lines'.format(len(lines)))
+    else:
+        width = nfield * length
+        fields = np.array([line.rstrip('\r\n')[:width].ljust(width)
+                           for line in lines])
+        fields = fields.view('<U{}'.format(length)).reshape(len(lines),
+                                                            nfield)
+        ra = np.empty(len(lines), dtype=dtype)
+        for i, name in enumerate(dtype.names):
+            ra[name] = fields[:, i]
+    return ra.view(np.recarray)
+
 def flux_to_wel(cbc_file,text,precision="single",model=None,verbose=False):
     """
     Convert flux in a binary cell budget file to a wel instance
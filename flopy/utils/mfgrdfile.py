@@ -326,3 +326,32 @@ class MfGrdFile(FlopyBinaryData):
                 msg = 'could not return vertices for {}'.format(self.file.name)
                 raise KeyError(msg)
         return
+
+    def get_connectivity(self):
+        """
+        Get the zero-based IA and JA arrays that define the connectivity
+        between model cells.
+
+        Returns
+        -------
+        ia : np.ndarray
+            Position in ja of the first connection of each model cell
+        ja : np.ndarray
+            Array with the connected cell numbers for every model cell. The
+            first connection of each model cell is the cell itself.
+
+        Examples
+        --------
+        >>> import flopy
+        >>> gobj = flopy.utils.MfGrdFile('test.dis.grb')
+        >>> ia, ja = gobj.get_connectivity()
+
+        """
+        try:
+            ia = self._datadict['IA'].astype(np.int64) - 1
+            ja = self._datadict['JA'].astype(np.int64) - 1
+            return ia, ja
+        except:
+            msg = 'could not return connectivity for ' + \
+                  '{}'.format(self.file.name)
+            raise KeyError(msg)
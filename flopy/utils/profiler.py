@@ -0,0 +1,524 @@
+"""
+profiler module.  Contains the Profiler class, which records the wall time,
+bytes and peak memory allocation of package loads, package writes, Util2d
+array parses and binary output file queries, and the set_profiling() and
+profiling() functions, which switch profiling on and off.
+
+Profiling is off by default, the instrumented functions then only check a
+module variable.
+
+"""
+import os
+import sys
+import time
+import json
+import functools
+import threading
+
+try:
+    import tracemalloc
+except ImportError:
+    # Python 2
+    tracemalloc = None
+
+if sys.version_info >= (3, 3):
+    _clock = time.perf_counter
+else:
+    _clock = time.time
+
+# the active Profiler, None if profiling is off
+_profiler = None
+
+
+class _NullScope(object):
+    # scope of the instrumented functions if profiling is off
+    def __enter__(self):
+        return None
+
+    def __exit__(self, *args):
+        return False
+
+
+_null_scope = _NullScope()
+
+
+class ProfileEvent(object):
+    """
+    A profiled call.
+
+    Attributes
+    ----------
+    category : str
+        'load' (package loads), 'write' (package writes), 'util2d' (Util2d
+        array parses) or 'output' (binary output file queries).
+    name : str
+        Name of the call, for example the package name or the method.
+    start : float
+        Start time in seconds since the profiler was created.
+    elapsed : float
+        Wall time in seconds.
+    nbytes : int
+        Size of the files read or written (package loads and writes) or of
+        the arrays read (Util2d parses and output queries), None if it is
+        not known.
+    peak_bytes : int
+        Peak memory allocated during the call in bytes, None if memory is
+        not traced.
+    depth : int
+        Number of enclosing profiled calls.
+    thread : int
+        Identifier of the thread of the call.
+
+    """
+    __slots__ = ('category', 'name', 'start', 'elapsed', 'nbytes',
+                 'peak_bytes', 'depth', 'thread', 'files', '_mem_start',
+                 '_mem_peak')
+
+    def __init__(self, category, name, start, depth, thread, files=None):
+        self.category = category
+        self.name = name
+        self.start = start
+        self.elapsed = 0.
+        self.nbytes = None
+        self.peak_bytes = None
+        self.depth = depth
+        self.thread = thread
+        self.files = files
+
+    def to_dict(self):
+        return {'category': self.category, 'name': self.name,
+                'start': self.start, 'elapsed': self.elapsed,
+                'nbytes': self.nbytes, 'peak_bytes': self.peak_bytes,
+                'depth': self.depth, 'thread': self.thread}
+
+    def __repr__(self):
+        return 'ProfileEvent({}: {}, {:.6f} s)'.format(self.category,
+                                                      self.name,
+                                                      self.elapsed)
+
+
+class _Scope(object):
+    # records a ProfileEvent of a with statement
+    def __init__(self, profiler, category, name, files):
+        self.profiler = profiler
+        self.category = category
+        self.name = name
+        self.files = files
+        self.event = None
+
+    def __enter__(self):
+        self.event = self.profiler._start(self.category, self.name,
+                                          self.files)
+        return self.event
+
+    def __exit__(self, *args):
+        self.profiler._stop(self.event)
+        return False
+
+
+class Profiler(object):
+    """
+    Records the profiled calls while profiling is on.
+
+    Parameters
+    ----------
+    memory : bool
+        Trace the peak memory allocated by each call with tracemalloc.
+        Tracing memory slows down Python allocations, numpy arrays are
+        included. (default is True, requires Python 3.9 or later)
+
+    Attributes
+    ----------
+    events : list of ProfileEvent
+        The profiled calls in the order they finished.
+
+    Notes
+    -----
+    The peak memory of a call is the peak of the traced memory of the
+    process while it runs, minus the traced memory at its start. The peaks
+    of calls in threads (for example packages loaded with n_workers) are
+    approximate, the traced memory includes the other threads.
+
+    Examples
+    --------
+
+    >>> import flopy
+    >>> with flopy.profiling() as profiler:
+    ...     ml = flopy.modflow.Modflow.load('model.nam')
+    >>> profiler.get_summary()['load']['LPF']['elapsed']
+    0.0213
+    >>> profiler.write_chrome_trace('load.json')
+
+    """
+
+    def __init__(self, memory=True):
+        self.memory = memory and hasattr(tracemalloc, 'reset_peak')
+        self.events = []
+        self._t0 = _clock()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._started_tracing = False
+
+    def start(self):
+        """
+        Start memory tracing, if it is not on.
+
+        """
+        if self.memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+
+    def stop(self):
+        """
+        Stop memory tracing, if it was started by start().
+
+        """
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    def clear(self):
+        """
+        Remove the recorded calls.
+
+        """
+        with self._lock:
+            self.events = []
+
+    def scope(self, category, name, files=None):
+        """
+        Context manager that records a call, the with statement gets the
+        ProfileEvent.
+
+        Parameters
+        ----------
+        category : str
+            Category of the call.
+        name : str
+            Name of the call.
+        files : list of str
+            Files read or written by the call, their total size is the
+            nbytes of the event. (default is None)
+
+        """
+        return _Scope(self, category, name, files)
+
+    def _start(self, category, name, files):
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        event = ProfileEvent(category, name, _clock() - self._t0,
+                             len(stack), threading.current_thread().ident,
+                             files)
+        event._mem_start = None
+        if self.memory and tracemalloc.is_tracing():
+            current, peak = tracemalloc.get_traced_memory()
+            if stack and stack[-1]._mem_start is not None:
+                # the peak of the enclosing call so far
+                stack[-1]._mem_peak = max(stack[-1]._mem_peak, peak)
+            tracemalloc.reset_peak()
+            event._mem_start = current
+            event._mem_peak = current
+        stack.append(event)
+        return event
+
+    def _stop(self, event):
+        event.elapsed = _clock() - self._t0 - event.start
+        stack = self._local.stack
+        stack.pop()
+        if event._mem_start is not None and tracemalloc.is_tracing():
+            peak = max(event._mem_peak, tracemalloc.get_traced_memory()[1])
+            event.peak_bytes = max(peak - event._mem_start, 0)
+            if stack and stack[-1]._mem_start is not None:
+                stack[-1]._mem_peak = max(stack[-1]._mem_peak, peak)
+        if event.files is not None:
+            event.nbytes = _file_bytes(event.files)
+            event.files = None
+        with self._lock:
+            self.events.append(event)
+
+    def get_events(self, category=None):
+        """
+        Get the recorded calls as dicts.
+
+        Parameters
+        ----------
+        category : str
+            Only get the calls of this category. (default is None, all
+            calls)
+
+        Returns
+        -------
+        events : list of dict
+            Dicts with the keys category, name, start, elapsed, nbytes,
+            peak_bytes, depth and thread, in the order of the start times.
+
+        """
+        with self._lock:
+            events = list(self.events)
+        return [event.to_dict() for event in
+                sorted(events, key=lambda event: event.start)
+                if category is None or event.category == category]
+
+    def get_summary(self):
+        """
+        Get the totals of the recorded calls by category and name.
+
+        Returns
+        -------
+        summary : dict
+            {category: {name: totals}}, the totals are dicts with the keys
+            count, elapsed (total wall time), nbytes (total bytes, None if
+            not known) and peak_bytes (largest peak allocation, None if
+            memory is not traced).
+
+        """
+        summary = {}
+        for event in self.get_events():
+            names = summary.setdefault(event['category'], {})
+            totals = names.setdefault(event['name'], {'count': 0,
+                                                      'elapsed': 0.,
+                                                      'nbytes': None,
+                                                      'peak_bytes': None})
+            totals['count'] += 1
+            totals['elapsed'] += event['elapsed']
+            if event['nbytes'] is not None:
+                totals['nbytes'] = (totals['nbytes'] or 0) + event['nbytes']
+            if event['peak_bytes'] is not None:
+                totals['peak_bytes'] = max(totals['peak_bytes'] or 0,
+                                           event['peak_bytes'])
+        return summary
+
+    def get_dataframe(self, summary=False):
+        """
+        Get the recorded calls, or their totals, as a pandas DataFrame.
+
+        Parameters
+        ----------
+        summary : bool
+            Get the totals by category and name (see get_summary()).
+            (default is False, a row for each call)
+
+        Returns
+        -------
+        df : pandas.DataFrame
+
+        """
+        try:
+            import pandas as pd
+        except ImportError:
+            raise ImportError('Profiler.get_dataframe: pandas not available')
+        columns = ['category', 'name', 'count', 'elapsed', 'nbytes',
+                   'peak_bytes']
+        if not summary:
+            return pd.DataFrame(self.get_events(),
+                                columns=['category', 'name', 'start',
+                                         'elapsed', 'nbytes', 'peak_bytes',
+                                         'depth', 'thread'])
+        rows = [dict(totals, category=category, name=name)
+                for category, names in sorted(self.get_summary().items())
+                for name, totals in sorted(names.items())]
+        return pd.DataFrame(rows, columns=columns)
+
+    def get_chrome_trace(self):
+        """
+        Get the recorded calls in the Chrome trace event format, which can
+        be viewed in chrome://tracing or https://ui.perfetto.dev.
+
+        Returns
+        -------
+        trace : dict
+
+        """
+        pid = os.getpid()
+        events = []
+        for event in self.get_events():
+            events.append({'name': event['name'], 'cat': event['category'],
+                           'ph': 'X', 'ts': event['start'] * 1e6,
+                           'dur': event['elapsed'] * 1e6, 'pid': pid,
+                           'tid': event['thread'],
+                           'args': {'nbytes': event['nbytes'],
+                                    'peak_bytes': event['peak_bytes']}})
+        return {'traceEvents': events, 'displayTimeUnit': 'ms'}
+
+    def write_chrome_trace(self, fname):
+        """
+        Write the recorded calls to a Chrome trace JSON file.
+
+        Parameters
+        ----------
+        fname : str
+            Path of the file.
+
+        """
+        with open(fname, 'w') as f:
+            json.dump(self.get_chrome_trace(), f)
+
+
+def _file_bytes(files):
+    # total size of the files that exist
+    nbytes = 0
+    for fname in files:
+        try:
+            nbytes += os.path.getsize(fname)
+        except (OSError, TypeError):
+            pass
+    return nbytes
+
+
+def _nbytes(result):
+    # size of the arrays of the result of a call
+    if hasattr(result, 'nbytes'):
+        return int(result.nbytes)
+    if isinstance(result, (list, tuple)):
+        sizes = [_nbytes(item) for item in result]
+        if sizes and None not in sizes:
+            return sum(sizes)
+    return None
+
+
+def get_profiler():
+    """
+    Get the active Profiler, None if profiling is off.
+
+    """
+    return _profiler
+
+
+def set_profiling(enabled=True, memory=True):
+    """
+    Switch profiling of package loads, package writes, Util2d array parses
+    and binary output file queries on or off.
+
+    Parameters
+    ----------
+    enabled : bool
+        Switch profiling on (a new Profiler records the calls) or off.
+        (default is True)
+    memory : bool
+        Trace the peak memory allocated by each call. (default is True)
+
+    Returns
+    -------
+    profiler : Profiler
+        The new Profiler if profiling is switched on, the Profiler that
+        was active (or None) if profiling is switched off.
+
+    Examples
+    --------
+
+    >>> import flopy
+    >>> profiler = flopy.set_profiling(True)
+    >>> ml.write_input()
+    >>> flopy.set_profiling(False)
+    >>> profiler.get_dataframe(summary=True)
+
+    """
+    global _profiler
+    previous = _profiler
+    if previous is not None:
+        previous.stop()
+    if not enabled:
+        _profiler = None
+        return previous
+    profiler = Profiler(memory=memory)
+    profiler.start()
+    _profiler = profiler
+    return profiler
+
+
+class profiling(object):
+    """
+    Context manager that profiles the statements of a with statement, see
+    set_profiling(). The with statement gets the Profiler. Profiling is
+    restored to its previous state afterwards.
+
+    Parameters
+    ----------
+    memory : bool
+        Trace the peak memory allocated by each call. (default is True)
+
+    Examples
+    --------
+
+    >>> import flopy
+    >>> with flopy.profiling() as profiler:
+    ...     hds = flopy.utils.HeadFile('model.hds')
+    ...     ts = hds.get_ts((0, 10, 10))
+    >>> profiler.get_events('output')
+
+    """
+
+    def __init__(self, memory=True):
+        self.memory = memory
+        self.profiler = None
+        self.previous = None
+
+    def __enter__(self):
+        global _profiler
+        self.previous = _profiler
+        self.profiler = Profiler(memory=self.memory)
+        self.profiler.start()
+        _profiler = self.profiler
+        return self.profiler
+
+    def __exit__(self, *args):
+        global _profiler
+        self.profiler.stop()
+        _profiler = self.previous
+        return False
+
+
+def scope(category, name, files=None):
+    """
+    Context manager that records a call if profiling is on, see
+    Profiler.scope(). The with statement gets the ProfileEvent, or None if
+    profiling is off.
+
+    """
+    profiler = _profiler
+    if profiler is None:
+        return _null_scope
+    return _Scope(profiler, category, name, files)
+
+
+def profiled(category, name=None, nbytes=_nbytes):
+    """
+    Decorator that records the calls of a function if profiling is on.
+
+    Parameters
+    ----------
+    category : str
+        Category of the calls.
+    name : callable
+        Called with the arguments of the function to get the name of a
+        call. (default is None, the class name of the first argument and
+        the function name)
+    nbytes : callable
+        Called with the result of the function to get the nbytes of a
+        call. (default is the size of the arrays of the result)
+
+    """
+
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            profiler = _profiler
+            if profiler is None:
+                return func(*args, **kwargs)
+            if name is not None:
+                label = name(*args, **kwargs)
+            elif args:
+                label = '{}.{}'.format(type(args[0]).__name__,
+                                       func.__name__)
+            else:
+                label = func.__name__
+            with _Scope(profiler, category, label, None) as event:
+                result = func(*args, **kwargs)
+                if nbytes is not None:
+                    event.nbytes = nbytes(result)
+            return result
+
+        return wrapper
+
+    return decorator
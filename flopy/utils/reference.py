@@ -1054,6 +1054,7 @@ class SpatialReference(object):
             filename = '.'.join(
                 filename.split('.')[:-1]) + '.asc'  # enforce .asc ending
             nrow, ncol = a.shape
+            a = a.copy()
             a[np.isnan(a)] = nodata
             txt = 'ncols  {:d}\n'.format(ncol)
             txt += 'nrows  {:d}\n'.format(nrow)
@@ -0,0 +1,285 @@
+"""
+snapshot module.  Contains the ModelSnapshotCache class, which stores loaded
+models in a cache directory and restores them as long as their input files
+have not changed.
+
+"""
+import os
+import re
+import sys
+import json
+import shutil
+import pickle
+import hashlib
+import numpy as np
+
+from ..version import __version__
+
+# file references in input files that are read by the model loaders, the
+# patterns are matched in lower case text (literal prefixes are fast)
+_file_refs = [re.compile(br'open/close\s+[\'"]?([^\s\'"]+)'),
+              re.compile(br'filein\s+[\'"]?([^\s\'"]+)')]
+
+# name file entries that are not read by the model loaders
+_skip_entries = ('LIST', 'GLOBAL', 'FTL')
+
+
+class _SnapshotPickler(pickle.Pickler):
+    # pickles a model, its larger arrays are saved as .npy files
+    def __init__(self, f, path, min_bytes):
+        pickle.Pickler.__init__(self, f, pickle.HIGHEST_PROTOCOL)
+        self.path = path
+        self.min_bytes = max(min_bytes, 1)
+        self.arrays = {}
+
+    def persistent_id(self, obj):
+        if type(obj) not in (np.ndarray, np.recarray):
+            return None
+        if obj.dtype.hasobject or obj.nbytes < self.min_bytes:
+            return None
+        key = id(obj)
+        if key not in self.arrays:
+            fname = 'array{}.npy'.format(len(self.arrays))
+            np.save(os.path.join(self.path, fname), obj, allow_pickle=False)
+            # keep the array, so that its id is not reused
+            self.arrays[key] = (fname, obj)
+        return 'npy', self.arrays[key][0], type(obj) is np.recarray
+
+
+class _SnapshotUnpickler(pickle.Unpickler):
+    # restores a model pickled by _SnapshotPickler, its .npy files are
+    # memory-mapped copy-on-write, so changes are not written to the cache
+    def __init__(self, f, path):
+        pickle.Unpickler.__init__(self, f)
+        self.path = path
+        self.arrays = {}
+
+    def persistent_load(self, pid):
+        kind, fname, isrec = pid
+        a = self.arrays.get(fname)
+        if a is None:
+            a = np.load(os.path.join(self.path, fname), mmap_mode='c')
+            a = a.view(np.recarray) if isrec else a.view(np.ndarray)
+            self.arrays[fname] = a
+        return a
+
+
+class ModelSnapshotCache(object):
+    """
+    Cache of loaded models.
+
+    A model is stored in a snapshot directory of cache_ws after it has been
+    loaded: the model object is pickled, and its larger arrays are saved as
+    .npy files, which are memory-mapped when the model is restored. The
+    snapshot records the size, modification time and SHA-1 hash of the name
+    file and of the input files it refers to (package files, DATA files
+    and OPEN/CLOSE and FILEIN files), and it is only used while none of
+    them have changed.
+
+    Parameters
+    ----------
+    cache_ws : str
+        Path of the cache directory. It is created if it does not exist.
+    min_bytes : int
+        Arrays of at least min_bytes bytes are saved as .npy files, smaller
+        arrays are pickled with the model. (default is 4096)
+    verbose : bool
+        Print a message when a snapshot is restored, created or out of date.
+        (default is False)
+
+    Notes
+    -----
+    The snapshots are pickle files, only use cache directories you trust.
+
+    A changed modification time alone does not invalidate a snapshot, the
+    file is hashed and compared with the hash in the snapshot.
+
+    Changes of the restored arrays are not written to the .npy files, the
+    arrays are mapped copy-on-write.
+
+    Examples
+    --------
+
+    >>> import flopy
+    >>> ml = flopy.modflow.Modflow.load('model.nam', cache='flopy_cache')
+
+    """
+
+    def __init__(self, cache_ws, min_bytes=4096, verbose=False):
+        self.cache_ws = cache_ws
+        self.min_bytes = min_bytes
+        self.verbose = verbose
+
+    @staticmethod
+    def get(cache, verbose=False):
+        """
+        Get the ModelSnapshotCache of the cache argument of a model loader,
+        a ModelSnapshotCache or the path of a cache directory.
+
+        """
+        if isinstance(cache, ModelSnapshotCache):
+            return cache
+        return ModelSnapshotCache(cache, verbose=verbose)
+
+    def load(self, func, namefile, model_ws, kwargs):
+        """
+        Restore a model from its snapshot, or load it and create the
+        snapshot.
+
+        Parameters
+        ----------
+        func : callable
+            Model loader, called as func(**kwargs) if there is no snapshot
+            or the snapshot is out of date.
+        namefile : str
+            Path of the name file of the model.
+        model_ws : str
+            Model workspace. The file names in the name file and in the
+            OPEN/CLOSE and FILEIN records are relative to it.
+        kwargs : dict
+            Arguments of func. Loads with different arguments are stored
+            in separate snapshots.
+
+        Returns
+        -------
+        model : the model restored or loaded
+
+        """
+        path = self.get_snapshot_path(func, namefile, model_ws, kwargs)
+        model = self._restore(path)
+        if model is not None:
+            return model
+        model = func(**kwargs)
+        try:
+            self._save(path, model, namefile, model_ws)
+        except Exception as e:
+            # the model is loaded, just not cached
+            if self.verbose:
+                print('could not create model snapshot {}\n   {!s}'
+                      .format(path, e))
+        return model
+
+    def get_snapshot_path(self, func, namefile, model_ws, kwargs):
+        """
+        Get the path of the snapshot directory of a model load.
+
+        """
+        key = repr([getattr(func, '__module__', None),
+                    getattr(func, '__name__', None),
+                    os.path.abspath(namefile), model_ws,
+                    sorted(kwargs.items()), __version__,
+                    sys.version_info[0]])
+        name = hashlib.sha1(key.encode('utf-8')).hexdigest()
+        return os.path.join(self.cache_ws, name)
+
+    def _restore(self, path):
+        index = os.path.join(path, 'snapshot.json')
+        if not os.path.isfile(index):
+            return None
+        with open(index, 'r') as f:
+            inputs = json.load(f)['inputs']
+        for fname, size, mtime, sha1 in inputs:
+            if not _is_unchanged(fname, size, mtime, sha1):
+                if self.verbose:
+                    print('model snapshot {} is out of date, {} has '
+                          'changed'.format(path, fname))
+                return None
+        with open(os.path.join(path, 'model.pkl'), 'rb') as f:
+            model = _SnapshotUnpickler(f, path).load()
+        if self.verbose:
+            print('model restored from snapshot {}'.format(path))
+        return model
+
+    def _save(self, path, model, namefile, model_ws):
+        # model attributes may be looked up as packages, which are None
+        output_fnames = getattr(model, 'output_fnames', None) or []
+        outputs = [os.path.normpath(os.path.join(model_ws, fname))
+                   for fname in output_fnames]
+        inputs = _input_files(namefile, model_ws, outputs)
+        tmp = path + '.tmp'
+        shutil.rmtree(tmp, ignore_errors=True)
+        os.makedirs(tmp)
+        try:
+            with open(os.path.join(tmp, 'model.pkl'), 'wb') as f:
+                _SnapshotPickler(f, tmp, self.min_bytes).dump(model)
+            # the index is written last, a snapshot without it is not used
+            with open(os.path.join(tmp, 'snapshot.json'), 'w') as f:
+                json.dump({'flopy': __version__, 'inputs': inputs}, f)
+            shutil.rmtree(path, ignore_errors=True)
+            os.rename(tmp, path)
+        except:
+            shutil.rmtree(tmp, ignore_errors=True)
+            raise
+        if self.verbose:
+            print('model snapshot {} created'.format(path))
+
+
+def _is_unchanged(fname, size, mtime, sha1):
+    # check a file against its record in a snapshot, the file is only
+    # hashed if its modification time has changed
+    try:
+        st = os.stat(fname)
+    except OSError:
+        return False
+    if st.st_size != size:
+        return False
+    if st.st_mtime == mtime:
+        return True
+    return _hash_file(fname)[0] == sha1
+
+
+def _hash_file(fname, scan=False):
+    # return the SHA-1 hash of a file, and the text of the file if scan is
+    # True and it is not a binary file
+    h = hashlib.sha1()
+    text = None
+    with open(fname, 'rb') as f:
+        data = f.read(1 << 20)
+        if scan and b'\0' not in data[:1024]:
+            data += f.read()
+            text = data
+        while data:
+            h.update(data)
+            data = f.read(1 << 20)
+    return h.hexdigest(), text
+
+
+def _input_files(namefile, model_ws, outputs=()):
+    """
+    Get the records of the name file and of the input files it refers to,
+    as lists of path, size, modification time and SHA-1 hash.
+
+    """
+    namefile = os.path.normpath(os.path.abspath(namefile))
+    outputs = set(os.path.abspath(fname) for fname in outputs)
+    seen = set([namefile])
+    queue = [namefile]
+    inputs = []
+    while queue:
+        fname = queue.pop(0)
+        st = os.stat(fname)
+        sha1, text = _hash_file(fname, scan=True)
+        inputs.append([fname, st.st_size, st.st_mtime, sha1])
+        if text is None:
+            continue
+        lower = text.lower()
+        refs = [text[m.start(1):m.end(1)].decode('utf-8', 'replace')
+                for pattern in _file_refs for m in pattern.finditer(lower)]
+        if fname.lower().endswith('.nam'):
+            # all entries of a name file that are not output files
+            for line in text.decode('utf-8', 'replace').splitlines():
+                items = line.split()
+                if not items or items[0].startswith('#'):
+                    continue
+                if items[0].upper() in _skip_entries or \
+                        items[-1].upper() == 'REPLACE':
+                    continue
+                refs += [item.strip('\'"') for item in items[1:]]
+        for ref in refs:
+            ref = os.path.normpath(os.path.abspath(os.path.join(model_ws,
+                                                                ref)))
+            if ref in seen or ref in outputs or not os.path.isfile(ref):
+                continue
+            seen.add(ref)
+            queue.append(ref)
+    return inputs
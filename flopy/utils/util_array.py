@@ -9,12 +9,16 @@ from __future__ import division, print_function
 # from future.utils import with_metaclass
 
 import os
+import re
 import shutil
 import copy
+import hashlib
 import numpy as np
+import warnings
 from warnings import warn
 from ..utils.binaryfile import BinaryHeader
 from ..utils.flopy_io import line_parse
+from ..utils.profiler import profiled
 
 
 class ArrayFormat(object):
@@ -421,6 +425,79 @@ def read1d(f, a):
     return a
 
 
+def _readonly_view(a):
+    """
+    Return a view of array a that can not be modified.
+    """
+    a = a.view()
+    a.flags.writeable = False
+    return a
+
+
+def _share_equal_arrays(u2ds):
+    """
+    Let Util2d instances with equal value arrays share one array, so that
+    the values of, e.g., repeated stress periods are only stored once.
+
+    """
+    first = {}
+    for u2d in u2ds:
+        digest = u2d._get_digest()
+        if digest is None:
+            continue
+        if digest in first:
+            u2d._share_value(first[digest])
+        else:
+            first[digest] = u2d
+
+
+def _get_shared_file_entry(u2d, earlier):
+    """
+    Get the control record that reads the value array of u2d from the file
+    of the first of the earlier Util2d instances that shares it, or None.
+
+    """
+    for source in earlier:
+        if u2d._shares_value(source):
+            return u2d._get_shared_file_entry(source)
+    return None
+
+
+def _write_array_file(binary, shape, fname, data, fortran_format):
+    """
+    Write the external file of a Util2d array, in this process or in a
+    worker process of BaseModel.write_input(n_workers=...).
+
+    """
+    if binary:
+        Util2d.write_bin(shape, fname, data, bintype="head")
+    else:
+        Util2d.write_txt(shape, fname, data, fortran_format=fortran_format)
+
+
+def _array_file_fingerprint(binary, shape, fname, data, fortran_format):
+    """
+    Hash of the arguments of _write_array_file(), used by
+    BaseModel.write_input(incremental=True) to skip unchanged array files.
+
+    """
+    data = np.ascontiguousarray(data)
+    h = hashlib.sha1(repr((binary, tuple(shape), fname, fortran_format,
+                           data.dtype.str, data.shape)).encode('utf-8'))
+    h.update(data.reshape(-1).view(np.uint8))
+    return h.hexdigest()
+
+
+def _load_event_name(f_handle, model, shape, dtype, name, *args, **kwargs):
+    # name of the profiled calls of Util2d.load()
+    return name
+
+
+def _load_event_nbytes(u2d):
+    # array size of the profiled calls of Util2d.load()
+    return int(np.prod(u2d.shape)) * np.dtype(u2d.dtype).itemsize
+
+
 def new_u2d(old_util2d, value):
     new_util2d = Util2d(old_util2d.model, old_util2d.shape, old_util2d.dtype,
                         value, old_util2d.name, old_util2d.format.fortran,
@@ -508,7 +585,7 @@ class Util3d(object):
             self.array_free_format = array_free_format
             for i, u2d in enumerate(self.util_2ds):
                 self.util_2ds[i] = Util2d(model, u2d.shape, u2d.dtype,
-                                          u2d._array, name=u2d.name,
+                                          u2d._lazy_array, name=u2d.name,
                                           fmtin=u2d.format.fortran,
                                           locat=locat,
                                           cnstnt=u2d.cnstnt,
@@ -558,6 +635,8 @@ class Util3d(object):
                     append(self.name_base[k].replace(' ', '_'))
 
         self.util_2ds = self.build_2d_instances()
+        self.__array = None
+        self.__array_key = []
 
     def __setitem__(self, k, value):
         if isinstance(k, int):
@@ -585,6 +664,13 @@ class Util3d(object):
             # set the attribute for u3d
             super(Util3d, self).__setattr__(key, value)
 
+    def __getstate__(self):
+        # the array built by _get_array() is not part of the state
+        state = self.__dict__.copy()
+        state['_Util3d__array'] = None
+        state['_Util3d__array_key'] = []
+        return state
+
     def export(self, f, **kwargs):
         from flopy import export
         return export.utils.util3d_helper(f, self, **kwargs)
@@ -750,23 +836,44 @@ class Util3d(object):
         Return a numpy array of the 3D shape.  If an unstructured model, then
         return an array of size nodes.
 
+        The array is built once and kept until one of the layers changes,
+        or the _array of a layer is accessed to change it in place. It can
+        not be modified, use array_copy() to get a copy that can be.
+
+        '''
+        return _readonly_view(self._get_array())
+
+    def array_copy(self):
         '''
+        Return a copy of array that can be modified.
+
+        '''
+        return self._get_array().copy()
+
+    def _get_array(self):
+        arrays = [u2d._get_array() for u2d in self.util_2ds]
+        if self.__array is not None and len(arrays) == len(self.__array_key) \
+                and all(a is b for a, b in zip(arrays, self.__array_key)):
+            return self.__array
         nlay, nrow, ncol = self.shape
         if nrow is not None:
             # typical 3D case
             a = np.empty((self.shape), dtype=self.dtype)
             # for i,u2d in self.uds:
-            for i, u2d in enumerate(self.util_2ds):
-                a[i] = u2d.array
+            for i, u2d_array in enumerate(arrays):
+                a[i] = u2d_array
         else:
             # unstructured case
             nodes = ncol.sum()
             a = np.empty((nodes), dtype=self.dtype)
             istart = 0
-            for i, u2d in enumerate(self.util_2ds):
+            for i, u2d_array in enumerate(arrays):
                 istop = istart + ncol[i]
-                a[istart:istop] = u2d.array
+                a[istart:istop] = u2d_array
                 istart = istop
+        a.flags.writeable = False
+        self.__array = a
+        self.__array_key = arrays
         return a
 
     def build_2d_instances(self):
@@ -944,6 +1051,12 @@ class Transient3d(object):
 
     Notes
     -----
+    Layers with equal arrays share one array, so memory scales
+    with the number of unique arrays. A stress period is written with
+    itmp = -1 if it has the same arrays as the previous entry, and
+    OPEN/CLOSE entries of repeated arrays read the file written for the
+    first stress period with that array. Change the array of a stress
+    period by assignment (e.g. t3d[kper] = value) rather than in place.
 
     Examples
     --------
@@ -975,6 +1088,7 @@ class Transient3d(object):
         self.locat = locat
         self.array_free_format = array_free_format
         self.transient_3ds = self.build_transient_sequence()
+        self._share_equal_arrays()
         return
 
     def __setattr__(self, key, value):
@@ -1013,6 +1127,14 @@ class Transient3d(object):
                                                                        nper))
 
         self.transient_3ds[key] = self.__get_3d_instance(key, value)
+        self._share_equal_arrays()
+
+    def _share_equal_arrays(self):
+        """
+        Let layers with equal arrays share one array (copy-on-write).
+        """
+        _share_equal_arrays([u2d for kper in sorted(self.transient_3ds)
+                             for u2d in self.transient_3ds[kper].util_2ds])
 
     @property
     def array(self):
@@ -1030,12 +1152,25 @@ class Transient3d(object):
         returns (itmp,file entry string from Util3d)
         """
         if kper in self.transient_3ds:
+            u3d = self.transient_3ds[kper]
+            keys = sorted(k for k in self.transient_3ds if k < kper)
+            if len(keys) > 0:
+                previous = self.transient_3ds[keys[-1]]
+                if all(u3d[k]._same_array(previous[k])
+                       for k in range(self.shape[0])):
+                    # reuse the arrays of the previous stress period
+                    return -1, ''
+            earlier = [u2d for key in keys
+                       for u2d in self.transient_3ds[key].util_2ds]
             s = ''
             for k in range(self.shape[0]):
-                s += self.transient_3ds[kper][k].get_file_entry()
+                entry = _get_shared_file_entry(u3d[k], earlier)
+                if entry is None:
+                    entry = u3d[k].get_file_entry()
+                s += entry
             return 1, s
         elif kper < min(self.transient_3ds.keys()):
-            t = self.get_zero_3d(kper).get_file_entry()
+            t = self.get_zero_3d(kper)
             s = ''
             for k in range(self.shape[0]):
                 s += t[k].get_file_entry()
@@ -1165,6 +1300,12 @@ class Transient2d(object):
 
     Notes
     -----
+    Stress periods with equal arrays share one array, so memory scales
+    with the number of unique arrays. A stress period is written with
+    itmp = -1 if it has the same array as the previous entry, and
+    OPEN/CLOSE entries of repeated arrays read the file written for the
+    first stress period with that array. Change the array of a stress
+    period by assignment (e.g. t2d[kper] = value) rather than in place.
 
     Examples
     --------
@@ -1180,7 +1321,8 @@ class Transient2d(object):
                 setattr(self, attr[0], attr[1])
             for kper, u2d in self.transient_2ds.items():
                 self.transient_2ds[kper] = Util2d(model, u2d.shape, u2d.dtype,
-                                                  u2d._array, name=u2d.name,
+                                                  u2d._get_value_array(),
+                                                  name=u2d.name,
                                                   fmtin=u2d.format.fortran,
                                                   locat=locat,
                                                   cnstnt=u2d.cnstnt,
@@ -1215,6 +1357,9 @@ class Transient2d(object):
         else:
             self.ext_filename_base = self.name_base.replace(' ', '_')
         self.transient_2ds = self.build_transient_sequence()
+        self._share_equal_arrays()
+        self.__array = None
+        self.__array_key = []
         return
 
     @staticmethod
@@ -1280,6 +1425,13 @@ class Transient2d(object):
         # set the attribute for u3d, even for cnstnt
         super(Transient2d, self).__setattr__(key, value)
 
+    def __getstate__(self):
+        # the array built by _get_array() is not part of the state
+        state = self.__dict__.copy()
+        state['_Transient2d__array'] = None
+        state['_Transient2d__array_key'] = []
+        return state
+
     def get_zero_2d(self, kper):
         name = self.name_base + str(kper + 1) + '(filled zero)'
         return Util2d(self.model, self.shape,
@@ -1469,14 +1621,50 @@ class Transient2d(object):
                                                                        nper))
 
         self.transient_2ds[key] = self.__get_2d_instance(key, value)
+        self._share_equal_arrays()
+
+    def _share_equal_arrays(self):
+        """
+        Let stress periods with equal arrays share one array (copy-on-write).
+        """
+        _share_equal_arrays([self.transient_2ds[kper]
+                             for kper in sorted(self.transient_2ds)])
 
     @property
     def array(self):
+        """
+        Return a numpy array of shape (nper, 1, nrow, ncol).
+
+        The array is built once and kept until one of the stress periods
+        changes. It can not be modified, use array_copy() to get a copy
+        that can be.
+
+        """
+        return _readonly_view(self._get_array())
+
+    def array_copy(self):
+        """
+        Return a copy of array that can be modified.
+
+        """
+        return self._get_array().copy()
+
+    def _get_array(self):
+        # stress periods before the first entry are filled with zeros
+        first = min(self.transient_2ds.keys())
+        arrays = [None if kper < first else self[kper]._get_array()
+                  for kper in range(self.model.nper)]
+        if self.__array is not None and len(arrays) == len(self.__array_key) \
+                and all(a is b for a, b in zip(arrays, self.__array_key)):
+            return self.__array
         arr = np.zeros((self.model.nper, 1, self.shape[0], self.shape[1]),
                        dtype=self.dtype)
-        for kper in range(self.model.nper):
-            u2d = self[kper]
-            arr[kper, 0, :, :] = u2d.array
+        for kper, u2d_array in enumerate(arrays):
+            if u2d_array is not None:
+                arr[kper, 0, :, :] = u2d_array
+        arr.flags.writeable = False
+        self.__array = arr
+        self.__array_key = arrays
         return arr
 
     def export(self, f, **kwargs):
@@ -1489,7 +1677,16 @@ class Transient2d(object):
         returns (itmp,file entry string from Util2d)
         """
         if kper in self.transient_2ds:
-            return (1, self.transient_2ds[kper].get_file_entry())
+            u2d = self.transient_2ds[kper]
+            earlier = [self.transient_2ds[k]
+                       for k in sorted(self.transient_2ds) if k < kper]
+            if len(earlier) > 0 and u2d._same_array(earlier[-1]):
+                # reuse the array of the previous stress period
+                return (-1, '')
+            entry = _get_shared_file_entry(u2d, earlier)
+            if entry is None:
+                entry = u2d.get_file_entry()
+            return (1, entry)
         elif kper < min(self.transient_2ds.keys()):
             return (1, self.get_zero_2d(kper).get_file_entry())
         else:
@@ -1557,6 +1754,96 @@ class Transient2d(object):
         return u2d
 
 
+class _DeferredArray(object):
+    """
+    Location of a 1- or 2-D array in a model input file that is read
+    on first access (see Modflow.load(..., lazy_arrays=True)).
+
+    Parameters
+    ----------
+    fname : str
+        Name of the file holding the array
+    offset : int
+        Position of the first array item in the file (a value returned by
+        tell())
+    fmtin : str
+        Fortran array format descriptor of the array
+    binary : bool
+        True if the array is stored in an unformatted file
+
+    """
+
+    def __init__(self, fname, offset, fmtin, binary=False):
+        self.fname = os.path.abspath(fname)
+        self.offset = offset
+        self.fmtin = fmtin
+        self.binary = binary
+        stat = os.stat(self.fname)
+        self.stamp = (stat.st_size, stat.st_mtime)
+
+    @staticmethod
+    def skip(shape, file_in, dtype, fmtin, binary=False):
+        """
+        Record the position of the array at the current position of
+        file_in and move file_in past the array, without converting it.
+
+        Returns
+        -------
+        _DeferredArray, or None if the array cannot be skipped. Nothing
+        is read from file_in in that case.
+
+        """
+        try:
+            pos = file_in.tell()
+            fname = file_in.name
+        except (AttributeError, IOError, OSError, ValueError):
+            return None
+        num_items = int(np.prod(shape))
+        if binary:
+            if np.issubdtype(dtype, np.floating):
+                header_dtype = BinaryHeader.set_dtype(bintype='Head')
+                nbytes = num_items * np.dtype(dtype).itemsize + \
+                         header_dtype.itemsize
+            else:
+                # see load_bin()
+                nbytes = num_items * np.dtype(np.int32).itemsize
+            if pos + nbytes > os.fstat(file_in.fileno()).st_size:
+                return None
+            file_in.seek(pos + nbytes)
+        else:
+            npl, fmt, width, decimal = \
+                ArrayFormat.decode_fortran_descriptor(fmtin)
+            if Util2d._load_txt_bulk(file_in, num_items, dtype, npl, width,
+                                     convert=False) is None:
+                return None
+        return _DeferredArray(fname, pos, fmtin, binary)
+
+    def load(self, shape, dtype):
+        """
+        Read the array.
+
+        Returns
+        -------
+        1-D or 2-D array
+
+        """
+        stat = os.stat(self.fname)
+        if (stat.st_size, stat.st_mtime) != self.stamp:
+            raise IOError('Util2d: {0} has changed since the model was '
+                          'loaded, the array it holds can no longer be '
+                          'read'.format(self.fname))
+        if self.binary:
+            with open(self.fname, 'rb') as f:
+                f.seek(self.offset)
+                header, data = Util2d.load_bin(shape, f, dtype,
+                                               bintype='Head')
+        else:
+            with open(self.fname, 'r') as f:
+                f.seek(self.offset)
+                data = Util2d.load_txt(shape, f, dtype, self.fmtin)
+        return data
+
+
 class Util2d(object):
     """
     Util2d class for handling 1- or 2-D model arrays
@@ -1718,6 +2005,9 @@ class Util2d(object):
         self.dtype = dtype
         self.name = name
         self.locat = locat
+        self.__array = None
+        self.__digest = None
+        self.__shared = False
         self.parse_value(value)
         if self.vtype == str:
             fmtin = "(FREE)"
@@ -1879,8 +2169,16 @@ class Util2d(object):
                                    array_free_format=self.format.array_free_format)
 
     def get_value(self):
+        self._load_deferred()
         return copy.deepcopy(self.__value)
 
+    def _load_deferred(self):
+        """
+        Read the array if it was not read when the model was loaded.
+        """
+        if isinstance(self.__value, _DeferredArray):
+            self.parse_value(self.__value.load(self.shape, self.dtype))
+
     # overloads, tries to avoid creating arrays if possible
     def __add__(self, other):
         if self.vtype in [np.int32, np.float32] and self.vtype == other.vtype:
@@ -1897,7 +2195,7 @@ class Util2d(object):
     def __mul__(self, other):
         if np.isscalar(other):
             return Util2d(self.model, self.shape, self.dtype,
-                          self._array * other, self.name,
+                          self._get_value_array() * other, self.name,
                           self.format.fortran, self.cnstnt, self.iprn,
                           self.ext_filename,
                           self.locat, self.format.binary)
@@ -1939,10 +2237,12 @@ class Util2d(object):
         """
         this one is dangerous because it resets __value
         """
-        a = self.array
+        a = self.array_copy()
         a[k] = value
         a = a.astype(self.dtype)
         self.__value = a
+        self.__shared = False
+        self.__array = None
         if self.__value_built is not None:
             self.__value_built = None
 
@@ -1956,9 +2256,19 @@ class Util2d(object):
             value = value.lower()
             assert value in self._acceptable_hows
             self._how = value
+        elif key == "cnstnt":
+            # the multiplied array has to be built again
+            super(Util2d, self).__setattr__(key, value)
+            self.__array = None
         else:
             super(Util2d, self).__setattr__(key, value)
 
+    def __getstate__(self):
+        # the array built by _get_array() is not part of the state
+        state = self.__dict__.copy()
+        state['_Util2d__array'] = None
+        return state
+
     def all(self):
         return self.array.all()
 
@@ -1983,6 +2293,8 @@ class Util2d(object):
 
     @property
     def vtype(self):
+        if isinstance(self.__value, _DeferredArray):
+            return np.ndarray
         return type(self.__value)
 
     @property
@@ -2114,33 +2426,136 @@ class Util2d(object):
         else:
             return self._get_fixed_cr(locat)
 
-    def get_file_entry(self, how=None):
+    def _resolve_how(self, how=None, verbose=True):
+        """
+        Get the 'how' that get_file_entry() uses to write the array.
 
+        """
         if how is not None:
             how = how.lower()
         else:
             how = self._how
 
         if not self.format.array_free_format and self.format.free:
-            print("Util2d {0}: can't be free format...resetting".format(
-                self.name))
+            if verbose:
+                print("Util2d {0}: can't be free format...resetting".format(
+                    self.name))
             self.format.free = False
 
         if not self.format.array_free_format and self.how == "internal" and self.locat is None:
-            print("Util2d {0}: locat is None, but ".format(self.name) + \
-                  "model does not " + \
-                  "support free format and how is internal..." + \
-                  "resetting how = external")
+            if verbose:
+                print("Util2d {0}: locat is None, but ".format(self.name) + \
+                      "model does not " + \
+                      "support free format and how is internal..." + \
+                      "resetting how = external")
             how = "external"
 
         if (self.format.binary or self.model.external_path) \
                 and how in ["constant", "internal"]:
-            print("Util2d:{0}: ".format(self.name) + \
-                  "resetting 'how' to external")
+            if verbose:
+                print("Util2d:{0}: ".format(self.name) + \
+                      "resetting 'how' to external")
             if self.format.array_free_format:
                 how = "openclose"
             else:
                 how = "external"
+        return how
+
+    def _get_digest(self):
+        """
+        Get a hash of the value array, or None if the value is not an
+        array. The hash is kept until the value is set again.
+
+        """
+        if not isinstance(self.__value, np.ndarray):
+            return None
+        if self.__digest is None or self.__digest[0] is not self.__value:
+            a = np.ascontiguousarray(self.__value)
+            digest = hashlib.sha1(a.view(np.uint8)).hexdigest()
+            self.__digest = (self.__value, (a.dtype.str, a.shape, digest))
+        return self.__digest[1]
+
+    def _share_value(self, other):
+        """
+        Use the value array of other in place of the value array of self
+        if both hold the same values. The shared array is never changed in
+        place: setting the value or items of either instance replaces its
+        own array, and _array copies it before it is returned (copy-on-write).
+        Returns True if the value array is shared.
+
+        """
+        if not isinstance(self.__value, np.ndarray) or \
+                not isinstance(other.__value, np.ndarray):
+            return False
+        if self.__value is not other.__value:
+            if self.__value.dtype != other.__value.dtype or \
+                    not np.array_equal(self.__value, other.__value):
+                return False
+            self.__value = other.__value
+            self.__array = None
+        self.__shared = True
+        other.__shared = True
+        return True
+
+    def _shares_value(self, other):
+        """
+        Check if self and other share one value array.
+
+        """
+        return isinstance(self.__value, np.ndarray) and \
+               self.__value is other.__value
+
+    def _same_array(self, other):
+        """
+        Check, without comparing arrays, that other is written with the
+        same values and multiplier as self.
+
+        """
+        if self.shape != other.shape or self.dtype != other.dtype:
+            return False
+        if self.cnstnt_str != other.cnstnt_str:
+            return False
+        value, other_value = self.__value, other.__value
+        if isinstance(value, (np.ndarray, _DeferredArray)) or \
+                isinstance(other_value, (np.ndarray, _DeferredArray)):
+            return value is other_value
+        return type(value) == type(other_value) and value == other_value
+
+    def _get_shared_file_entry(self, source):
+        """
+        Get an OPEN/CLOSE control record that reads the value array of self
+        from the file written for source, which shares the value array.
+        Returns None if either instance is not written to an OPEN/CLOSE
+        file.
+
+        """
+        if not self._shares_value(source):
+            return None
+        if self.format.binary != source.format.binary or \
+                self._resolve_how(verbose=False) != "openclose" or \
+                source._resolve_how(verbose=False) != "openclose":
+            return None
+        cr = 'OPEN/CLOSE  {0:>30s} {1:15} {2:>10s} {3:2.0f} {4:<30s}\n'.format(
+            source.model_file_path, self.cnstnt_str,
+            source.format.fortran, self.iprn,
+            self.name)
+        return cr
+
+    def _is_unchanged_file(self, args):
+        # True if an incremental write_input() has already written the
+        # external file with the same arguments of _write_array_file()
+        records = getattr(self.model, '_write_records', None)
+        if records is None:
+            return False
+        fingerprint = _array_file_fingerprint(*args)
+        unchanged = records.get(self.python_file_path) == fingerprint and \
+                    os.path.isfile(self.python_file_path)
+        records[self.python_file_path] = fingerprint
+        return unchanged
+
+    def get_file_entry(self, how=None):
+
+        how = self._resolve_how(how)
         if how == "internal":
             assert not self.format.binary, "Util2d error: 'how' is internal, but" + \
                                            "format is binary"
@@ -2154,14 +2569,16 @@ class Util2d(object):
 
             # write a file if needed
             if self.vtype != str:
-                if self.format.binary:
-                    self.write_bin(self.shape, self.python_file_path,
-                                   self._array,
-                                   bintype="head")
+                args = (self.format.binary, self.shape, self.python_file_path,
+                        self._get_value_array(), self.format.fortran)
+                writer = getattr(self.model, '_array_writer', None)
+                if self._is_unchanged_file(args):
+                    pass
+                elif writer is not None:
+                    writer.submit(self.python_file_path, _write_array_file,
+                                  args)
                 else:
-                    self.write_txt(self.shape, self.python_file_path,
-                                   self._array,
-                                   fortran_format=self.format.fortran)
+                    _write_array_file(*args)
 
             elif self.__value != self.python_file_path:
                 if os.path.exists(self.python_file_path):
@@ -2190,7 +2607,7 @@ class Util2d(object):
 
         elif how == "constant":
             if self.vtype not in [np.int32, np.float32]:
-                u = np.unique(self._array)
+                u = np.unique(self._get_value_array())
                 assert u.shape[
                            0] == 1, "Util2d error: 'how' is constant, but array " + \
                                     "is not uniform"
@@ -2214,40 +2631,67 @@ class Util2d(object):
 
         """
         # convert array to sting with specified format
-        a_string = self.array2string(self.shape, self._array,
+        a_string = self.array2string(self.shape, self._get_value_array(),
                                      python_format=self.format.py)
         return a_string
 
     @property
     def array(self):
         """
-        Get the COPY of array representation of value attribute with the
+        Get the array representation of value attribute with the
         effects of the control record multiplier applied.
 
         Returns
         -------
         array : numpy.ndarray
-            Copy of the array with the multiplier applied.
+            Read-only array with the multiplier applied.
 
         Note
         ----
-            .array is a COPY of the array representation as seen by the
-            model - with the effects of the control record multiplier applied.
+            .array is the array representation as seen by the model - with
+            the effects of the control record multiplier applied. It is
+            built once and kept until the value or cnstnt is set again, and
+            can not be modified; use array_copy() to get a copy that can be.
+            In-place changes to _array are seen by .array, in-place changes
+            to an ndarray passed as value are only seen if cnstnt is 1.
+
+        """
+        return _readonly_view(self._get_array())
+
+    def array_copy(self):
+        """
+        Get a copy of array that can be modified.
+
+        Returns
+        -------
+        array : numpy.ndarray
+            Copy of the array with the multiplier applied.
 
         """
+        return self._get_array().copy()
+
+    def _get_array(self):
+        if self.__array is not None:
+            return self.__array
         if isinstance(self.cnstnt, str):
             print("WARNING: cnstnt is str for {0}".format(self.name))
-            return self._array.astype(self.dtype)
-        if isinstance(self.cnstnt, (int, np.int32)):
+            cnstnt = 1
+        elif isinstance(self.cnstnt, (int, np.int32)):
             cnstnt = self.cnstnt
         else:
             if self.cnstnt == 0.0:
                 cnstnt = 1.0
             else:
                 cnstnt = self.cnstnt
-        # return a copy of self._array since it is being
-        # multiplied
-        return (self._array * cnstnt).astype(self.dtype)
+        a = self._get_value_array()
+        if cnstnt == 1 and a.dtype == self.dtype:
+            # no need to copy the value array if it is not multiplied
+            a = _readonly_view(a)
+        else:
+            a = (a * cnstnt).astype(self.dtype)
+            a.flags.writeable = False
+        self.__array = a
+        return a
 
     @property
     def _array(self):
@@ -2259,6 +2703,21 @@ class Util2d(object):
             the return array representation DOES NOT include the effect of the multiplier
             in the control record.  To get the array as the model sees it (with the multiplier applied),
             use the Util2d.array method.
+            The array can be changed in place, .array is built again after
+            _array is accessed.
+        """
+        # the caller may change the array in place
+        self.__array = None
+        if self.__shared:
+            # the value array is shared with other instances, copy-on-write
+            self.__value = self.__value.copy()
+            self.__shared = False
+        return self._get_value_array()
+
+    def _get_value_array(self):
+        """
+        get the array representation of value attribute, like _array, but
+        keep the array built by .array
         """
         if self.vtype == str:
             if self.__value_built is None:
@@ -2282,7 +2741,18 @@ class Util2d(object):
                                      * self.__value
             return self.__value_built
         else:
+            self._load_deferred()
+            return self.__value
+
+    @property
+    def _lazy_array(self):
+        """
+        get the array representation of value attribute, or the location
+        of the array in its file if the array has not been read yet
+        """
+        if isinstance(self.__value, _DeferredArray):
             return self.__value
+        return self._get_value_array()
 
     @staticmethod
     def load_block(shape, file_in, dtype):
@@ -2359,6 +2829,11 @@ class Util2d(object):
         if not hasattr(file_in, 'read'):
             file_in = open(file_in, 'r')
         npl, fmt, width, decimal = ArrayFormat.decode_fortran_descriptor(fmtin)
+        data = Util2d._load_txt_bulk(file_in, num_items, dtype, npl, width)
+        if data is not None:
+            return data.reshape(shape)
+
+        # line by line fallback
         items = []
         while len(items) < num_items:
             line = file_in.readline()
@@ -2394,6 +2869,192 @@ class Util2d(object):
                                                           data.size))
         return data.reshape(shape)
 
+    @staticmethod
+    def _load_txt_bulk(file_in, num_items, dtype, npl, width, convert=True):
+        """Vectorized version of the line by line reader in load_txt.
+
+        The text following the current position of file_in is read in
+        blocks and parsed with numpy until the line holding the last
+        item is found. The file is then left at the start of the next
+        line, as it is by the line by line reader.
+
+        Parameters
+        ----------
+        file_in : file
+            File handle
+        num_items : int
+            Number of items to read
+        dtype : np.int32 or np.float32
+        npl : int or str
+            Number of items per line, or 'free'
+        width : int
+            Width of each item for fixed format
+        convert : bool
+            If False, the items are counted but not converted to dtype
+            (default is True)
+
+        Returns
+        -------
+        1-D array (True if convert is False), or None if the text cannot be
+        parsed in bulk. Nothing is read from file_in in that case.
+        """
+        try:
+            pos = file_in.tell()
+        except (AttributeError, IOError, OSError, ValueError):
+            return None
+        if npl == 'free':
+            nchar = 16 * num_items + 1024
+        else:
+            nchar = (width + 1) * num_items + 1024
+        text = ''
+        result = None
+        try:
+            while True:
+                chunk = file_in.read(nchar)
+                text += chunk
+                eof = len(chunk) < nchar
+                if npl == 'free':
+                    result = Util2d._parse_free_bulk(text, num_items, dtype,
+                                                     eof, convert)
+                else:
+                    result = Util2d._parse_fixed_bulk(text, num_items, dtype,
+                                                      npl, width, eof,
+                                                      convert)
+                if result is not None or eof:
+                    break
+                nchar *= 2
+        except Exception:
+            # the line by line reader raises the appropriate error
+            result = None
+        file_in.seek(pos)
+        if result is None:
+            return None
+        data, nchar = result
+        file_in.read(nchar)
+        if not convert:
+            return True
+        return data
+
+    @staticmethod
+    def _text_to_buffer(text, eof):
+        """Return the complete lines in text, as a string and as a uint8
+        array, and the positions of the line ends. ValueError is raised if
+        text holds control characters that are not whitespace."""
+        if not eof:
+            text = text[:text.rfind('\n') + 1]
+        buf = np.frombuffer(text.encode('ascii'), dtype=np.uint8)
+        lineends = np.flatnonzero(buf == 10)
+        if np.count_nonzero(buf < 32) != len(lineends):
+            if np.any((buf < 9) | ((buf - np.uint8(14)) < 14)):
+                raise ValueError(
+                    'Util2d.load_txt(): control character found')
+        if len(buf) > 0 and buf[-1] != 10:
+            lineends = np.append(lineends, len(buf) - 1)
+        return text, buf, lineends
+
+    @staticmethod
+    def _parse_free_bulk(text, num_items, dtype, eof, convert=True):
+        """Parse num_items free format items from text.
+
+        Returns
+        -------
+        (data, nchar) : the items (None if convert is False) and the number
+        of characters up to the end of the line holding the last item, or
+        None if text does not hold num_items items.
+        """
+        text, buf, lineends = Util2d._text_to_buffer(text.replace(',', ' '),
+                                                     eof)
+        ws = buf <= 32
+        starts = np.flatnonzero(~ws[1:] & ws[:-1]) + 1
+        if len(buf) > 0 and not ws[0]:
+            starts = np.concatenate(([0], starts))
+
+        # n*value repeat counts
+        stars = np.flatnonzero(buf == ord('*'))
+        if len(stars) > 0:
+            tokens = np.array(text.split())
+            itoken = np.unique(np.searchsorted(starts, stars,
+                                               side='right') - 1)
+            parts = np.char.partition(tokens[itoken], '*')
+            counts = np.ones(len(starts), dtype=np.int64)
+            counts[itoken] = parts[:, 0].astype(np.int64)
+            tokens[itoken] = parts[:, 2]
+            last = np.searchsorted(np.cumsum(counts), num_items)
+        else:
+            last = num_items - 1
+        if last >= len(starts):
+            return None
+        nchar = lineends[np.searchsorted(lineends, starts[last])] + 1
+        if not convert:
+            return None, nchar
+        ntokens = np.searchsorted(starts, nchar)
+
+        if len(stars) > 0:
+            data = np.repeat(tokens[:ntokens].astype(dtype),
+                             counts[:ntokens])
+        else:
+            # fromstring stops at, or splits, items it cannot parse, but
+            # may accept part of a bad last item, so the last item is
+            # also converted on its own
+            with warnings.catch_warnings():
+                warnings.simplefilter('ignore')
+                data = np.fromstring(text[:nchar], dtype=dtype, sep=' ')
+            lastitem = text[starts[ntokens - 1]:nchar].split()
+            if data.size != ntokens or \
+                    np.array(lastitem, dtype=dtype)[0] != data[-1]:
+                data = np.array(text[:nchar].split(), dtype=dtype)
+        return data[:num_items], nchar
+
+    @staticmethod
+    def _parse_fixed_bulk(text, num_items, dtype, npl, width, eof,
+                          convert=True):
+        """Parse num_items fixed format items (npl items of width
+        characters on each line) from text.
+
+        Returns
+        -------
+        (data, nchar) : the items (None if convert is False) and the number
+        of characters up to the end of the line holding the last item, or
+        None if text does not hold num_items items.
+        """
+        text, buf, lineends = Util2d._text_to_buffer(text, eof)
+        if len(lineends) == 0:
+            return None
+        nline = len(lineends)
+        linestarts = np.concatenate(([0], lineends[:-1] + 1))
+        linelen = lineends - linestarts + (buf[lineends] != 10)
+
+        # the first npl * width characters of every line, padded with
+        # blanks, taken from a sliding window view of the text
+        rowlen = npl * width
+        pad = np.concatenate((buf, np.full(rowlen, 32, dtype=np.uint8)))
+        window = np.lib.stride_tricks.as_strided(pad,
+                                                 shape=(len(buf), rowlen),
+                                                 strides=(1, 1))
+        chars = window[linestarts]
+        short = linelen < rowlen
+        if np.any(short):
+            chars[short] = np.where(np.arange(rowlen) >= linelen[short, None],
+                                    32, chars[short])
+
+        # an item is blank if all of its characters are blank, which only
+        # needs to be checked if the last character is blank
+        fields = chars.reshape(nline * npl, width)
+        notblank = fields[:, -1] > 32
+        check = np.flatnonzero(~notblank)
+        notblank[check] = np.any(fields[check] > 32, axis=1)
+        notblank = notblank.reshape(nline, npl)
+
+        cumitems = np.cumsum(np.sum(notblank, axis=1))
+        line = np.searchsorted(cumitems, num_items)
+        if line >= nline:
+            return None
+        if not convert:
+            return None, lineends[line] + 1
+        items = chars.view('S{}'.format(width))[:line + 1]
+        data = items[notblank[:line + 1]][:num_items].astype(dtype)
+        return data, lineends[line] + 1
+
     @staticmethod
     def write_txt(shape, file_out, data, fortran_format="(FREE)",
                   python_format=None):
@@ -2402,11 +3063,15 @@ class Util2d(object):
                        ArrayFormat.get_default_numpy_fmt(data.dtype),
                        delimiter='')
             return
+        column_length, output_fmt = Util2d._get_output_format(
+            fortran_format, python_format)
+        chunks = Util2d._iter_array_string(shape, data, column_length,
+                                           output_fmt)
         if not hasattr(file_out, "write"):
-            file_out = open(file_out, 'w')
-        file_out.write(
-            Util2d.array2string(shape, data, fortran_format=fortran_format,
-                                python_format=python_format))
+            with open(file_out, 'w') as f:
+                f.writelines(chunks)
+        else:
+            file_out.writelines(chunks)
 
     @staticmethod
     def array2string(shape, data, fortran_format="(FREE)",
@@ -2419,12 +3084,18 @@ class Util2d(object):
         this routine now supports fixed format arrays where the numbers
         may touch.
         """
-        if len(shape) == 2:
-            nrow, ncol = shape
-        else:
-            nrow = 1
-            ncol = shape[0]
-        data = np.atleast_2d(data)
+        column_length, output_fmt = Util2d._get_output_format(
+            fortran_format, python_format)
+        return ''.join(Util2d._iter_array_string(shape, data, column_length,
+                                                 output_fmt))
+
+    @staticmethod
+    def _get_output_format(fortran_format="(FREE)", python_format=None):
+        """
+        Get the number of values per line and the python format string
+        of a value for array2string().
+
+        """
         if python_format is None:
             column_length, fmt, width, decimal = \
                 ArrayFormat.decode_fortran_descriptor(fortran_format)
@@ -2444,26 +3115,92 @@ class Util2d(object):
                                 + '  python_format should be a list with\n'
                                 + '   [column_length, fmt]\n'
                                 + '    e.g., [10, {0:10.2e}]')
-        if ncol % column_length == 0:
-            linereturnflag = False
+        return column_length, output_fmt
+
+    @staticmethod
+    def _get_printf_format(output_fmt, dtype):
+        """
+        Get the printf-style equivalent of a python format string such as
+        '{0:15.6E}' or '{0:10d}' for values of type dtype, or None if
+        there is none.
+
+        """
+        match = re.match(r'^\{0?:(\d+)(\.\d+)?([eEfFgGd])\}$', output_fmt)
+        if match is None:
+            return None
+        width, precision, conversion = match.groups()
+        dtype = np.dtype(dtype)
+        kind = dtype.kind
+        if dtype.itemsize > 8:
+            return None
+        if conversion == 'd':
+            if precision is not None or kind not in 'iub':
+                return None
+        elif kind not in 'fiu':
+            return None
+        return '%' + width + (precision or '') + conversion
+
+    @staticmethod
+    def _iter_array_string(shape, data, column_length, output_fmt,
+                           chunk_size=100000):
+        """
+        Generate the string representation of an array in chunks of rows
+        with about chunk_size values. Values are formatted in bulk and
+        joined into lines of column_length values.
+
+        """
+        if len(shape) == 2:
+            nrow, ncol = shape
         else:
-            linereturnflag = True
-        # write the array to a string
-        s = ""
-        for i in range(nrow):
-            icol = 0
-            for j in range(ncol):
-                try:
-                    s = s + output_fmt.format(data[i, j])
-                except Exception as e:
-                    raise Exception("error writing array value" + \
-                                    "{0} at r,c [{1},{2}]\n{3}".format(
-                                        data[i, j], i, j, str(e)))
-                if (j + 1) % column_length == 0.0 and (j != 0 or ncol == 1):
-                    s += '\n'
-            if linereturnflag:
-                s += '\n'
-        return s
+            nrow = 1
+            ncol = shape[0]
+        data = np.atleast_2d(data)
+        if data.shape[0] < nrow or data.shape[1] < ncol:
+            raise IndexError("Util2d: array of shape {0} ".format(data.shape) +
+                             "is smaller than shape {0}".format(shape))
+        data = data[:nrow, :ncol]
+
+        # line breaks follow values j for which (j + 1) % column_length == 0,
+        # except the first value of a row, and the last value of a row
+        lines = []
+        start = 0
+        for j in range(ncol):
+            if (j + 1) % column_length == 0 and (j != 0 or ncol == 1):
+                lines.append((start, j + 1))
+                start = j + 1
+        if ncol % column_length != 0:
+            lines.append((start, ncol))
+
+        nrow_chunk = max(1, chunk_size // ncol)
+        printf_fmt = Util2d._get_printf_format(output_fmt, data.dtype)
+        if printf_fmt is not None:
+            # a single printf-style format for all values of a chunk
+            row_fmt = '\n'.join(printf_fmt * (j1 - j0)
+                                for j0, j1 in lines) + '\n'
+            for i0 in range(0, nrow, nrow_chunk):
+                block = data[i0:i0 + nrow_chunk]
+                yield (row_fmt * block.shape[0]) % tuple(block.ravel().tolist())
+            return
+
+        for i0 in range(0, nrow, nrow_chunk):
+            block = data[i0:i0 + nrow_chunk]
+            try:
+                values = list(map(output_fmt.format, block.ravel().tolist()))
+            except Exception:
+                for (i, j), value in np.ndenumerate(block):
+                    try:
+                        output_fmt.format(value)
+                    except Exception as e:
+                        raise Exception("error writing array value" + \
+                                        "{0} at r,c [{1},{2}]\n{3}".format(
+                                            value, i0 + i, j, str(e)))
+                raise
+            s = []
+            for offset in range(0, len(values), ncol):
+                for j0, j1 in lines:
+                    s.append(''.join(values[offset + j0:offset + j1]))
+            s.append('')
+            yield '\n'.join(s)
 
     @staticmethod
     def load_bin(shape, file_in, dtype, bintype=None):
@@ -2517,7 +3254,10 @@ class Util2d(object):
     @staticmethod
     def write_bin(shape, file_out, data, bintype=None, header_data=None):
         if not hasattr(file_out, 'write'):
-            file_out = open(file_out, 'wb')
+            with open(file_out, 'wb') as f:
+                Util2d.write_bin(shape, f, data, bintype=bintype,
+                                 header_data=header_data)
+            return
         dtype = data.dtype
         if bintype is not None:
             if header_data is None:
@@ -2534,6 +3274,8 @@ class Util2d(object):
         parses and casts the raw value into an acceptable format for __value
         lot of defense here, so we can make assumptions later
         """
+        self.__array = None
+        self.__shared = False
         if isinstance(value, list):
             value = np.array(value)
 
@@ -2584,6 +3326,9 @@ class Util2d(object):
                                     'scalar value to type "float": ' +
                                     str(value))
 
+        elif isinstance(value, _DeferredArray):
+            self.__value = value
+
         elif isinstance(value, np.ndarray):
             # if value is 3d, but dimension 1 is only length 1,
             # then drop the first dimension
@@ -2602,6 +3347,7 @@ class Util2d(object):
                             str(type(value)))
 
     @staticmethod
+    @profiled('util2d', name=_load_event_name, nbytes=_load_event_nbytes)
     def load(f_handle, model, shape, dtype, name, ext_unit_dict=None,
              array_free_format=None, array_format="modflow"):
         """
@@ -2610,10 +3356,13 @@ class Util2d(object):
         external and internal record types must be fully loaded
         if you are using fixed format record types,make sure
         ext_unit_dict has been initialized from the NAM file
+        if model.lazy_arrays is True, open/close, internal and external
+        arrays are only located in their files and read on first access
         """
         if shape == (0, 0):
             raise IndexError('No information on model grid dimensions. '
                              'Need nrow, ncol to load a Util2d array.')
+        lazy = getattr(model, 'lazy_arrays', False)
         curr_unit = None
         if ext_unit_dict is not None:
             # determine the current file's unit number
@@ -2651,16 +3400,20 @@ class Util2d(object):
             # load_txt(shape, file_in, dtype, fmtin):
             assert os.path.exists(fname), "Util2d.load() error: open/close " + \
                                           "file " + str(fname) + " not found"
-            if str('binary') not in str(cr_dict['fmtin'].lower()):
+            binary = str('binary') in str(cr_dict['fmtin'].lower())
+            if lazy:
+                data = _DeferredArray(fname, 0, cr_dict['fmtin'], binary)
+            elif not binary:
                 f = open(fname, 'r')
                 data = Util2d.load_txt(shape=shape,
                                        file_in=f,
                                        dtype=dtype, fmtin=cr_dict['fmtin'])
+                f.close()
             else:
                 f = open(fname, 'rb')
                 header_data, data = Util2d.load_bin(shape, f, dtype,
                                                     bintype='Head')
-            f.close()
+                f.close()
             u2d = Util2d(model, shape, dtype, data, name=name,
                          iprn=cr_dict['iprn'], fmtin="(FREE)",
                          cnstnt=cr_dict['cnstnt'],
@@ -2668,7 +3421,13 @@ class Util2d(object):
 
 
         elif cr_dict['type'] == 'internal':
-            data = Util2d.load_txt(shape, f_handle, dtype, cr_dict['fmtin'])
+            data = None
+            if lazy:
+                data = _DeferredArray.skip(shape, f_handle, dtype,
+                                           cr_dict['fmtin'])
+            if data is None:
+                data = Util2d.load_txt(shape, f_handle, dtype,
+                                       cr_dict['fmtin'])
             u2d = Util2d(model, shape, dtype, data, name=name,
                          iprn=cr_dict['iprn'], fmtin="(FREE)",
                          cnstnt=cr_dict['cnstnt'], locat=None,
@@ -2676,20 +3435,35 @@ class Util2d(object):
 
         elif cr_dict['type'] == 'external':
             ext_unit = ext_unit_dict[cr_dict['nunit']]
+            load_earlier = getattr(model, '_load_earlier_packages', None)
+            if load_earlier is not None:
+                # the unit may be read by packages loaded before this one
+                load_earlier()
             if ext_unit.filehandle is None:
                 raise IOError('cannot read unit {0}, filename: {1}'
                               .format(cr_dict['nunit'], ext_unit.filename))
             elif 'binary' not in str(cr_dict['fmtin'].lower()):
                 assert cr_dict['nunit'] in list(ext_unit_dict.keys())
-                data = Util2d.load_txt(shape, ext_unit.filehandle,
-                                       dtype, cr_dict['fmtin'])
+                data = None
+                if lazy:
+                    data = _DeferredArray.skip(shape, ext_unit.filehandle,
+                                               dtype, cr_dict['fmtin'])
+                if data is None:
+                    data = Util2d.load_txt(shape, ext_unit.filehandle,
+                                           dtype, cr_dict['fmtin'])
             else:
                 if cr_dict['nunit'] not in list(ext_unit_dict.keys()):
                     cr_dict["nunit"] *= -1
                 assert cr_dict['nunit'] in list(ext_unit_dict.keys())
-                header_data, data = Util2d.load_bin(
-                    shape, ext_unit.filehandle, dtype,
-                    bintype='Head')
+                data = None
+                if lazy:
+                    data = _DeferredArray.skip(shape, ext_unit.filehandle,
+                                               dtype, cr_dict['fmtin'],
+                                               binary=True)
+                if data is None:
+                    header_data, data = Util2d.load_bin(
+                        shape, ext_unit.filehandle, dtype,
+                        bintype='Head')
             u2d = Util2d(model, shape, dtype, data, name=name,
                          iprn=cr_dict['iprn'], fmtin="(FREE)",
                          cnstnt=cr_dict['cnstnt'],
@@ -10,9 +10,16 @@ util_list module.  Contains the mflist class.
 from __future__ import division, print_function
 
 import os
+import re
+import itertools
 import warnings
 import numpy as np
 
+try:
+    from collections.abc import MutableMapping
+except ImportError:
+    from collections import MutableMapping
+
 try:
     from numpy.lib import NumpyVersion
     numpy114 = NumpyVersion(np.__version__) >= '1.14.0'
@@ -20,6 +27,191 @@ except ImportError:
     numpy114 = False
 
 
+class MfListStore(MutableMapping):
+    """
+    Columnar (CSR-style) storage of MfList stress period data.
+
+    The records of all stress periods are kept in one contiguous
+    structured array, and each stress period is a (start, stop) slice of
+    it. Stress periods are returned as recarray views of the shared
+    array, without copying. Integer (0 or -1) and filename entries are
+    kept as they are. Otherwise a MfListStore behaves like the dict of
+    {kper: recarray} it replaces.
+
+    Parameters
+    ----------
+    dtype : np.dtype
+        dtype of the records
+    data : dict
+        {kper: recarray, int or filename} to store (optional)
+
+    Notes
+    -----
+    Records of stress periods that are set again are dropped from the
+    shared array once they take up more than half of it. Views returned
+    before the shared array is grown or compacted keep the old records.
+
+    Examples
+    --------
+    >>> import flopy
+    >>> ml = flopy.modflow.Modflow.load('test.nam', columnar_lists=True)
+    >>> kpers, offsets, records = ml.wel.stress_period_data.data.get_csr()
+
+    """
+
+    def __init__(self, dtype, data=None):
+        self.dtype = np.dtype(dtype)
+        self._records = np.recarray(0, dtype=self.dtype)
+        self._size = 0
+        self._garbage = 0
+        self._slices = {}
+        self._other = {}
+        if data is not None:
+            for kper in sorted(data.keys()):
+                self[kper] = data[kper]
+
+    @classmethod
+    def from_dict(cls, dtype, data):
+        """
+        Build a MfListStore from a dict of {kper: recarray, int or
+        filename}.
+
+        """
+        return cls(dtype, data)
+
+    def to_dict(self, copy=True):
+        """
+        Get a dict of {kper: recarray, int or filename}. The recarrays are
+        copies of the stored records if copy is True, otherwise views.
+
+        """
+        data = {}
+        for kper in self:
+            value = self[kper]
+            if copy and isinstance(value, np.ndarray):
+                value = value.copy()
+            data[kper] = value
+        return data
+
+    def __getitem__(self, kper):
+        if kper in self._slices:
+            start, stop = self._slices[kper]
+            return self._records[start:stop]
+        return self._other[kper]
+
+    def __setitem__(self, kper, value):
+        if kper in self:
+            del self[kper]
+        if isinstance(value, np.ndarray) and value.dtype.names is not None:
+            if value.dtype != self.dtype:
+                raise ValueError('MfListStore: record dtype {0} '.format(
+                    value.dtype) + "doesn't match {0}".format(self.dtype))
+            start = self._size
+            self._append(value)
+            self._slices[kper] = (start, self._size)
+        else:
+            self._other[kper] = value
+
+    def __delitem__(self, kper):
+        if kper in self._slices:
+            start, stop = self._slices.pop(kper)
+            self._garbage += stop - start
+            if self._garbage > self._size // 2:
+                self.compact()
+        else:
+            del self._other[kper]
+
+    def __iter__(self):
+        return iter(sorted(list(self._slices.keys()) +
+                           list(self._other.keys())))
+
+    def __len__(self):
+        return len(self._slices) + len(self._other)
+
+    def __contains__(self, kper):
+        return kper in self._slices or kper in self._other
+
+    def _append(self, records):
+        n = records.shape[0]
+        if self._size + n > self._records.shape[0]:
+            # grow geometrically so that appending stays cheap
+            capacity = max(self._size + n, 2 * self._records.shape[0], 16)
+            new = np.recarray(capacity, dtype=self.dtype)
+            new[:self._size] = self._records[:self._size]
+            self._records = new
+        self._records[self._size:self._size + n] = records
+        self._size += n
+
+    def extend(self, kper, records):
+        """
+        Append records to stress period kper. Records of the stress
+        period that was stored last are extended in place.
+
+        """
+        records = np.asarray(records, dtype=self.dtype)
+        if kper in self._slices and self._slices[kper][1] == self._size:
+            start = self._slices[kper][0]
+            self._append(records)
+            self._slices[kper] = (start, self._size)
+        elif kper in self._slices:
+            self[kper] = np.concatenate((self[kper], records)) \
+                .view(np.recarray)
+        else:
+            self[kper] = records.view(np.recarray)
+
+    def compact(self):
+        """
+        Drop the records of replaced stress periods and store the stress
+        periods in order.
+
+        """
+        kpers = sorted(self._slices.keys())
+        size = self._size - self._garbage
+        new = np.recarray(size, dtype=self.dtype)
+        offset = 0
+        for kper in kpers:
+            start, stop = self._slices[kper]
+            new[offset:offset + stop - start] = self._records[start:stop]
+            self._slices[kper] = (offset, offset + stop - start)
+            offset += stop - start
+        self._records = new
+        self._size = size
+        self._garbage = 0
+
+    def get_csr(self):
+        """
+        Get the stored records in CSR layout.
+
+        Returns
+        -------
+        kpers : np.ndarray
+            stress periods with records, in increasing order
+        offsets : np.ndarray
+            records of kpers[n] are records[offsets[n]:offsets[n + 1]]
+        records : np.recarray
+            view of the records of all stress periods
+
+        """
+        kpers = sorted(self._slices.keys())
+        starts = [self._slices[kper][0] for kper in kpers]
+        stops = [self._slices[kper][1] for kper in kpers]
+        if self._garbage > 0 or starts[1:] != stops[:-1] or \
+                (len(starts) > 0 and starts[0] != 0):
+            self.compact()
+            starts = [self._slices[kper][0] for kper in kpers]
+        offsets = np.array(starts + [self._size], dtype=np.int64)
+        return np.array(kpers, dtype=np.int64), offsets, \
+               self._records[:self._size]
+
+    @property
+    def nbytes(self):
+        """
+        Size of the shared record array in bytes.
+
+        """
+        return self._records.nbytes
+
+
 class MfList(object):
     """
     a generic object for handling transient boundary condition lists
@@ -31,6 +223,10 @@ class MfList(object):
         this MfList will be added.
     data : varies
         the data of the transient list (optional). (the default is None)
+    columnar : bool
+        if True, the recarrays of all stress periods are stored in one
+        MfListStore instead of a dict. If None, the columnar_lists
+        attribute of the model is used. (the default is None)
 
     Attributes
     ----------
@@ -58,7 +254,7 @@ class MfList(object):
     """
 
     def __init__(self, package, data=None, dtype=None, model=None,
-                 list_free_format=None, binary=False):
+                 list_free_format=None, binary=False, columnar=None):
 
         if isinstance(data, MfList):
             for attr in data.__dict__.items():
@@ -86,7 +282,12 @@ class MfList(object):
             self.__dtype = dtype
         self.__binary = binary
         self.__vtype = {}
-        self.__data = {}
+        if columnar is None:
+            columnar = getattr(self.model, 'columnar_lists', False)
+        if columnar:
+            self.__data = MfListStore(self.__dtype)
+        else:
+            self.__data = {}
         if data is not None:
             self.__cast_data(data)
         self.__df = None
@@ -177,12 +378,38 @@ class MfList(object):
             for n in dtype.names:
                 newarr[n] = self.data[k][n]
             spd[k] = newarr
-        return MfList(self.package, spd, dtype=dtype)
+        return MfList(self.package, spd, dtype=dtype, columnar=self.columnar)
 
     @property
     def data(self):
         return self.__data
 
+    @property
+    def columnar(self):
+        return isinstance(self.__data, MfListStore)
+
+    def set_columnar(self, columnar=True):
+        """
+        Switch between a dict and a MfListStore for the stress period data.
+
+        Parameters
+        ----------
+        columnar : bool
+            if True, store the recarrays of all stress periods in one
+            MfListStore, otherwise in a dict of {kper: recarray}.
+
+        """
+        if columnar and not self.columnar:
+            self.__data = MfListStore.from_dict(self.__dtype, self.__data)
+        elif not columnar and self.columnar:
+            self.__data = self.__data.to_dict()
+
+    def __getstate__(self):
+        # the dataframe built by df is not part of the state
+        state = self.__dict__.copy()
+        state['_MfList__df'] = None
+        return state
+
     @property
     def df(self):
         if self.__df is None:
@@ -462,32 +689,30 @@ class MfList(object):
         assert len(index) + len(values) == len(self.dtype), \
             "MfList.add_record() error: length of index arg +" + \
             "length of value arg != length of self dtype"
-        # If we already have something for this kper, then add to it
-        if kper in list(self.__data.keys()):
-            # If a 0 or -1, reset
-            if self.vtype[kper] == int:
-                self.__data[kper] = self.get_empty(1)
-                self.__vtype[kper] = np.recarray
-            # If filename, load into recarray
-            if self.vtype[kper] == str:
-                d = self.__fromfile(self.data[kper])
-                d.resize(d.shape[0], d.shape[1])
-                self.__data[kper] = d
-                self.__vtype[kper] = np.recarray
-            # Extend the recarray
-            if self.vtype[kper] == np.recarray:
-                shape = self.__data[kper].shape
-                self.__data[kper].resize(shape[0] + 1, shape[1])
-        else:
-            self.__data[kper] = self.get_empty(1)
-            self.__vtype[kper] = np.recarray
         rec = list(index)
         rec.extend(list(values))
         try:
-            self.__data[kper][-1] = tuple(rec)
+            rec = np.array([tuple(rec)], dtype=self.dtype).view(np.recarray)
         except Exception as e:
             raise Exception("MfList.add_record() error: adding record to " + \
                             "recarray: " + str(e))
+        # If we already have something for this kper, then add to it;
+        # a 0 or -1 is replaced by the new record
+        if kper in list(self.__data.keys()) and \
+                self.vtype[kper] in (str, np.recarray):
+            # If filename, load into recarray
+            if self.vtype[kper] == str:
+                self.__data[kper] = self.__fromfile(self.data[kper])
+                self.__vtype[kper] = np.recarray
+            # Extend the recarray
+            if self.columnar:
+                self.__data.extend(kper, rec)
+            else:
+                self.__data[kper] = np.concatenate(
+                    (self.__data[kper], rec)).view(np.recarray)
+        else:
+            self.__data[kper] = rec
+            self.__vtype[kper] = np.recarray
 
     def __getitem__(self, kper):
         # Get the recarray for a given kper
@@ -507,7 +732,7 @@ class MfList(object):
                 return self.get_empty()
             else:
                 return self.data[self.__find_last_kper(kper)]
-        if self.vtype[kper] == int:
+        if self.vtype[kper] is None:
             if self.data[kper] == 0:
                 return self.get_empty()
             else:
@@ -580,10 +805,31 @@ class MfList(object):
     def binary(self):
         return bool(self.__binary)
 
-    def write_transient(self, f, single_per=None, forceInternal=False):
-        # forceInteral overrides isExternal (set below) for cases where
-        # external arrays are not supported (oh hello MNW1!)
-        # write the transient sequence described by the data dict
+    def write_transient(self, f, single_per=None, forceInternal=False,
+                        reuse=True):
+        """
+        Write the transient sequence described by the data dict to the
+        open file f.
+
+        Parameters
+        ----------
+        f : file handle
+            file handle of the package file
+        single_per : int or list of ints
+            only write these stress periods (optional)
+        forceInternal : bool
+            overrides external writing (set below) for cases where external
+            arrays are not supported (oh hello MNW1!)
+        reuse : bool
+            write an itmp of -1 for stress periods with the same records as
+            the stress period written before them. (the default is True)
+
+        Notes
+        -----
+        The records of each stress period are formatted in large chunks and
+        written to f, which stays open.
+
+        """
         nr, nc, nl, nper = self.model.get_nrow_ncol_nlay_nper()
         assert hasattr(f, "read"), "MfList.write() error: " + \
                                    "f argument must be a file handle"
@@ -597,6 +843,16 @@ class MfList(object):
                 single_per = [single_per]
             loop_over_kpers = single_per
 
+        isExternal = False
+        if self.model.array_free_format and \
+                        self.model.external_path is not None and \
+                        forceInternal is False:
+            isExternal = True
+        if self.__binary:
+            isExternal = True
+
+        # records of the stress period written before kper, if any
+        previous = None
         for kper in loop_over_kpers:
             # Fill missing early kpers with 0
             if kper < first:
@@ -619,16 +875,18 @@ class MfList(object):
                 itmp = -1
                 kper_vtype = int
 
+            if kper_vtype == np.recarray:
+                if reuse and self.__same_records(previous, kper_data):
+                    itmp = -1
+                    kper_vtype = int
+                else:
+                    previous = kper_data
+            elif kper_vtype == str or itmp >= 0:
+                previous = None
+
             f.write(" {0:9d} {1:9d} # stress period {2:d}\n"
                     .format(itmp, 0, kper+1))
 
-            isExternal = False
-            if self.model.array_free_format and \
-                            self.model.external_path is not None and \
-                            forceInternal is False:
-                isExternal = True
-            if self.__binary:
-                isExternal = True
             if isExternal:
                 if kper_vtype == np.recarray:
                     py_filepath = ''
@@ -648,41 +906,74 @@ class MfList(object):
                     kper_data = model_filepath
 
             if kper_vtype == np.recarray:
-                name = f.name
-                f.close()
-                f = open(name, 'ab+')
-                # print(f)
                 self.__tofile(f, kper_data)
-                f.close()
-                f = open(name, 'a')
-                # print(f)
             elif kper_vtype == str:
                 f.write('         open/close ' + kper_data)
                 if self.__binary:
                     f.write(' (BINARY)')
                 f.write('\n')
 
+    @staticmethod
+    def __same_records(previous, data):
+        # check if the records of a stress period can be reused
+        if previous is None:
+            return False
+        if previous is data:
+            return True
+        if previous.dtype != data.dtype or previous.shape != data.shape:
+            return False
+        for name in data.dtype.names:
+            if not np.array_equal(previous[name], data[name]):
+                return False
+        return True
+
+    def __iter_record_strings(self, data, chunk_size=100000):
+        # Yield the records of data (a recarray) as text, chunk_size
+        # records at a time, one-based indices and formatted like
+        # np.savetxt(f, data, fmt=self.fmt_string)
+        fmt_string = self.fmt_string
+        fmts = re.findall(r'%[^%a-zA-Z]*[a-zA-Z]', fmt_string)
+        row_fmt = fmt_string + '\n'
+        for i0 in range(0, data.shape[0], chunk_size):
+            block = data[i0:i0 + chunk_size]
+            columns = []
+            for name, fmt in zip(data.dtype.names, fmts):
+                column = block[name]
+                if name.lower() in ('k', 'i', 'j', 'node'):
+                    column = column + 1
+                if fmt.endswith('s') and column.dtype.kind == 'f':
+                    # numpy's floating-point formatter (Dragon4)
+                    column = list(map(str, column))
+                else:
+                    column = column.tolist()
+                columns.append(column)
+            values = tuple(itertools.chain.from_iterable(zip(*columns)))
+            yield (row_fmt * block.shape[0]) % values
+
     def __tofile(self, f, data):
         # Write the recarray (data) to the file (or file handle) f
         assert isinstance(data, np.recarray), "MfList.__tofile() data arg " + \
                                               "not a recarray"
 
-        # Add one to the kij indices
-        lnames = [name.lower() for name in self.dtype.names]
-        # --make copy of data for multiple calls
-        d = data.copy()
-        for idx in ['k', 'i', 'j', 'node']:
-            if idx in lnames:
-                d[idx] += 1
         if self.__binary:
+            # Add one to the kij indices
+            lnames = [name.lower() for name in self.dtype.names]
+            # --make copy of data for multiple calls
+            d = data.copy()
+            for idx in ['k', 'i', 'j', 'node']:
+                if idx in lnames:
+                    d[idx] += 1
             dtype2 = []
             for name in self.dtype.names:
                 dtype2.append((name, np.float32))
             dtype2 = np.dtype(dtype2)
             d = np.array(d, dtype=dtype2)
             d.tofile(f)
+        elif isinstance(f, str):
+            with open(f, 'w') as fo:
+                fo.writelines(self.__iter_record_strings(data))
         else:
-            np.savetxt(f, d, fmt=self.fmt_string, delimiter='')
+            f.writelines(self.__iter_record_strings(data))
 
     def check_kij(self):
         names = self.dtype.names
@@ -731,7 +1022,7 @@ class MfList(object):
         last = 0
         for kkper in kpers[::-1]:
             # if this entry is valid
-            if self.vtype[kkper] != int or self.data[kkper] != -1:
+            if self.vtype[kkper] is not None or self.data[kkper] != -1:
                 last = kkper
                 if kkper <= kper:
                     break
@@ -967,7 +1258,8 @@ class MfList(object):
     def to_array(self, kper=0, mask=False):
         """
         Convert stress period boundary condition (MfList) data for a
-        specified stress period to a 3-D numpy array
+        specified stress period to a 3-D numpy array (or a 1-D array of
+        nodes for DISU models)
 
         Parameters
         ----------
@@ -981,12 +1273,17 @@ class MfList(object):
             Dictionary of 3-D numpy arrays containing the stress period data for
             a selected stress period. The dictonary keys are the MfList dtype
             names for the stress period data ('cond', 'flux', 'bhead', etc.).
+            Data with node indices are returned as 1-D arrays of the DISU
+            nodes, or as 3-D arrays with nodes numbered layer by layer if
+            the model has a DIS package.
 
         See Also
         --------
 
         Notes
         -----
+        Values of cells with more than one entry are summed for 'cond' and
+        'flux' and averaged for the other names.
 
         Examples
         --------
@@ -995,14 +1292,35 @@ class MfList(object):
         >>> v = ml.wel.stress_period_data.to_array(kper=1)
 
         """
-        i0 = 3
-        if 'inode' in self.dtype.names:
-            raise NotImplementedError()
+        return self._to_array(kper=kper, mask=mask)
+
+    def _get_array_shape(self):
+        """
+        Get the shape of the arrays of to_array() and the number of index
+        fields at the start of the dtype.
+
+        """
+        names = self.dtype.names
+        if 'node' in names and not ('k' in names and 'i' in names and
+                                    'j' in names):
+            disu = self.model.get_package('DISU')
+            if disu is not None:
+                return (disu.nodes,), 1
+            return (self.model.nlay, self.model.nrow, self.model.ncol), 1
+        return (self.model.nlay, self.model.nrow, self.model.ncol), 3
+
+    def _to_array(self, kper=0, mask=False, names=None):
+        """
+        to_array() for the fields in names (default is all fields).
+
+        """
+        shape, i0 = self._get_array_shape()
         arrays = {}
         for name in self.dtype.names[i0:]:
+            if names is not None and name not in names:
+                continue
             if not self.dtype.fields[name][0] == object:
-                arr = np.zeros((self.model.nlay, self.model.nrow, self.model.ncol))
-                arrays[name] = arr.copy()
+                arrays[name] = np.zeros(shape)
 
         # if this kper is not found
         if kper not in self.data.keys():
@@ -1019,6 +1337,13 @@ class MfList(object):
             else:
                 kper = self.__find_last_kper(kper)
 
+        # an entry of -1 reuses the data of the previous entry
+        while isinstance(self.data[kper], int) and self.data[kper] == -1:
+            kpers = [k for k in self.data.keys() if k < kper]
+            if not kpers:
+                break
+            kper = max(kpers)
+
         sarr = self.data[kper]
 
         if np.isscalar(sarr):
@@ -1031,60 +1356,64 @@ class MfList(object):
             else:
                 raise Exception("MfList: something bad happened")
 
-        for name, arr in arrays.items():
-            cnt = np.zeros((self.model.nlay, self.model.nrow, self.model.ncol),
-                           dtype=np.float)
-            #print(name,kper)
-            for rec in sarr:
-                arr[rec['k'], rec['i'], rec['j']] += rec[name]
-                cnt[rec['k'], rec['i'], rec['j']] += 1.
+        # flat cell indices of the records, computed once for all names
+        size = int(np.prod(shape))
+        if i0 == 1:
+            idx = np.ravel_multi_index((sarr['node'],), (size,))
+        else:
+            idx = np.ravel_multi_index((sarr['k'], sarr['i'], sarr['j']),
+                                       shape)
+        cnt = np.bincount(idx, minlength=size).astype(np.float64) \
+            .reshape(shape)
+        active = cnt > 0.
+        for name in list(arrays.keys()):
+            # bincount adds the values of a cell in the order of the records
+            arr = np.bincount(idx, weights=sarr[name].astype(np.float64),
+                              minlength=size).reshape(shape)
             # average keys that should not be added
             if name not in ('cond', 'flux'):
-                idx = cnt > 0.
-                arr[idx] /= cnt[idx]
+                arr[active] /= cnt[active]
             if mask:
-                arr = np.ma.masked_where(cnt == 0., arr)
-                arr[cnt == 0.] = np.NaN
+                arr = np.ma.masked_where(~active, arr)
+                arr[~active] = np.NaN
 
-            arrays[name] = arr.copy()
+            arrays[name] = arr
         # elif mask:
         #     for name, arr in arrays.items():
         #         arrays[name][:] = np.NaN
         return arrays
 
-    @property
-    def masked_4D_arrays(self):
-        # get the first kper
-        arrays = self.to_array(kper=0, mask=True)
+    def _masked_4D_arrays(self, names=None):
+        """
+        Build the masked 4-D arrays of the fields in names. Arrays are only
+        computed for stress periods with new data.
 
-        # initialize these big arrays
+        """
+        shape, i0 = self._get_array_shape()
+        nper = self.model.nper
+        if len(shape) == 1:
+            # model.nper is only set by DIS
+            nper = self.model.get_package('DISU').nper
         m4ds = {}
-        for name, array in arrays.items():
-            m4d = np.zeros((self.model.nper, self.model.nlay,
-                            self.model.nrow, self.model.ncol))
-            m4d[0, :, :, :] = array
-            m4ds[name] = m4d
-        for kper in range(1, self.model.nper):
-            arrays = self.to_array(kper=kper, mask=True)
+        for kper in range(nper):
+            if kper == 0 or kper in self.data.keys():
+                arrays = self._to_array(kper=kper, mask=True, names=names)
             for name, array in arrays.items():
-                m4ds[name][kper, :, :, :] = array
+                if name not in m4ds:
+                    m4ds[name] = np.zeros((nper,) + shape)
+                m4ds[name][kper] = array
         return m4ds
 
+    @property
+    def masked_4D_arrays(self):
+        return self._masked_4D_arrays()
+
     def masked_4D_arrays_itr(self):
-        # get the first kper
-        arrays = self.to_array(kper=0, mask=True)
-
-        # initialize these big arrays
-        for name, array in arrays.items():
-            m4d = np.zeros((self.model.nper, self.model.nlay,
-                            self.model.nrow, self.model.ncol))
-            m4d[0, :, :, :] = array
-            for kper in range(1, self.model.nper):
-                arrays = self.to_array(kper=kper, mask=True)
-                for tname, array in arrays.items():
-                    if tname == name:
-                        m4d[kper, :, :, :] = array
-            yield name, m4d
+        shape, i0 = self._get_array_shape()
+        for name in self.dtype.names[i0:]:
+            if self.dtype.fields[name][0] == object:
+                continue
+            yield name, self._masked_4D_arrays(names=[name])[name]
 
     @property
     def array(self):
@@ -2,7 +2,7 @@ import os
 import copy
 import numpy as np
 from .binaryfile import CellBudgetFile
-from itertools import groupby
+from .mfgrdfile import MfGrdFile
 from collections import OrderedDict
 from ..utils.utils_def import totim_to_datetime
 
@@ -13,9 +13,10 @@ class ZoneBudget(object):
 
     Parameters
     ----------
-    cbc_file : str or CellBudgetFile object
-        The file name or CellBudgetFile object for which budgets will be
-        computed.
+    cbc_file : str, CellBudgetFile object, or ZoneBudgetPlan object
+        The file name, CellBudgetFile object, or ZoneBudgetPlan object for
+        which budgets will be computed. Records read by a ZoneBudgetPlan
+        are not read again.
     z : ndarray
         The array containing to zones to be used.
     kstpkper : tuple of ints
@@ -29,6 +30,11 @@ class ZoneBudget(object):
         When using this option in conjunction with a list of zones, the
         zone(s) passed may either be all strings (aliases), all integers,
         or mixed.
+    n_workers : int
+        Number of processes used to compute the budgets for the requested
+        times. Each process opens its own CellBudgetFile. The budgets are
+        computed in this process if n_workers is None or less than 2, or
+        if cbc_file is a ZoneBudgetPlan object (default is None).
 
     Returns
     -------
@@ -44,10 +50,26 @@ class ZoneBudget(object):
     >>> zb_mgd = zb * 7.48052 / 1000000
     """
 
-    def __init__(self, cbc_file, z, kstpkper=None, totim=None, aliases=None,
-                 verbose=False, **kwargs):
+    # INTERNAL FLOW TERMS ARE USED TO CALCULATE FLOW BETWEEN ZONES.
+    # CONSTANT-HEAD TERMS ARE USED TO IDENTIFY WHERE CONSTANT-HEAD CELLS ARE
+    # AND THEN USE FACE FLOWS TO DETERMINE THE AMOUNT OF FLOW.
+    # SWIADDTO--- terms are used by the SWI2 groundwater flow process.
+    _internal_flow_terms = ['CONSTANT HEAD', 'FLOW RIGHT FACE',
+                            'FLOW FRONT FACE', 'FLOW LOWER FACE',
+                            'SWIADDTOCH', 'SWIADDTOFRF', 'SWIADDTOFFF',
+                            'SWIADDTOFLF']
 
-        if isinstance(cbc_file, CellBudgetFile):
+    def __init__(self, cbc_file, z, kstpkper=None, totim=None, aliases=None,
+                 verbose=False, n_workers=None, **kwargs):
+
+        self._plan = None
+        if isinstance(cbc_file, ZoneBudgetPlan):
+            self._plan = cbc_file
+            self.cbc = cbc_file.cbc
+            if kstpkper is None and totim is None:
+                kstpkper = cbc_file.kstpkper
+                totim = cbc_file.totim
+        elif isinstance(cbc_file, CellBudgetFile):
             self.cbc = cbc_file
         elif isinstance(cbc_file, str) and os.path.isfile(cbc_file):
             self.cbc = CellBudgetFile(cbc_file)
@@ -84,7 +106,7 @@ class ZoneBudget(object):
             raise Exception('LayerFile error: unrecognized kwargs: ' + args)
 
         # Check the shape of the cbc budget file arrays
-        self.cbc_shape = self.cbc.get_data(idx=0, full3D=True)[0].shape
+        self.cbc_shape = self._get_cbc_shape()
         self.nlay, self.nrow, self.ncol = self.cbc_shape
         self.cbc_times = self.cbc.get_times()
         self.cbc_kstpkper = self.cbc.get_kstpkper()
@@ -117,28 +139,10 @@ class ZoneBudget(object):
         self.float_type = np.float32
         self.int_type = np.int32
 
-        # Check dimensions of input zone array
-        s = 'Row/col dimensions of zone array {}' \
-            ' do not match model row/col dimensions {}'.format(z.shape,
-                                                               self.cbc_shape)
-        assert z.shape[-2] == self.nrow and \
-               z.shape[-1] == self.ncol, s
-
-        if z.shape == self.cbc_shape:
-            izone = z.copy()
-        elif len(z.shape) == 2:
-            izone = np.zeros(self.cbc_shape, self.int_type)
-            izone[:] = z[:, :]
-        elif len(z.shape) == 3 and z.shape[0] == 1:
-            izone = np.zeros(self.cbc_shape, self.int_type)
-            izone[:] = z[0, :, :]
-        else:
-            raise Exception(
-                'Shape of the zone array is not recognized: {}'.format(
-                    z.shape))
-
-        self.izone = izone
-        self.allzones = [z for z in np.unique(self.izone)]
+        self.izone = self._get_izone(z)
+        allzones, izone_idx = np.unique(self.izone, return_inverse=True)
+        self.allzones = [z for z in allzones]
+        self._izone_idx = izone_idx.reshape(self.izone.shape)
         self._zonenamedict = OrderedDict([(z, 'ZONE_{}'.format(z))
                                           for z in self.allzones if
                                           z != 0])
@@ -169,50 +173,48 @@ class ZoneBudget(object):
             self.imeth[record['text'].strip().decode("utf-8")] = record[
                 'imeth']
 
-        # INTERNAL FLOW TERMS ARE USED TO CALCULATE FLOW BETWEEN ZONES.
-        # CONSTANT-HEAD TERMS ARE USED TO IDENTIFY WHERE CONSTANT-HEAD CELLS ARE AND THEN USE
-        # FACE FLOWS TO DETERMINE THE AMOUNT OF FLOW.
-        # SWIADDTO--- terms are used by the SWI2 groundwater flow process.
-        internal_flow_terms = ['CONSTANT HEAD', 'FLOW RIGHT FACE',
-                               'FLOW FRONT FACE', 'FLOW LOWER FACE',
-                               'SWIADDTOCH', 'SWIADDTOFRF', 'SWIADDTOFFF',
-                               'SWIADDTOFLF']
-
         # Source/sink/storage term record names
         # These are all of the terms that are not related to constant
         # head cells or face flow terms
         self.ssst_record_names = [n for n in self.record_names
-                                  if n not in internal_flow_terms]
-
-        # Initialize budget recordarray
-        array_list = []
-        if self.kstpkper is not None:
-            for kk in self.kstpkper:
-                recordarray = self._initialize_budget_recordarray(kstpkper=kk,
-                                                                  totim=None)
-                array_list.append(recordarray)
-        elif self.totim is not None:
-            for t in self.totim:
-                recordarray = self._initialize_budget_recordarray(
-                    kstpkper=None, totim=t)
-                array_list.append(recordarray)
-        self._budget = np.concatenate(array_list, axis=0)
-
-        # Update budget record array
-        if self.kstpkper is not None:
-            for kk in self.kstpkper:
-                if verbose:
-                    s = 'Computing the budget for' \
-                        ' time step {} in stress period {}'.format(kk[0] + 1,
-                                                                   kk[1] + 1)
-                    print(s)
-                self._compute_budget(kstpkper=kk)
-        elif self.totim is not None:
-            for t in self.totim:
-                if verbose:
-                    s = 'Computing the budget for time {}'.format(t)
-                    print(s)
-                self._compute_budget(totim=t)
+                                  if n not in self._internal_flow_terms]
+
+        # Budget record names and zone columns are the same for every time
+        self._recnames = self._get_budget_record_names()
+        self._recidx = OrderedDict([(n, i) for i, n in
+                                    enumerate(self._recnames)])
+        self._zoneidx = OrderedDict([(n, i) for i, n in
+                                     enumerate(self._zonenamedict.values())])
+        self._iflow_names = OrderedDict([(z, n) for z, n in
+                                         self._iflow_recnames])
+
+        # Budget rows and columns of each zone, ordered as in allzones
+        self._from_zone_rows = np.array(
+            [self._recidx['FROM_' + '_'.join(self._iflow_names[z].split())]
+             for z in self.allzones])
+        self._to_zone_rows = np.array(
+            [self._recidx['TO_' + '_'.join(self._iflow_names[z].split())]
+             for z in self.allzones])
+        self._zone_cols = np.array(
+            [self._zoneidx[self._zonenamedict[z]] if z != 0 else -1
+             for z in self.allzones])
+
+        # Time step/stress period and simulation time of each budget
+        self._budget_times = self._get_budget_times()
+
+        # Preallocate the budget values (ntimes x nrecords x nzones)
+        self._budget_values = np.zeros((len(self._budget_times),
+                                        len(self._recnames),
+                                        len(self._zoneidx)), np.float64)
+
+        # Indices of the cells on either side of every face separating
+        # two zones are computed once and reused for every time
+        self._face_index = self._get_face_index()
+
+        # Compute the budget for all times in one pass over the file
+        self._compute_budget(verbose=verbose, n_workers=n_workers)
+        self._compute_mass_balance()
+        self._budget = self._build_budget_recordarray()
 
         return
 
@@ -445,37 +447,310 @@ class ZoneBudget(object):
     def __deepcopy__(self, memo):
         """
         Over-rides the default deepcopy behavior. Copy all attributes except
-        the CellBudgetFile object which does not copy nicely.
+        the CellBudgetFile and ZoneBudgetPlan objects which do not copy
+        nicely.
         """
         cls = self.__class__
         result = cls.__new__(cls)
         memo[id(self)] = result
-        ignore_attrs = ['cbc']
+        ignore_attrs = ['cbc', '_plan']
         for k, v in self.__dict__.items():
             if k not in ignore_attrs:
                 setattr(result, k, copy.deepcopy(v, memo))
 
-        # Set CellBudgetFile object attribute manually. This is object
-        # read-only so should not be problems with pointers from
-        # multiple objects.
+        # Set CellBudgetFile and ZoneBudgetPlan object attributes manually.
+        # These objects are read-only so should not be problems with
+        # pointers from multiple objects.
         result.cbc = self.cbc
+        result._plan = self._plan
         return result
 
-    def _compute_budget(self, kstpkper=None, totim=None):
+    def __getstate__(self):
+        """
+        Over-rides the default pickle behavior. The CellBudgetFile and
+        ZoneBudgetPlan objects hold open files and are not pickled.
+        """
+        state = self.__dict__.copy()
+        state['cbc'] = None
+        state['_plan'] = None
+        return state
+
+    def _get_cbc_shape(self):
+        """
+        Get the shape of the arrays in the cell-by-cell budget file.
+
+        Returns
+        -------
+        cbc_shape : tuple of ints
+            (nlay, nrow, ncol)
+
+        """
+        if self._plan is not None:
+            return self._plan.cbc_shape
+        return self.cbc.get_data(idx=0, full3D=True)[0].shape
+
+    def _get_izone(self, z):
         """
-        Creates a budget for the specified zone array. This function only supports the
-        use of a single time step/stress period or time.
+        Get the zone array with the shape of the cell-by-cell budget file
+        arrays.
 
         Parameters
         ----------
-        kstpkper : tuple
-            Tuple of kstp and kper to compute budget for (default is None).
-        totim : float
-            Totim to compute budget for (default is None).
+        z : ndarray
+            The array containing the zones to be used.
 
         Returns
         -------
-        Noen
+        izone : ndarray
+            Zone array of shape (nlay, nrow, ncol).
+
+        """
+        # Check dimensions of input zone array
+        s = 'Row/col dimensions of zone array {}' \
+            ' do not match model row/col dimensions {}'.format(z.shape,
+                                                               self.cbc_shape)
+        assert z.shape[-2] == self.nrow and \
+               z.shape[-1] == self.ncol, s
+
+        if z.shape == self.cbc_shape:
+            izone = z.copy()
+        elif len(z.shape) == 2:
+            izone = np.zeros(self.cbc_shape, self.int_type)
+            izone[:] = z[:, :]
+        elif len(z.shape) == 3 and z.shape[0] == 1:
+            izone = np.zeros(self.cbc_shape, self.int_type)
+            izone[:] = z[0, :, :]
+        else:
+            raise Exception(
+                'Shape of the zone array is not recognized: {}'.format(
+                    z.shape))
+        return izone
+
+    def _get_budget_times(self):
+        """
+        Get the time step/stress period and simulation time for each of
+        the times for which the budget will be computed.
+
+        Returns
+        -------
+        budget_times : list of tuples
+            List of ((kstp, kper), totim) tuples.
+
+        """
+        budget_times = []
+        if self.kstpkper is not None:
+            for kk in self.kstpkper:
+                if len(self.cbc_times) > 0:
+                    totim = self.cbc_times[self.cbc_kstpkper.index(kk)]
+                else:
+                    totim = 0.
+                budget_times.append((kk, totim))
+        elif self.totim is not None:
+            for totim in self.totim:
+                if len(self.cbc_times) > 0:
+                    kk = self.cbc_kstpkper[self.cbc_times.index(totim)]
+                else:
+                    kk = (0, 0)
+                budget_times.append((kk, totim))
+        return budget_times
+
+    def _get_budget_record_indices(self):
+        """
+        Get the cell-by-cell budget file records for each budget time.
+
+        Returns
+        -------
+        record_indices : OrderedDict
+            Dictionary of budget time index, list of record indices pairs
+            ordered by position in the cell-by-cell budget file.
+
+        """
+        recordarray = self.cbc.recordarray
+        if self.kstpkper is not None:
+            timeidx = dict([(kk, i) for i, (kk, t) in
+                            enumerate(self._budget_times)])
+            keys = zip(recordarray['kstp'] - 1, recordarray['kper'] - 1)
+        else:
+            totim_type = recordarray.dtype['totim'].type
+            timeidx = dict([(totim_type(t), i) for i, (kk, t) in
+                            enumerate(self._budget_times)])
+            keys = recordarray['totim']
+        record_indices = OrderedDict()
+        for idx, key in enumerate(keys):
+            if isinstance(key, tuple):
+                key = (int(key[0]), int(key[1]))
+            itime = timeidx.get(key)
+            if itime is not None:
+                record_indices.setdefault(itime, []).append(idx)
+        return record_indices
+
+    def _get_face_index(self):
+        """
+        Get the flat indices of the cells on either side of every face
+        that separates two different zones.
+
+        Returns
+        -------
+        face_index : dict
+            Dictionary of axis, (lower cell, upper cell, lower cell zone,
+            upper cell zone) index arrays. The lower cell is the cell for
+            which the face flow is saved in the cell-by-cell budget file.
+            Zones are zero-based indices into allzones.
+
+        """
+        face_index = {}
+        nodes = np.arange(self.izone.size).reshape(self.cbc_shape)
+        for axis in range(3):
+            n = self.cbc_shape[axis]
+            if n < 2:
+                continue
+            lo = np.take(nodes, np.arange(n - 1), axis=axis).ravel()
+            hi = np.take(nodes, np.arange(1, n), axis=axis).ravel()
+            idx = self.izone.flat[lo] != self.izone.flat[hi]
+            lo, hi = lo[idx], hi[idx]
+            face_index[axis] = (lo, hi, self._izone_idx.flat[lo],
+                                self._izone_idx.flat[hi])
+        return face_index
+
+    def _compute_budget(self, verbose=False, n_workers=None):
+        """
+        Creates the budget for the specified zone array for all of the
+        requested times. Every record is read once, in the order in which
+        it is stored in the cell-by-cell budget file.
+
+        Parameters
+        ----------
+        verbose : bool
+            Write information to the screen (default is False).
+        n_workers : int
+            Number of processes used to compute the budgets (default is
+            None).
+
+        Returns
+        -------
+        None
+
+        """
+        record_indices = self._get_budget_record_indices()
+        if n_workers is not None and n_workers > 1 and \
+                self._plan is None and len(record_indices) > 1:
+            self._compute_budget_parallel(record_indices, n_workers,
+                                          verbose=verbose)
+            return
+        for itime, indices in record_indices.items():
+            self._compute_budget_time(itime, indices, verbose=verbose)
+        return
+
+    def _compute_budget_parallel(self, record_indices, n_workers,
+                                 verbose=False):
+        """
+        Creates the budget for the requested times with a pool of worker
+        processes. Each worker opens its own CellBudgetFile and computes
+        the budgets for a subset of the times, which are merged in the
+        original order.
+
+        Parameters
+        ----------
+        record_indices : OrderedDict
+            Dictionary of budget time index, list of record indices pairs.
+        n_workers : int
+            Number of processes.
+        verbose : bool
+            Write information to the screen (default is False).
+
+        Returns
+        -------
+        None
+
+        """
+        import multiprocessing
+        args = [(itime, indices, verbose) for itime, indices in
+                record_indices.items()]
+        n_workers = min(n_workers, len(args))
+        chunksize = max(1, len(args) // (4 * n_workers))
+        pool = multiprocessing.Pool(n_workers,
+                                    initializer=_init_budget_worker,
+                                    initargs=(self, self.cbc.filename,
+                                              self.cbc.precision))
+        try:
+            for itime, values in pool.imap(_compute_budget_worker, args,
+                                           chunksize):
+                self._budget_values[itime] = values
+        finally:
+            pool.close()
+            pool.join()
+        return
+
+    def _compute_budget_time(self, itime, indices, verbose=False):
+        """
+        Creates the budget for the specified zone array for a single time.
+
+        Parameters
+        ----------
+        itime : int
+            Index of the budget time.
+        indices : list of ints
+            Indices of the cell-by-cell budget file records for the time.
+        verbose : bool
+            Write information to the screen (default is False).
+
+        Returns
+        -------
+        None
+
+        """
+        if verbose:
+            (kstp, kper), totim = self._budget_times[itime]
+            if self.kstpkper is not None:
+                s = 'Computing the budget for' \
+                    ' time step {} in stress period {}'.format(kstp + 1,
+                                                               kper + 1)
+            else:
+                s = 'Computing the budget for time {}'.format(totim)
+            print(s)
+        records = OrderedDict()
+        for idx in indices:
+            recname = self.cbc.recordarray['text'][idx]
+            recname = recname.decode().strip()
+            records.setdefault(recname, []).append(self._get_record(idx))
+        self._compute_budget_records(itime, records)
+        return
+
+    def _get_record(self, idx):
+        """
+        Get a single data record from the cell-by-cell budget file or from
+        the records already read by the ZoneBudgetPlan.
+
+        Parameters
+        ----------
+        idx : int
+            The zero-based record number.
+
+        Returns
+        -------
+        record : record returned by CellBudgetFile.get_record
+
+        """
+        if self._plan is not None:
+            return self._plan.get_record(idx)
+        return self.cbc.get_record(idx)
+
+    def _compute_budget_records(self, itime, records):
+        """
+        Accumulates the budget for the specified zone array for a single
+        time.
+
+        Parameters
+        ----------
+        itime : int
+            Index of the budget time.
+        records : OrderedDict
+            Dictionary of record name, list of record data pairs for the
+            budget time.
+
+        Returns
+        -------
+        None
 
         """
         # Initialize an array to track where the constant head cells
@@ -483,7 +758,7 @@ class ZoneBudget(object):
         ich = np.zeros(self.cbc_shape, self.int_type)
         swiich = np.zeros(self.cbc_shape, self.int_type)
 
-        if 'CONSTANT HEAD' in self.record_names:
+        if 'CONSTANT HEAD' in records:
             """
             C-----CONSTANT-HEAD FLOW -- DON'T ACCUMULATE THE CELL-BY-CELL VALUES FOR
             C-----CONSTANT-HEAD FLOW BECAUSE THEY MAY INCLUDE PARTIALLY CANCELING
@@ -491,34 +766,32 @@ class ZoneBudget(object):
             C-----HEAD CELLS ARE AND THEN USE FACE FLOWS TO DETERMINE THE AMOUNT OF
             C-----FLOW.  STORE CONSTANT-HEAD LOCATIONS IN ICH ARRAY.
             """
-            chd = self.cbc.get_data(text='CONSTANT HEAD', full3D=True,
-                                    kstpkper=kstpkper, totim=totim)[0]
-            ich[np.ma.where(chd != 0.)] = 1
-        if 'FLOW RIGHT FACE' in self.record_names:
-            self._accumulate_flow_frf('FLOW RIGHT FACE', ich, kstpkper, totim)
-        if 'FLOW FRONT FACE' in self.record_names:
-            self._accumulate_flow_fff('FLOW FRONT FACE', ich, kstpkper, totim)
-        if 'FLOW LOWER FACE' in self.record_names:
-            self._accumulate_flow_flf('FLOW LOWER FACE', ich, kstpkper, totim)
-        if 'SWIADDTOCH' in self.record_names:
-            swichd = self.cbc.get_data(text='SWIADDTOCH', full3D=True,
-                                       kstpkper=kstpkper, totim=totim)[0]
-            swiich[swichd != 0] = 1
-        if 'SWIADDTOFRF' in self.record_names:
-            self._accumulate_flow_frf('SWIADDTOFRF', swiich, kstpkper, totim)
-        if 'SWIADDTOFFF' in self.record_names:
-            self._accumulate_flow_fff('SWIADDTOFFF', swiich, kstpkper, totim)
-        if 'SWIADDTOFLF' in self.record_names:
-            self._accumulate_flow_flf('SWIADDTOFLF', swiich, kstpkper, totim)
+            for data in records['CONSTANT HEAD']:
+                ich[self._get_flux_array(data, 'CONSTANT HEAD') != 0.] = 1
+        for data in records.get('FLOW RIGHT FACE', []):
+            self._accumulate_flow_frf(data, ich, itime)
+        for data in records.get('FLOW FRONT FACE', []):
+            self._accumulate_flow_fff(data, ich, itime)
+        for data in records.get('FLOW LOWER FACE', []):
+            self._accumulate_flow_flf(data, ich, itime)
+        for data in records.get('SWIADDTOCH', []):
+            swiich[self._get_flux_array(data, 'SWIADDTOCH') != 0.] = 1
+        for data in records.get('SWIADDTOFRF', []):
+            self._accumulate_flow_frf(data, swiich, itime)
+        for data in records.get('SWIADDTOFFF', []):
+            self._accumulate_flow_fff(data, swiich, itime)
+        for data in records.get('SWIADDTOFLF', []):
+            self._accumulate_flow_flf(data, swiich, itime)
 
         # NOT AN INTERNAL FLOW TERM, SO MUST BE A SOURCE TERM OR STORAGE
         # ACCUMULATE THE FLOW BY ZONE
         # iterate over remaining items in the list
         for recname in self.ssst_record_names:
-            self._accumulate_flow_ssst(recname, kstpkper, totim)
-
-        # Compute mass balance terms
-        self._compute_mass_balance(kstpkper, totim)
+            # Empty data can occur during the first time step of a
+            # transient model when storage terms are zero and not in the
+            # cell-budget file.
+            for data in records.get(recname, []):
+                self._accumulate_flow_ssst(recname, data, itime)
 
         return
 
@@ -539,853 +812,397 @@ class ZoneBudget(object):
         iflow_recnames = np.array(list(iflow_recnames.items()), dtype=dtype)
         return iflow_recnames
 
-    def _add_empty_record(self, recordarray, recname, kstpkper=None,
-                          totim=None):
+    def _get_budget_record_names(self):
         """
-        Build an empty records based on the specified flow direction and
-        record name for the given list of zones.
+        Get the names of the records in the budget for a single time.
 
-        Parameters
-        ----------
-        recordarray :
-        recname :
-        kstpkper : tuple
-            Tuple of kstp and kper to compute budget for (default is None).
-        totim : float
-            Totim to compute budget for (default is None).
+        Returns
+        -------
+        recnames : list of strings
+            List of budget record names.
+
+        """
+        recnames = []
+        for prefix, total in (('FROM_', 'TOTAL_IN'), ('TO_', 'TOTAL_OUT')):
+            if 'STORAGE' in self.record_names:
+                recnames.append(prefix + 'STORAGE')
+            if 'CONSTANT HEAD' in self.record_names:
+                recnames.append(prefix + 'CONSTANT_HEAD')
+            for recname in self.ssst_record_names:
+                if recname != 'STORAGE':
+                    recnames.append(prefix + '_'.join(recname.split()))
+            for n in self._iflow_recnames['name']:
+                recnames.append(prefix + '_'.join(n.split()))
+            recnames.append(total)
+        recnames += ['IN-OUT', 'PERCENT_DISCREPANCY']
+        return recnames
+
+    def _build_budget_recordarray(self):
+        """
+        Build the budget record array from the budget values for all times.
 
         Returns
         -------
         recordarray : np.recarray
 
         """
-        if kstpkper is not None:
-            if len(self.cbc_times) > 0:
-                totim = self.cbc_times[self.cbc_kstpkper.index(kstpkper)]
-            else:
-                totim = 0.
-        elif totim is not None:
-            if len(self.cbc_times) > 0:
-                kstpkper = self.cbc_kstpkper[self.cbc_times.index(totim)]
-            else:
-                kstpkper = (0, 0)
+        dtype_list = [('totim', '<f4'), ('time_step', '<i4'),
+                      ('stress_period', '<i4'), ('name', (str, 50))]
+        dtype_list += [(n, self.float_type) for n in
+                       self._zonenamedict.values()]
+        dtype = np.dtype(dtype_list)
 
-        row = [totim, kstpkper[0], kstpkper[1], recname]
-        row += [0. for _ in self._zonenamedict.values()]
-        recs = np.array(tuple(row), dtype=recordarray.dtype)
-        recordarray = np.append(recordarray, recs)
+        ntimes, nrecords, nzones = self._budget_values.shape
+        recordarray = np.zeros(ntimes * nrecords, dtype=dtype)
+        recordarray['totim'] = np.repeat([t for kk, t in self._budget_times],
+                                         nrecords)
+        recordarray['time_step'] = np.repeat(
+            [kk[0] for kk, t in self._budget_times], nrecords)
+        recordarray['stress_period'] = np.repeat(
+            [kk[1] for kk, t in self._budget_times], nrecords)
+        recordarray['name'] = np.tile(self._recnames, ntimes)
+        for n, iz in self._zoneidx.items():
+            recordarray[n] = self._budget_values[:, :, iz].ravel()
         return recordarray
 
-    def _initialize_budget_recordarray(self, kstpkper=None, totim=None):
+    def _update_budget_fromfaceflow(self, flux, itime):
         """
-        Initialize the budget record array which will store all of the
-        fluxes in the cell-budget file.
+        Update the budget values with the flows between zones.
 
         Parameters
         ----------
-        kstpkper : tuple
-            Tuple of kstp and kper to compute budget for (default is None).
-        totim : float
-            Totim to compute budget for (default is None).
+        flux : ndarray
+            Array of shape (nzones, nzones) with the flow from the zone in
+            the first dimension to the zone in the second dimension. Zones
+            are ordered as in allzones.
+        itime : int
+            Index of the budget time.
 
         Returns
         -------
+        None
 
         """
+        # No circular flow within zones
+        np.fill_diagonal(flux, 0.)
 
-        # Create empty array for the budget terms.
-        dtype_list = [('totim', '<f4'), ('time_step', '<i4'),
-                      ('stress_period', '<i4'), ('name', (str, 50))]
-        dtype_list += [(n, self.float_type) for n in
-                       self._zonenamedict.values()]
-        dtype = np.dtype(dtype_list)
-        recordarray = np.array([], dtype=dtype)
-
-        # Add "from" records
-        if 'STORAGE' in self.record_names:
-            recordarray = self._add_empty_record(recordarray, 'FROM_STORAGE',
-                                                 kstpkper, totim)
-        if 'CONSTANT HEAD' in self.record_names:
-            recordarray = self._add_empty_record(recordarray,
-                                                 'FROM_CONSTANT_HEAD',
-                                                 kstpkper, totim)
-        for recname in self.ssst_record_names:
-            if recname != 'STORAGE':
-                recordarray = self._add_empty_record(recordarray,
-                                                     'FROM_' + '_'.join(
-                                                         recname.split()),
-                                                     kstpkper, totim)
-
-        for z, n in self._iflow_recnames:
-            if n == 0 and 0 not in self.allzones:
-                continue
-            else:
-                recordarray = self._add_empty_record(recordarray,
-                                                     'FROM_' + '_'.join(
-                                                         n.split()),
-                                                     kstpkper, totim)
-        recordarray = self._add_empty_record(recordarray, 'TOTAL_IN',
-                                             kstpkper, totim)
-
-        # Add "out" records
-        if 'STORAGE' in self.record_names:
-            recordarray = self._add_empty_record(recordarray, 'TO_STORAGE',
-                                                 kstpkper, totim)
-        if 'CONSTANT HEAD' in self.record_names:
-            recordarray = self._add_empty_record(recordarray,
-                                                 'TO_CONSTANT_HEAD',
-                                                 kstpkper, totim)
-        for recname in self.ssst_record_names:
-            if recname != 'STORAGE':
-                recordarray = self._add_empty_record(recordarray,
-                                                     'TO_' + '_'.join(
-                                                         recname.split()),
-                                                     kstpkper, totim)
-
-        for n in self._iflow_recnames['name']:
-            if n == 0 and 0 not in self.allzones:
-                continue
-            else:
-                recordarray = self._add_empty_record(recordarray,
-                                                     'TO_' + '_'.join(
-                                                         n.split()), kstpkper,
-                                                     totim)
-        recordarray = self._add_empty_record(recordarray, 'TOTAL_OUT',
-                                             kstpkper, totim)
-
-        recordarray = self._add_empty_record(recordarray, 'IN-OUT', kstpkper,
-                                             totim)
-        recordarray = self._add_empty_record(recordarray,
-                                             'PERCENT_DISCREPANCY', kstpkper,
-                                             totim)
-        return recordarray
+        nonzero = self._zone_cols >= 0
+        cols = self._zone_cols[nonzero]
+        values = self._budget_values[itime]
+
+        # Inflows
+        values[np.ix_(self._from_zone_rows, cols)] += flux[:, nonzero]
+
+        # Outflows
+        values[np.ix_(self._to_zone_rows, cols)] += flux[nonzero, :].T
+        return
 
-    @staticmethod
-    def _filter_circular_flow(fz, tz, f):
+    def _update_budget_fromssst(self, recname, fin, fout, itime):
         """
+        Update the budget values with the inflows and outflows of a
+        source/sink/storage term.
 
         Parameters
         ----------
-        fz
-        tz
-        f
+        recname : str
+            Record name.
+        fin : ndarray
+            Inflow for each zone. Zones are ordered as in allzones.
+        fout : ndarray
+            Outflow for each zone. Zones are ordered as in allzones.
+        itime : int
+            Index of the budget time.
 
         Returns
         -------
+        None
 
         """
-        e = np.equal(fz, tz)
-        fz = fz[np.logical_not(e)]
-        tz = tz[np.logical_not(e)]
-        f = f[np.logical_not(e)]
-        return fz, tz, f
+        nonzero = self._zone_cols >= 0
+        cols = self._zone_cols[nonzero]
+        recname = '_'.join(recname.split())
+        values = self._budget_values[itime]
+        values[self._recidx['FROM_' + recname], cols] += np.abs(fin[nonzero])
+        values[self._recidx['TO_' + recname], cols] += np.abs(fout[nonzero])
+        return
 
-    def _update_budget_fromfaceflow(self, fz, tz, f,
-                                    kstpkper=None, totim=None):
+    def _get_flux_array(self, data, recname):
         """
+        Convert a cell-by-cell budget file record to a full 3D array.
 
         Parameters
         ----------
-        fz
-        tz
-        f
-        kstpkper
-        totim
+        data : record returned by CellBudgetFile.get_record
+        recname : str
+            Record name.
 
         Returns
         -------
+        flux : ndarray
+            Array of shape (nlay, nrow, ncol).
 
         """
+        imeth = self.imeth[recname]
+        if imeth == 2 or imeth == 5 or imeth == 6:
+            # LIST
+            flux = np.bincount(data['node'] - 1, weights=data['q'],
+                               minlength=self.izone.size)
+            flux = flux.reshape(self.cbc_shape)
+        elif imeth == 0 or imeth == 1:
+            # FULL 3-D ARRAY
+            flux = np.asarray(data).reshape(self.cbc_shape)
+        elif imeth == 3:
+            # 1-LAYER ARRAY WITH LAYER INDICATOR ARRAY
+            rlay, rdata = data[0], data[1]
+            flux = np.zeros(self.cbc_shape, self.float_type)
+            r, c = np.indices(rlay.shape)
+            flux[rlay - 1, r, c] = rdata
+        elif imeth == 4:
+            # 1-LAYER ARRAY THAT DEFINES LAYER 1
+            flux = np.zeros(self.cbc_shape, self.float_type)
+            flux[0, :, :] = data
+        else:
+            # Should not happen
+            raise Exception(
+                'Unrecognized "imeth" for {} record: {}'.format(recname,
+                                                                imeth))
+        return flux
 
-        # No circular flow within zones
-        fz, tz, f = self._filter_circular_flow(fz, tz, f)
+    def _accumulate_flow_frf(self, data, ich, itime):
+        """
 
-        if len(f) == 0:
-            return
+        Parameters
+        ----------
+        data
+        ich
+        itime
 
-        # Inflows
-        idx = np.logical_not(np.array([item in tz for item in [0] * len(tz)]))
-        fzi = fz[idx]
-        tzi = tz[idx]
-        rownames = np.array(list(['FROM_' +
-                                  self._iflow_recnames[
-                                      self._iflow_recnames['zone'] == z][
-                                      'name'][0]
-                                  for z in fzi]))
-        colnames = np.array(list(
-            [self._iflow_recnames[self._iflow_recnames['zone'] == z]['name'][0]
-             for z in tzi]))
-        fluxes = f[idx]
-        self._update_budget_recordarray(rownames, colnames, fluxes, kstpkper,
-                                        totim)
+        Returns
+        -------
 
-        # Outflows
-        idx = np.logical_not(np.array([item in fz for item in [0] * len(fz)]))
-        fzi = fz[idx]
-        tzi = tz[idx]
-        rownames = np.array(list(['TO_' +
-                                  self._iflow_recnames[
-                                      self._iflow_recnames['zone'] == z][
-                                      'name'][0]
-                                  for z in tzi]))
-        colnames = np.array(list(
-            [self._iflow_recnames[self._iflow_recnames['zone'] == z]['name'][0]
-             for z in fzi]))
-        fluxes = f[idx]
-        self._update_budget_recordarray(rownames, colnames, fluxes, kstpkper,
-                                        totim)
+        """
+        # "FLOW RIGHT FACE"  COMPUTE FLOW BETWEEN ZONES ACROSS COLUMNS.
+        if self.ncol >= 2:
+            self._accumulate_flow_face(data, ich, itime, axis=2)
         return
 
-    def _update_budget_fromssst(self, fz, tz, f, kstpkper=None, totim=None):
+    def _accumulate_flow_fff(self, data, ich, itime):
         """
 
         Parameters
         ----------
-        fz
-        tz
-        f
-        kstpkper
-        totim
+        data
+        ich
+        itime
 
         Returns
         -------
 
         """
-        if len(f) == 0:
-            return
-        self._update_budget_recordarray(fz, tz, f, kstpkper, totim)
+        # "FLOW FRONT FACE"  COMPUTE FLOW BETWEEN ZONES ACROSS ROWS.
+        if self.nrow >= 2:
+            self._accumulate_flow_face(data, ich, itime, axis=1)
         return
 
-    def _update_budget_recordarray(self, rownames, colnames, fluxes,
-                                   kstpkper=None, totim=None):
+    def _accumulate_flow_flf(self, data, ich, itime):
         """
-        Update the budget record array with the flux for the specified
-        flow direction (in/out), record name, and column.
 
         Parameters
         ----------
-        rownames
-        colnames
-        fluxes
-        kstpkper
-        totim
+        data
+        ich
+        itime
 
         Returns
         -------
-        None
 
         """
-        try:
-
-            if kstpkper is not None:
-                for rn, cn, flux in list(zip(rownames, colnames, fluxes)):
-                    rowidx = np.where(
-                        (self._budget['time_step'] == kstpkper[0]) &
-                        (self._budget['stress_period'] == kstpkper[1]) &
-                        (self._budget['name'] == rn))
-                    self._budget[cn][rowidx] += flux
-            elif totim is not None:
-                for rn, cn, flux in list(zip(rownames, colnames, fluxes)):
-                    rowidx = np.where((self._budget['totim'] == totim) &
-                                      (self._budget['name'] == rn))
-                    self._budget[cn][rowidx] += flux
-
-        except Exception as e:
-            print(e)
-            raise
+        # "FLOW LOWER FACE"  COMPUTE FLOW BETWEEN ZONES ACROSS LAYERS.
+        if self.nlay >= 2:
+            self._accumulate_flow_face(data, ich, itime, axis=0)
         return
 
-    def _accumulate_flow_frf(self, recname, ich, kstpkper, totim):
+    def _accumulate_flow_face(self, data, ich, itime, axis):
         """
+        Accumulate the face flows between zones and to and from
+        constant-head cells for a single flow direction.
 
         Parameters
         ----------
-        recname
-        ich
-        kstpkper
-        totim
+        data : ndarray
+            Face flow array of shape (nlay, nrow, ncol).
+        ich : ndarray
+            Constant-head cell indicator array.
+        itime : int
+            Index of the budget time.
+        axis : int
+            Flow direction (0 is lower face, 1 is front face, and 2 is
+            right face).
 
         Returns
         -------
+        None
 
         """
-        try:
-            if self.ncol >= 2:
-                data = \
-                    self.cbc.get_data(text=recname, kstpkper=kstpkper,
-                                      totim=totim)[0]
-
-                # "FLOW RIGHT FACE"  COMPUTE FLOW BETWEEN ZONES ACROSS COLUMNS.
-                # COMPUTE FLOW ONLY BETWEEN A ZONE AND A HIGHER ZONE -- FLOW FROM
-                # ZONE 4 TO 3 IS THE NEGATIVE OF FLOW FROM 3 TO 4.
-                # 1ST, CALCULATE FLOW BETWEEN NODE J,I,K AND J-1,I,K
-
-                k, i, j = np.where(
-                    self.izone[:, :, 1:] > self.izone[:, :, :-1])
-
-                # Adjust column values to account for the starting position of "nz"
-                j += 1
-
-                # Define the zone to which flow is going
-                nz = self.izone[k, i, j]
-
-                # Define the zone from which flow is coming
-                jl = j - 1
-                nzl = self.izone[k, i, jl]
-
-                # Get the face flow
-                q = data[k, i, jl]
-
-                # Get indices where flow face values are positive (flow out of higher zone)
-                # Don't include CH to CH flow (can occur if CHTOCH option is used)
-                # Create an iterable tuple of (from zone, to zone, flux)
-                # Then group tuple by (from_zone, to_zone) and sum the flux values
-                idx = np.where(
-                    (q > 0) & ((ich[k, i, j] != 1) | (ich[k, i, jl] != 1)))
-                fzi, tzi, fi = sum_flux_tuples(nzl[idx],
-                                               nz[idx],
-                                               q[idx])
-                self._update_budget_fromfaceflow(fzi, tzi, np.abs(fi),
-                                                 kstpkper, totim)
-
-                # Get indices where flow face values are negative (flow into higher zone)
-                # Don't include CH to CH flow (can occur if CHTOCH option is used)
-                # Create an interable tuple of (from zone, to zone, flux)
-                # Then group tuple by (from_zone, to_zone) and sum the flux values
-                idx = np.where(
-                    (q < 0) & ((ich[k, i, j] != 1) | (ich[k, i, jl] != 1)))
-                fzi, tzi, fi = sum_flux_tuples(nz[idx],
-                                               nzl[idx],
-                                               q[idx])
-                self._update_budget_fromfaceflow(fzi, tzi, np.abs(fi),
-                                                 kstpkper, totim)
-
-                # FLOW BETWEEN NODE J,I,K AND J+1,I,K
-                k, i, j = np.where(
-                    self.izone[:, :, :-1] > self.izone[:, :, 1:])
-
-                # Define the zone from which flow is coming
-                nz = self.izone[k, i, j]
-
-                # Define the zone to which flow is going
-                jr = j + 1
-                nzr = self.izone[k, i, jr]
-
-                # Get the face flow
-                q = data[k, i, j]
-
-                # Get indices where flow face values are positive (flow out of higher zone)
-                # Don't include CH to CH flow (can occur if CHTOCH option is used)
-                # Create an interable tuple of (from zone, to zone, flux)
-                # Then group tuple by (from_zone, to_zone) and sum the flux values
-                idx = np.where(
-                    (q > 0) & ((ich[k, i, j] != 1) | (ich[k, i, jr] != 1)))
-                fzi, tzi, fi = sum_flux_tuples(nz[idx],
-                                               nzr[idx],
-                                               q[idx])
-                self._update_budget_fromfaceflow(fzi, tzi, np.abs(fi),
-                                                 kstpkper, totim)
-
-                # Get indices where flow face values are negative (flow into higher zone)
-                # Don't include CH to CH flow (can occur if CHTOCH option is used)
-                # Create an iterable tuple of (from zone, to zone, flux)
-                # Then group tuple by (from_zone, to_zone) and sum the flux values
-                idx = np.where(
-                    (q < 0) & ((ich[k, i, j] != 1) | (ich[k, i, jr] != 1)))
-                fzi, tzi, fi = sum_flux_tuples(nzr[idx],
-                                               nz[idx],
-                                               q[idx])
-                self._update_budget_fromfaceflow(fzi, tzi, np.abs(fi),
-                                                 kstpkper, totim)
-
-                # CALCULATE FLOW TO CONSTANT-HEAD CELLS IN THIS DIRECTION
-                k, i, j = np.where(ich == 1)
-                k, i, j = k[j > 0], i[j > 0], j[j > 0]
-                jl = j - 1
-                nzl = self.izone[k, i, jl]
-                nz = self.izone[k, i, j]
-                q = data[k, i, jl]
-                idx = np.where(
-                    (q > 0) & ((ich[k, i, j] != 1) | (ich[k, i, jl] != 1)))
-                fzi, tzi, fi = sum_flux_tuples(nzl[idx],
-                                               nz[idx],
-                                               q[idx])
-                tz = tzi[tzi != 0]
-                f = fi[tzi != 0]
-                fz = np.array(['TO_CONSTANT_HEAD'] * len(tz))
-                tz = np.array([self._zonenamedict[z] for z in tzi[tzi != 0]])
-                self._update_budget_fromssst(fz, tz, np.abs(f), kstpkper,
-                                             totim)
-
-                idx = np.where(
-                    (q < 0) & ((ich[k, i, j] != 1) | (ich[k, i, jl] != 1)))
-                fzi, tzi, fi = sum_flux_tuples(nzl[idx],
-                                               nz[idx],
-                                               q[idx])
-                fz = fzi[fzi != 0]
-                f = fi[fzi != 0]
-                fz = np.array(['FROM_CONSTANT_HEAD'] * len(fz))
-                tz = np.array([self._zonenamedict[z] for z in tzi[tzi != 0]])
-                self._update_budget_fromssst(fz, tz, np.abs(f), kstpkper,
-                                             totim)
-
-                k, i, j = np.where(ich == 1)
-                k, i, j = k[j < self.ncol - 1], i[j < self.ncol - 1], j[
-                    j < self.ncol - 1]
-                nz = self.izone[k, i, j]
-                jr = j + 1
-                nzr = self.izone[k, i, jr]
-                q = data[k, i, j]
-                idx = np.where(
-                    (q > 0) & ((ich[k, i, j] != 1) | (ich[k, i, jr] != 1)))
-                fzi, tzi, fi = sum_flux_tuples(nzr[idx],
-                                               nz[idx],
-                                               q[idx])
-                tz = tzi[tzi != 0]
-                f = fi[tzi != 0]
-                fz = np.array(['FROM_CONSTANT_HEAD'] * len(tz))
-                tz = np.array([self._zonenamedict[z] for z in tzi[tzi != 0]])
-                self._update_budget_fromssst(fz, tz, np.abs(f), kstpkper,
-                                             totim)
-
-                idx = np.where(
-                    (q < 0) & ((ich[k, i, j] != 1) | (ich[k, i, jr] != 1)))
-                fzi, tzi, fi = sum_flux_tuples(nzr[idx],
-                                               nz[idx],
-                                               q[idx])
-                fz = fzi[fzi != 0]
-                f = fi[fzi != 0]
-                fz = np.array(['TO_CONSTANT_HEAD'] * len(fz))
-                tz = np.array([self._zonenamedict[z] for z in tzi[tzi != 0]])
-                self._update_budget_fromssst(fz, tz, np.abs(f), kstpkper,
-                                             totim)
-
-        except Exception as e:
-            print(e)
-            raise
+        data = np.asarray(data).ravel()
+        izone = self._izone_idx.ravel()
+        ich = ich.ravel()
+
+        # COMPUTE FLOW ONLY BETWEEN A ZONE AND A DIFFERENT ZONE. THE FACE
+        # FLOW IS SAVED FOR THE LOWER CELL OF EACH FACE AND IS POSITIVE
+        # WHEN FLOW IS FROM THE LOWER CELL TO THE UPPER CELL.
+        lo, hi, nzlo, nzhi = self._face_index[axis]
+        self._accumulate_flow_between_zones(data[lo], lo, hi, nzlo, nzhi,
+                                            ich, itime)
+
+        # CALCULATE FLOW TO CONSTANT-HEAD CELLS IN THIS DIRECTION. THE FLOW
+        # IS ASSIGNED TO THE ZONE OF THE CONSTANT-HEAD CELL.
+        stride = self.izone.strides[axis] // self.izone.itemsize
+        n = self.cbc_shape[axis]
+        chcells = np.flatnonzero(ich == 1)
+        position = (chcells // stride) % n
+
+        # Face shared with the cell before the constant-head cell
+        nc = chcells[position > 0]
+        nn = nc - stride
+        idx = ich[nn] != 1
+        chz = [izone[nc[idx]]]
+        q = [data[nn[idx]]]
+
+        # Face shared with the cell after the constant-head cell
+        nc = chcells[position < n - 1]
+        nn = nc + stride
+        idx = ich[nn] != 1
+        chz.append(izone[nc[idx]])
+        q.append(-data[nc[idx]])
+
+        self._accumulate_flow_constant_head(np.concatenate(chz),
+                                            np.concatenate(q), itime)
         return
 
-    def _accumulate_flow_fff(self, recname, ich, kstpkper, totim):
+    def _accumulate_flow_between_zones(self, q, lo, hi, nzlo, nzhi, ich,
+                                       itime):
         """
+        Accumulate the flows across connections between cells in different
+        zones.
 
         Parameters
         ----------
-        recname
-        ich
-        kstpkper
-        totim
+        q : ndarray
+            Flow across each connection, positive when flow is from the
+            lower cell to the upper cell.
+        lo : ndarray
+            Flat index of the lower cell of each connection.
+        hi : ndarray
+            Flat index of the upper cell of each connection.
+        nzlo : ndarray
+            Zone index (into allzones) of the lower cell of each connection.
+        nzhi : ndarray
+            Zone index (into allzones) of the upper cell of each connection.
+        ich : ndarray
+            Flat constant-head cell indicator array.
+        itime : int
+            Index of the budget time.
 
         Returns
         -------
+        None
 
         """
-        try:
-            if self.nrow >= 2:
-                data = \
-                    self.cbc.get_data(text=recname, kstpkper=kstpkper,
-                                      totim=totim)[0]
-
-                # "FLOW FRONT FACE"
-                # CALCULATE FLOW BETWEEN NODE J,I,K AND J,I-1,K
-                k, i, j = np.where(
-                    self.izone[:, 1:, :] < self.izone[:, :-1, :])
-                i += 1
-                ia = i - 1
-                nza = self.izone[k, ia, j]
-                nz = self.izone[k, i, j]
-                q = data[k, ia, j]
-                idx = np.where(
-                    (q > 0) & ((ich[k, i, j] != 1) | (ich[k, ia, j] != 1)))
-                fzi, tzi, fi = sum_flux_tuples(nza[idx],
-                                               nz[idx],
-                                               q[idx])
-                self._update_budget_fromfaceflow(fzi, tzi, np.abs(fi),
-                                                 kstpkper, totim)
-
-                idx = np.where(
-                    (q < 0) & ((ich[k, i, j] != 1) | (ich[k, ia, j] != 1)))
-                fzi, tzi, fi = sum_flux_tuples(nz[idx],
-                                               nza[idx],
-                                               q[idx])
-                self._update_budget_fromfaceflow(fzi, tzi, np.abs(fi),
-                                                 kstpkper, totim)
-
-                # CALCULATE FLOW BETWEEN NODE J,I,K AND J,I+1,K.
-                k, i, j = np.where(
-                    self.izone[:, :-1, :] < self.izone[:, 1:, :])
-                nz = self.izone[k, i, j]
-                ib = i + 1
-                nzb = self.izone[k, ib, j]
-                q = data[k, i, j]
-                idx = np.where(
-                    (q > 0) & ((ich[k, i, j] != 1) | (ich[k, ib, j] != 1)))
-                fzi, tzi, fi = sum_flux_tuples(nz[idx],
-                                               nzb[idx],
-                                               q[idx])
-                self._update_budget_fromfaceflow(fzi, tzi, np.abs(fi),
-                                                 kstpkper, totim)
-
-                idx = np.where(
-                    (q < 0) & ((ich[k, i, j] != 1) | (ich[k, ib, j] != 1)))
-                fzi, tzi, fi = sum_flux_tuples(nzb[idx],
-                                               nz[idx],
-                                               q[idx])
-                self._update_budget_fromfaceflow(fzi, tzi, np.abs(fi),
-                                                 kstpkper, totim)
-
-                # CALCULATE FLOW TO CONSTANT-HEAD CELLS IN THIS DIRECTION
-                k, i, j = np.where(ich == 1)
-                k, i, j = k[i > 0], i[i > 0], j[i > 0]
-                ia = i - 1
-                nza = self.izone[k, ia, j]
-                nz = self.izone[k, i, j]
-                q = data[k, ia, j]
-                idx = np.where(
-                    (q > 0) & ((ich[k, i, j] != 1) | (ich[k, ia, j] != 1)))
-                fzi, tzi, fi = sum_flux_tuples(nza[idx],
-                                               nz[idx],
-                                               q[idx])
-                tz = tzi[tzi != 0]
-                f = fi[tzi != 0]
-                fz = np.array(['TO_CONSTANT_HEAD'] * len(tz))
-                tz = np.array([self._zonenamedict[z] for z in tzi[tzi != 0]])
-                self._update_budget_fromssst(fz, tz, np.abs(f), kstpkper,
-                                             totim)
-
-                idx = np.where(
-                    (q < 0) & ((ich[k, i, j] != 1) | (ich[k, ia, j] != 1)))
-                fzi, tzi, fi = sum_flux_tuples(nza[idx],
-                                               nz[idx],
-                                               q[idx])
-                fz = fzi[fzi != 0]
-                f = fi[fzi != 0]
-                fz = np.array(['FROM_CONSTANT_HEAD'] * len(fz))
-                tz = np.array([self._zonenamedict[z] for z in tzi[tzi != 0]])
-                self._update_budget_fromssst(fz, tz, np.abs(f), kstpkper,
-                                             totim)
-
-                k, i, j = np.where(ich == 1)
-                k, i, j = k[i < self.nrow - 1], i[i < self.nrow - 1], j[
-                    i < self.nrow - 1]
-                nz = self.izone[k, i, j]
-                ib = i + 1
-                nzb = self.izone[k, ib, j]
-                q = data[k, i, j]
-                idx = np.where(
-                    (q > 0) & ((ich[k, i, j] != 1) | (ich[k, ib, j] != 1)))
-                fzi, tzi, fi = sum_flux_tuples(nzb[idx],
-                                               nz[idx],
-                                               q[idx])
-                tz = tzi[tzi != 0]
-                f = fi[tzi != 0]
-                fz = np.array(['FROM_CONSTANT_HEAD'] * len(tz))
-                tz = np.array([self._zonenamedict[z] for z in tzi[tzi != 0]])
-                self._update_budget_fromssst(fz, tz, np.abs(f), kstpkper,
-                                             totim)
-
-                idx = np.where(
-                    (q < 0) & ((ich[k, i, j] != 1) | (ich[k, ib, j] != 1)))
-                fzi, tzi, fi = sum_flux_tuples(nzb[idx],
-                                               nz[idx],
-                                               q[idx])
-                fz = fzi[fzi != 0]
-                f = fi[fzi != 0]
-                fz = np.array(['TO_CONSTANT_HEAD'] * len(fz))
-                tz = np.array([self._zonenamedict[z] for z in tzi[tzi != 0]])
-                self._update_budget_fromssst(fz, tz, np.abs(f), kstpkper,
-                                             totim)
-
-        except Exception as e:
-            print(e)
-            raise
+        nzones = len(self.allzones)
+
+        # Don't include CH to CH flow (can occur if CHTOCH option is used)
+        notch = (ich[lo] != 1) | (ich[hi] != 1)
+
+        # Sum positive flows (flow from the lower cell to the upper
+        # cell) and negative flows (flow from the upper cell to the
+        # lower cell) by (from zone, to zone)
+        idx = (q > 0) & notch
+        flux = sum_flux_bincount(nzlo[idx], nzhi[idx], q[idx], nzones)
+        idx = (q < 0) & notch
+        flux += sum_flux_bincount(nzhi[idx], nzlo[idx], -q[idx], nzones)
+        self._update_budget_fromfaceflow(flux, itime)
         return
 
-    def _accumulate_flow_flf(self, recname, ich, kstpkper, totim):
+    def _accumulate_flow_constant_head(self, chz, q, itime):
         """
+        Accumulate the flows to and from constant-head cells by the zone
+        of the constant-head cell.
 
         Parameters
         ----------
-        recname
-        ich
-        kstpkper
-        totim
+        chz : ndarray
+            Zone index (into allzones) of the constant-head cell of each
+            connection to a cell that is not constant head.
+        q : ndarray
+            Flow across each connection, positive when flow is into the
+            constant-head cell.
+        itime : int
+            Index of the budget time.
 
         Returns
         -------
+        None
 
         """
-        try:
-            if self.nlay >= 2:
-                data = \
-                    self.cbc.get_data(text=recname, kstpkper=kstpkper,
-                                      totim=totim)[0]
-
-                # "FLOW LOWER FACE"
-                # CALCULATE FLOW BETWEEN NODE J,I,K AND J,I,K-1
-                k, i, j = np.where(
-                    self.izone[1:, :, :] < self.izone[:-1, :, :])
-                k += 1
-                ka = k - 1
-                nza = self.izone[ka, i, j]
-                nz = self.izone[k, i, j]
-                q = data[ka, i, j]
-                idx = np.where(
-                    (q > 0) & ((ich[k, i, j] != 1) | (ich[ka, i, j] != 1)))
-                fzi, tzi, fi = sum_flux_tuples(nza[idx],
-                                               nz[idx],
-                                               q[idx])
-                self._update_budget_fromfaceflow(fzi, tzi, np.abs(fi),
-                                                 kstpkper, totim)
-
-                idx = np.where(
-                    (q < 0) & ((ich[k, i, j] != 1) | (ich[ka, i, j] != 1)))
-                fzi, tzi, fi = sum_flux_tuples(nz[idx],
-                                               nza[idx],
-                                               q[idx])
-                self._update_budget_fromfaceflow(fzi, tzi, np.abs(fi),
-                                                 kstpkper, totim)
-
-                # CALCULATE FLOW BETWEEN NODE J,I,K AND J,I,K+1
-                k, i, j = np.where(
-                    self.izone[:-1, :, :] < self.izone[1:, :, :])
-                nz = self.izone[k, i, j]
-                kb = k + 1
-                nzb = self.izone[kb, i, j]
-                q = data[k, i, j]
-                idx = np.where(
-                    (q > 0) & ((ich[k, i, j] != 1) | (ich[kb, i, j] != 1)))
-                fzi, tzi, fi = sum_flux_tuples(nz[idx],
-                                               nzb[idx],
-                                               q[idx])
-                self._update_budget_fromfaceflow(fzi, tzi, np.abs(fi),
-                                                 kstpkper, totim)
-
-                idx = np.where(
-                    (q < 0) & ((ich[k, i, j] != 1) | (ich[kb, i, j] != 1)))
-                fzi, tzi, fi = sum_flux_tuples(nzb[idx],
-                                               nz[idx],
-                                               q[idx])
-                self._update_budget_fromfaceflow(fzi, tzi, np.abs(fi),
-                                                 kstpkper, totim)
-
-                # CALCULATE FLOW TO CONSTANT-HEAD CELLS IN THIS DIRECTION
-                k, i, j = np.where(ich == 1)
-                k, i, j = k[k > 0], i[k > 0], j[k > 0]
-                ka = k - 1
-                nza = self.izone[ka, i, j]
-                nz = self.izone[k, i, j]
-                q = data[ka, i, j]
-                idx = np.where(
-                    (q > 0) & ((ich[k, i, j] != 1) | (ich[ka, i, j] != 1)))
-                fzi, tzi, fi = sum_flux_tuples(nza[idx],
-                                               nz[idx],
-                                               q[idx])
-                tz = tzi[tzi != 0]
-                f = fi[tzi != 0]
-                fz = np.array(['TO_CONSTANT_HEAD'] * len(tz))
-                tz = np.array([self._zonenamedict[z] for z in tzi[tzi != 0]])
-                self._update_budget_fromssst(fz, tz, np.abs(f), kstpkper,
-                                             totim)
-
-                idx = np.where(
-                    (q < 0) & ((ich[k, i, j] != 1) | (ich[ka, i, j] != 1)))
-                fzi, tzi, fi = sum_flux_tuples(nza[idx],
-                                               nz[idx],
-                                               q[idx])
-                fz = fzi[fzi != 0]
-                f = fi[fzi != 0]
-                fz = np.array(['FROM_CONSTANT_HEAD'] * len(fz))
-                tz = np.array([self._zonenamedict[z] for z in tzi[tzi != 0]])
-                self._update_budget_fromssst(fz, tz, np.abs(f), kstpkper,
-                                             totim)
-
-                k, i, j = np.where(ich == 1)
-                k, i, j = k[k < self.nlay - 1], i[k < self.nlay - 1], j[
-                    k < self.nlay - 1]
-                nz = self.izone[k, i, j]
-                kb = k + 1
-                nzb = self.izone[kb, i, j]
-                q = data[k, i, j]
-                idx = np.where(
-                    (q > 0) & ((ich[k, i, j] != 1) | (ich[kb, i, j] != 1)))
-                fzi, tzi, fi = sum_flux_tuples(nzb[idx],
-                                               nz[idx],
-                                               q[idx])
-                tz = tzi[tzi != 0]
-                f = fi[tzi != 0]
-                fz = np.array(['FROM_CONSTANT_HEAD'] * len(tz))
-                tz = np.array([self._zonenamedict[z] for z in tzi[tzi != 0]])
-                self._update_budget_fromssst(fz, tz, np.abs(f), kstpkper,
-                                             totim)
-
-                idx = np.where(
-                    (q < 0) & ((ich[k, i, j] != 1) | (ich[kb, i, j] != 1)))
-                fzi, tzi, fi = sum_flux_tuples(nzb[idx],
-                                               nz[idx],
-                                               q[idx])
-                fz = fzi[fzi != 0]
-                f = fi[fzi != 0]
-                fz = np.array(['TO_CONSTANT_HEAD'] * len(fz))
-                tz = np.array([self._zonenamedict[z] for z in tzi[tzi != 0]])
-                self._update_budget_fromssst(fz, tz, np.abs(f), kstpkper,
-                                             totim)
-
-        except Exception as e:
-            print(e)
-            raise
+        if len(chz) == 0:
+            # no constant-head cells, or no CONSTANT HEAD record
+            return
+        nzones = len(self.allzones)
+        fin = np.bincount(chz, weights=np.where(q < 0, q, 0.),
+                          minlength=nzones)
+        fout = np.bincount(chz, weights=np.where(q > 0, q, 0.),
+                           minlength=nzones)
+        self._update_budget_fromssst('CONSTANT HEAD', fin, fout, itime)
         return
 
-    def _accumulate_flow_ssst(self, recname, kstpkper, totim):
+    def _accumulate_flow_ssst(self, recname, data, itime):
 
         # NOT AN INTERNAL FLOW TERM, SO MUST BE A SOURCE TERM OR STORAGE
         # ACCUMULATE THE FLOW BY ZONE
 
         imeth = self.imeth[recname]
 
-        data = self.cbc.get_data(text=recname, kstpkper=kstpkper,
-                                 totim=totim)
-        if len(data) == 0:
-            # Empty data, can occur during the first time step of a transient model when
-            # storage terms are zero and not in the cell-budget file.
-            return
-        else:
-            data = data[0]
-
-        if imeth == 2 or imeth == 5:
+        if imeth == 2 or imeth == 5 or imeth == 6:
             # LIST
-            qin = np.ma.zeros((self.nlay * self.nrow * self.ncol),
-                              self.float_type)
-            qout = np.ma.zeros((self.nlay * self.nrow * self.ncol),
-                               self.float_type)
-            for [node, q] in zip(data['node'], data['q']):
-                idx = node - 1
-                if q > 0:
-                    qin.data[idx] += q
-                elif q < 0:
-                    qout.data[idx] += q
-            qin = np.ma.reshape(qin, (self.nlay, self.nrow, self.ncol))
-            qout = np.ma.reshape(qout, (self.nlay, self.nrow, self.ncol))
-        elif imeth == 0 or imeth == 1:
-            # FULL 3-D ARRAY
-            qin = np.ma.zeros(self.cbc_shape, self.float_type)
-            qout = np.ma.zeros(self.cbc_shape, self.float_type)
-            qin[data > 0] = data[data > 0]
-            qout[data < 0] = data[data < 0]
-        elif imeth == 3:
-            # 1-LAYER ARRAY WITH LAYER INDICATOR ARRAY
-            rlay, rdata = data[0], data[1]
-            data = np.ma.zeros(self.cbc_shape, self.float_type)
-            for (r, c), l in np.ndenumerate(rlay):
-                data[l - 1, r, c] = rdata[r, c]
-            qin = np.ma.zeros(self.cbc_shape, self.float_type)
-            qout = np.ma.zeros(self.cbc_shape, self.float_type)
-            qin[data > 0] = data[data > 0]
-            qout[data < 0] = data[data < 0]
-        elif imeth == 4:
-            # 1-LAYER ARRAY THAT DEFINES LAYER 1
-            qin = np.ma.zeros(self.cbc_shape, self.float_type)
-            qout = np.ma.zeros(self.cbc_shape, self.float_type)
-            r, c = np.where(data > 0)
-            qin[0, r, c] = data[r, c]
-            r, c = np.where(data < 0)
-            qout[0, r, c] = data[r, c]
+            izone = self._izone_idx.ravel()[data['node'] - 1]
+            q = data['q']
         else:
-            # Should not happen
-            raise Exception(
-                'Unrecognized "imeth" for {} record: {}'.format(recname,
-                                                                imeth))
+            izone = self._izone_idx.ravel()
+            q = self._get_flux_array(data, recname).ravel()
 
-        # Inflows
-        fz = []
-        tz = []
-        f = []
-        for z in self.allzones:
-            if z != 0:
-                flux = qin[(self.izone == z)].sum()
-                if type(flux) == np.ma.core.MaskedConstant:
-                    flux = 0.
-                fz.append('FROM_' + '_'.join(recname.split()))
-                tz.append(self._zonenamedict[z])
-                f.append(flux)
-        fz = np.array(fz)
-        tz = np.array(tz)
-        f = np.array(f)
-        self._update_budget_fromssst(fz, tz, np.abs(f), kstpkper, totim)
-
-        # Outflows
-        fz = []
-        tz = []
-        f = []
-        for z in self.allzones:
-            if z != 0:
-                flux = qout[(self.izone == z)].sum()
-                if type(flux) == np.ma.core.MaskedConstant:
-                    flux = 0.
-                fz.append('TO_' + '_'.join(recname.split()))
-                tz.append(self._zonenamedict[z])
-                f.append(flux)
-        fz = np.array(fz)
-        tz = np.array(tz)
-        f = np.array(f)
-        self._update_budget_fromssst(fz, tz, np.abs(f), kstpkper, totim)
+        nzones = len(self.allzones)
+        fin = np.bincount(izone, weights=np.where(q > 0, q, 0.),
+                          minlength=nzones)
+        fout = np.bincount(izone, weights=np.where(q < 0, q, 0.),
+                           minlength=nzones)
+        self._update_budget_fromssst(recname, fin, fout, itime)
 
         return
 
-    def _compute_mass_balance(self, kstpkper, totim):
-        # Returns a record array with total inflow, total outflow,
-        # and percent error summed by column.
-        skipcols = ['time_step', 'stress_period', 'totim', 'name']
+    def _compute_mass_balance(self):
+        # Computes total inflow, total outflow, and percent error summed
+        # by column for all times.
+        innames = [n for n in self._recnames if n.startswith('FROM_')]
+        outnames = [n for n in self._recnames if n.startswith('TO_')]
+        inrows = [self._recidx[n] for n in innames]
+        outrows = [self._recidx[n] for n in outnames]
 
-        # Compute inflows
-        recnames = self.get_record_names()
-        innames = [n for n in recnames if n.startswith('FROM_')]
-        outnames = [n for n in recnames if n.startswith('TO_')]
-        if kstpkper is not None:
-            rowidx = np.where((self._budget['time_step'] == kstpkper[0]) &
-                              (self._budget['stress_period'] == kstpkper[1]) &
-                              np.in1d(self._budget['name'], innames))
-        elif totim is not None:
-            rowidx = np.where((self._budget['totim'] == totim) &
-                              np.in1d(self._budget['name'], innames))
-        a = _numpyvoid2numeric(
-            self._budget[list(self._zonenamedict.values())][rowidx])
-        intot = np.array(a.sum(axis=0))
-        tz = np.array(
-            list([n for n in self._budget.dtype.names if n not in skipcols]))
-        fz = np.array(['TOTAL_IN'] * len(tz))
-        self._update_budget_fromssst(fz, tz, intot, kstpkper, totim)
-
-        # Compute outflows
-        if kstpkper is not None:
-            rowidx = np.where((self._budget['time_step'] == kstpkper[0]) &
-                              (self._budget['stress_period'] == kstpkper[1]) &
-                              np.in1d(self._budget['name'], outnames))
-        elif totim is not None:
-            rowidx = np.where((self._budget['totim'] == totim) &
-                              np.in1d(self._budget['name'], outnames))
-        a = _numpyvoid2numeric(
-            self._budget[list(self._zonenamedict.values())][rowidx])
-        outot = np.array(a.sum(axis=0))
-        tz = np.array(
-            list([n for n in self._budget.dtype.names if n not in skipcols]))
-        fz = np.array(['TOTAL_OUT'] * len(tz))
-        self._update_budget_fromssst(fz, tz, outot, kstpkper, totim)
+        values = self._budget_values
+        intot = values[:, inrows, :].sum(axis=1)
+        outot = values[:, outrows, :].sum(axis=1)
+        values[:, self._recidx['TOTAL_IN'], :] = intot
+        values[:, self._recidx['TOTAL_OUT'], :] = outot
 
         # Compute IN-OUT
-        tz = np.array(
-            list([n for n in self._budget.dtype.names if n not in skipcols]))
-        f = intot - outot
-        fz = np.array(['IN-OUT'] * len(tz))
-        self._update_budget_fromssst(fz, tz, np.abs(f), kstpkper, totim)
+        values[:, self._recidx['IN-OUT'], :] = np.abs(intot - outot)
 
         # Compute percent discrepancy
-        tz = np.array(
-            list([n for n in self._budget.dtype.names if n not in skipcols]))
-        fz = np.array(['PERCENT_DISCREPANCY'] * len(tz))
         in_minus_out = intot - outot
         in_plus_out = intot + outot
-        f = 100 * in_minus_out / (in_plus_out / 2.)
-        self._update_budget_fromssst(fz, tz, np.abs(f), kstpkper, totim)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            f = 100 * in_minus_out / (in_plus_out / 2.)
+        values[:, self._recidx['PERCENT_DISCREPANCY'], :] = np.abs(f)
 
         return
 
@@ -1478,12 +1295,436 @@ class ZoneBudget(object):
         return newobj
 
 
-def _numpyvoid2numeric(a):
-    # The budget record array has multiple dtypes and a slice returns
-    # the flexible-type numpy.void which must be converted to a numeric
-    # type prior to performing reducing functions such as sum() or
-    # mean()
-    return np.array([list(r) for r in a])
+class ZoneBudgetUnstructured(ZoneBudget):
+    """
+    ZoneBudget class for unstructured grids and MODFLOW 6 models that
+    save the flow between cells as a FLOW JA FACE (MODFLOW-USG) or
+    FLOW-JA-FACE (MODFLOW 6) record.
+
+    Parameters
+    ----------
+    cbc_file : str, CellBudgetFile object, or ZoneBudgetPlan object
+        The file name, CellBudgetFile object, or ZoneBudgetPlan object for
+        which budgets will be computed.
+    z : ndarray
+        The array containing to zones to be used. The array must contain
+        one zone for each node in the grid connectivity.
+    grid : str, MfGrdFile object, or ModflowDisU object
+        The name of a MODFLOW 6 binary grid file, a MfGrdFile object, or a
+        ModflowDisU object that defines the connectivity (IA and JA) of the
+        grid.
+    kstpkper : tuple of ints
+        A tuple containing the time step and stress period (kstp, kper).
+        The kstp and kper values are zero based.
+    totim : float
+        The simulation time.
+    aliases : dict
+        A dictionary with key, value pairs of zones and aliases. Replaces
+        the corresponding record and field names with the aliases provided.
+    n_workers : int
+        Number of processes used to compute the budgets for the requested
+        times (default is None).
+
+    Returns
+    -------
+    None
+
+    Examples
+    --------
+
+    >>> from flopy.utils.zonbud import ZoneBudgetUnstructured
+    >>> zb = ZoneBudgetUnstructured('flow.cbc', zon, 'flow.disu.grb')
+    >>> bud = zb.get_budget()
+    """
+
+    # FLOW JA FACE TERMS ARE USED TO CALCULATE FLOW BETWEEN ZONES.
+    # CONSTANT-HEAD TERMS (MODFLOW-USG) ARE USED TO IDENTIFY WHERE
+    # CONSTANT-HEAD CELLS ARE. DATA- TERMS (MODFLOW 6) ARE NOT FLOWS.
+    _internal_flow_terms = ['CONSTANT HEAD', 'FLOW JA FACE', 'FLOW-JA-FACE',
+                            'DATA-SPDIS', 'DATA-SAT']
+
+    def __init__(self, cbc_file, z, grid, kstpkper=None, totim=None,
+                 aliases=None, verbose=False, n_workers=None, **kwargs):
+        self._ia, self._ja = get_connectivity(grid)
+        super(ZoneBudgetUnstructured, self).__init__(cbc_file, z,
+                                                     kstpkper=kstpkper,
+                                                     totim=totim,
+                                                     aliases=aliases,
+                                                     verbose=verbose,
+                                                     n_workers=n_workers,
+                                                     **kwargs)
+        return
+
+    def _get_cbc_shape(self):
+        """
+        Get the shape of the arrays in the cell-by-cell budget file.
+
+        Returns
+        -------
+        cbc_shape : tuple of ints
+            (1, 1, nodes)
+
+        """
+        return 1, 1, self._ia.shape[0] - 1
+
+    def _get_izone(self, z):
+        """
+        Get the zone array with the shape of the cell-by-cell budget file
+        arrays.
+
+        Parameters
+        ----------
+        z : ndarray
+            The array containing the zones to be used.
+
+        Returns
+        -------
+        izone : ndarray
+            Zone array of shape (1, 1, nodes).
+
+        """
+        if z.size != self.ncol:
+            raise Exception(
+                'Size of the zone array {} does not match the number of '
+                'nodes {}'.format(z.size, self.ncol))
+        return z.reshape(self.cbc_shape).copy()
+
+    def _get_face_index(self):
+        """
+        Get the positions in the FLOW JA FACE array and the nodes on either
+        side of every connection that separates two different zones. Each
+        connection is included once, from the lower to the higher node
+        number.
+
+        Returns
+        -------
+        face_index : tuple
+            (position, lower node, upper node, lower node zone, upper node
+            zone) index arrays. Zones are zero-based indices into allzones.
+
+        """
+        nodes = self.ncol
+        izone = self.izone.ravel()
+        row = np.repeat(np.arange(nodes), np.diff(self._ia))
+        pos = np.flatnonzero((self._ja > row) &
+                             (izone[row] != izone[self._ja]))
+        lo, hi = row[pos], self._ja[pos]
+        return (pos, lo, hi, self._izone_idx.flat[lo],
+                self._izone_idx.flat[hi])
+
+    def _compute_budget_records(self, itime, records):
+        """
+        Accumulates the budget for the specified zone array for a single
+        time.
+
+        Parameters
+        ----------
+        itime : int
+            Index of the budget time.
+        records : OrderedDict
+            Dictionary of record name, list of record data pairs for the
+            budget time.
+
+        Returns
+        -------
+        None
+
+        """
+        # Initialize an array to track where the constant head cells
+        # are located.
+        ich = np.zeros(self.cbc_shape, self.int_type)
+        for data in records.get('CONSTANT HEAD', []):
+            ich[self._get_flux_array(data, 'CONSTANT HEAD') != 0.] = 1
+        for recname in ('FLOW JA FACE', 'FLOW-JA-FACE'):
+            for data in records.get(recname, []):
+                self._accumulate_flow_ja(data, ich, itime)
+
+        # NOT AN INTERNAL FLOW TERM, SO MUST BE A SOURCE TERM OR STORAGE
+        # ACCUMULATE THE FLOW BY ZONE
+        for recname in self.ssst_record_names:
+            for data in records.get(recname, []):
+                self._accumulate_flow_ssst(recname, data, itime)
+        return
+
+    def _accumulate_flow_ja(self, data, ich, itime):
+        """
+        Accumulate the flows between zones and to and from constant-head
+        cells from a FLOW JA FACE record.
+
+        Parameters
+        ----------
+        data : ndarray
+            FLOW JA FACE array of size nja.
+        ich : ndarray
+            Constant-head cell indicator array.
+        itime : int
+            Index of the budget time.
+
+        Returns
+        -------
+        None
+
+        """
+        flowja = np.asarray(data).ravel()
+        if flowja.shape[0] != self._ja.shape[0]:
+            raise Exception(
+                'Size of the FLOW JA FACE record {} does not match the '
+                'number of connections {}'.format(flowja.shape[0],
+                                                  self._ja.shape[0]))
+        ich = ich.ravel()
+
+        # FLOW JA FACE IS POSITIVE FOR FLOW INTO NODE N FROM NODE M, SO
+        # THE FLOW FROM THE LOWER NODE TO THE UPPER NODE IS -FLOWJA.
+        pos, lo, hi, nzlo, nzhi = self._face_index
+        self._accumulate_flow_between_zones(-flowja[pos], lo, hi, nzlo, nzhi,
+                                            ich, itime)
+
+        # CALCULATE FLOW TO CONSTANT-HEAD CELLS FROM EVERY CONNECTED NODE
+        # THAT IS NOT CONSTANT HEAD. THE FLOW IS ASSIGNED TO THE ZONE OF
+        # THE CONSTANT-HEAD CELL.
+        chcells = np.flatnonzero(ich == 1)
+        if chcells.shape[0] > 0:
+            start = self._ia[chcells]
+            count = self._ia[chcells + 1] - start
+            offset = np.repeat(start - np.cumsum(count) + count, count)
+            pos = np.arange(count.sum()) + offset
+            nc = np.repeat(chcells, count)
+            idx = ich[self._ja[pos]] != 1
+            self._accumulate_flow_constant_head(
+                self._izone_idx.ravel()[nc[idx]], flowja[pos[idx]], itime)
+        return
+
+
+class ZoneBudgetPlan(object):
+    """
+    ZoneBudgetPlan class
+
+    Reads the face flow and source/sink records of a cell-by-cell budget
+    file once so that budgets for any number of zone arrays can be
+    computed without reading the file again.
+
+    Parameters
+    ----------
+    cbc_file : str or CellBudgetFile object
+        The file name or CellBudgetFile object for which budgets will be
+        computed.
+    kstpkper : tuple of ints or list of tuples of ints
+        A tuple containing the time step and stress period (kstp, kper).
+        The kstp and kper values are zero based.
+    totim : float or list of floats
+        The simulation time.
+    memmap : bool
+        If True, full 3D array and compact list records are memory-mapped
+        from the cell-by-cell budget file instead of being read into
+        memory (default is True).
+
+    Examples
+    --------
+
+    >>> from flopy.utils.zonbud import ZoneBudgetPlan
+    >>> plan = ZoneBudgetPlan('zonebudtest.cbc', kstpkper=[(0, 0), (0, 1)])
+    >>> zb = plan.evaluate(zon)
+    >>> budgets = [zb.get_budget() for zb in
+    ...            plan.evaluate([zon1, zon2, zon3], n_workers=4)]
+    """
+
+    def __init__(self, cbc_file, kstpkper=None, totim=None, memmap=True):
+
+        if isinstance(cbc_file, CellBudgetFile):
+            self.cbc = cbc_file
+        elif isinstance(cbc_file, str) and os.path.isfile(cbc_file):
+            self.cbc = CellBudgetFile(cbc_file)
+        else:
+            raise Exception(
+                'Cannot load cell budget file: {}.'.format(cbc_file))
+
+        header = self.cbc.recordarray[0]
+        self.cbc_shape = (abs(header['nlay']), header['nrow'], header['ncol'])
+
+        if isinstance(kstpkper, tuple):
+            kstpkper = [kstpkper]
+        if isinstance(totim, (int, float)):
+            totim = [float(totim)]
+        if kstpkper is None and totim is None:
+            kstpkper = self.cbc.get_kstpkper()
+        self.kstpkper = kstpkper
+        self.totim = totim
+
+        # Select the records for the requested times
+        recordarray = self.cbc.recordarray
+        if kstpkper is not None:
+            kstpkper = set(kstpkper)
+            select = [(int(kstp) - 1, int(kper) - 1) in kstpkper for
+                      kstp, kper in zip(recordarray['kstp'],
+                                        recordarray['kper'])]
+        else:
+            totim_type = recordarray.dtype['totim'].type
+            select = np.in1d(recordarray['totim'],
+                             [totim_type(t) for t in totim])
+
+        self._mm = None
+        if memmap:
+            self._mm = np.memmap(self.cbc.filename, dtype=np.uint8, mode='r')
+
+        # Read every selected record once
+        self._records = OrderedDict()
+        for idx in np.where(select)[0]:
+            self._records[idx] = self._read_record(idx)
+        return
+
+    def get_record(self, idx):
+        """
+        Get a single data record.
+
+        Parameters
+        ----------
+        idx : int
+            The zero-based record number.
+
+        Returns
+        -------
+        record : record returned by CellBudgetFile.get_record
+
+        """
+        if idx in self._records:
+            return self._records[idx]
+        return self.cbc.get_record(idx)
+
+    def evaluate(self, z, aliases=None, n_workers=None):
+        """
+        Compute the budget for one or more zone arrays.
+
+        Parameters
+        ----------
+        z : ndarray or list of ndarrays
+            The array or list of arrays containing the zones to be used.
+        aliases : dict or list of dicts
+            A dictionary with key, value pairs of zones and aliases, or a
+            list of dictionaries for each zone array.
+        n_workers : int
+            Number of threads used to compute the budgets for a list of
+            zone arrays. Zone arrays are evaluated one after another if
+            n_workers is None or less than 2 (default is None).
+
+        Returns
+        -------
+        zb : ZoneBudget object or list of ZoneBudget objects
+
+        """
+        if isinstance(z, np.ndarray):
+            return ZoneBudget(self, z, aliases=aliases)
+
+        z = list(z)
+        if aliases is None or isinstance(aliases, dict):
+            aliases = [aliases] * len(z)
+        args = list(zip(z, aliases))
+
+        if n_workers is None or n_workers < 2:
+            return [ZoneBudget(self, zi, aliases=ai) for zi, ai in args]
+
+        from multiprocessing.pool import ThreadPool
+        pool = ThreadPool(n_workers)
+        try:
+            zbs = pool.map(lambda arg: ZoneBudget(self, arg[0],
+                                                  aliases=arg[1]), args)
+        finally:
+            pool.close()
+            pool.join()
+        return zbs
+
+    def _read_record(self, idx):
+        """
+        Read a single data record, using a view of the memory-mapped file
+        for full 3D array and compact list records.
+
+        """
+        header = self.cbc.recordarray[idx]
+        imeth = header['imeth']
+        ipos = int(self.cbc.iposarray[idx])
+        if self._mm is not None and (imeth == 0 or imeth == 1):
+            shape = (abs(header['nlay']), header['nrow'], header['ncol'])
+            dtype = np.dtype(self.cbc.realtype)
+            nbytes = int(np.prod(shape)) * dtype.itemsize
+            return self._mm[ipos:ipos + nbytes].view(dtype).reshape(shape)
+        elif self._mm is not None and imeth == 2:
+            nlist = int(self._mm[ipos:ipos + 4].view(np.int32)[0])
+            ipos += 4
+            dtype = np.dtype([('node', np.int32), ('q', self.cbc.realtype)])
+            nbytes = nlist * dtype.itemsize
+            return self._mm[ipos:ipos + nbytes].view(dtype)
+        return self.cbc.get_record(idx)
+
+
+def get_connectivity(grid):
+    """
+    Get the zero-based IA and JA connectivity arrays of a grid.
+
+    Parameters
+    ----------
+    grid : str, MfGrdFile object, or ModflowDisU object
+        The name of a MODFLOW 6 binary grid file, a MfGrdFile object, or a
+        ModflowDisU object.
+
+    Returns
+    -------
+    ia : ndarray
+        Position in ja of the first connection of each node (size
+        nodes + 1).
+    ja : ndarray
+        Connected node numbers (size nja). The first connection of each node
+        is the node itself.
+
+    """
+    if isinstance(grid, str):
+        grid = MfGrdFile(grid)
+    if isinstance(grid, MfGrdFile):
+        return grid.get_connectivity()
+    if hasattr(grid, 'iac') and hasattr(grid, 'ja'):
+        # ModflowDisU
+        iac = np.asarray(grid.iac.array, dtype=np.int64)
+        ia = np.concatenate(([0], np.cumsum(iac)))
+        ja = np.asarray(grid.ja.array, dtype=np.int64) - 1
+        return ia, ja
+    raise Exception('Cannot get the grid connectivity from: {}'.format(grid))
+
+
+# ZoneBudget object of a worker process, set by _init_budget_worker
+_budget_worker = None
+
+
+def _init_budget_worker(zb, filename, precision):
+    """
+    Initialize a worker process of ZoneBudget._compute_budget_parallel with
+    its own CellBudgetFile.
+
+    """
+    global _budget_worker
+    zb.cbc = CellBudgetFile(filename, precision=precision)
+    _budget_worker = zb
+    return
+
+
+def _compute_budget_worker(args):
+    """
+    Compute the budget for a single time in a worker process.
+
+    Parameters
+    ----------
+    args : tuple
+        (itime, indices, verbose)
+
+    Returns
+    -------
+    itime : int
+        Index of the budget time.
+    values : ndarray
+        Budget values (nrecords x nzones) for the time.
+
+    """
+    itime, indices, verbose = args
+    zb = _budget_worker
+    zb._compute_budget_time(itime, indices, verbose=verbose)
+    return itime, zb._budget_values[itime]
 
 
 def write_zbarray(fname, X, fmtin=None, iprn=None):
@@ -1688,22 +1929,49 @@ def read_zbarray(fname):
     return zones
 
 
+def sum_flux_bincount(fromzones, tozones, fluxes, nzones):
+    """
+    Sum fluxes by (from zone, to zone) pair.
+
+    Parameters
+    ----------
+    fromzones : ndarray
+        Zero-based index of the zone from which flow is coming.
+    tozones : ndarray
+        Zero-based index of the zone to which flow is going.
+    fluxes : ndarray
+        Flux values.
+    nzones : int
+        Number of zones.
+
+    Returns
+    -------
+    flux : ndarray
+        Array of shape (nzones, nzones) with the summed flux from the zone
+        in the first dimension to the zone in the second dimension.
+
+    """
+    key = np.asarray(fromzones, dtype=np.int64) * nzones + tozones
+    flux = np.bincount(key, weights=fluxes, minlength=nzones * nzones)
+    return flux.reshape((nzones, nzones))
+
+
 def sum_flux_tuples(fromzones, tozones, fluxes):
-    tup = zip(fromzones, tozones, fluxes)
-    sorted_tups = sort_tuple(tup)
-
-    # Group the sorted tuples by (from zone, to zone)
-    # itertools.groupby() returns the index (from zone, to zone) and
-    # a list of the tuples with that index
-    from_zones = []
-    to_zones = []
-    fluxes = []
-    for (fz, tz), ftup in groupby(sorted_tups, lambda tup: tup[:2]):
-        f = np.sum([tup[-1] for tup in list(ftup)])
-        from_zones.append(fz)
-        to_zones.append(tz)
-        fluxes.append(f)
-    return np.array(from_zones), np.array(to_zones), np.array(fluxes)
+    fromzones = np.asarray(fromzones)
+    tozones = np.asarray(tozones)
+    if len(fromzones) == 0:
+        return np.array([]), np.array([]), np.array([])
+
+    # Build a linear (from zone, to zone) key and sum the fluxes for
+    # each unique key
+    zones, izones = np.unique(np.concatenate((fromzones, tozones)),
+                              return_inverse=True)
+    nzones = len(zones)
+    n = len(fromzones)
+    key = izones[:n].astype(np.int64) * nzones + izones[n:]
+    key, inverse = np.unique(key, return_inverse=True)
+    fluxes = np.bincount(inverse, weights=fluxes)
+    return zones[key // nzones], zones[key % nzones], fluxes
 
 
 def sort_tuple(tup, n=2):